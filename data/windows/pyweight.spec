@@ -15,7 +15,12 @@ a = Analysis(['../../pyweight/__main__.py'],
                  ('../../licenses', 'licenses'),
                  ('../../pyweight/ui', 'pyweight/ui'),
              ],
-             hiddenimports=[],
+             hiddenimports=[
+                 'pyweight.ui.about',
+                 'pyweight.ui.main',
+                 'pyweight.ui.prefs',
+                 'pyweight.ui.profilemanager',
+             ],
              hookspath=[],
              hooksconfig={},
              runtime_hooks=[],
@@ -1,13 +1,22 @@
 import sys
 
-from PyQt5.QtWidgets import QApplication
-
 import pyweight
-from pyweight.wmmainwindow import MainWindow
-import pyweight.qresources
 
 
 def main():
+    # `pyweight batch ...` runs headless, see wmbatch.py; the GUI modules are
+    # only imported below, so batch runs (and their worker processes, which
+    # may import this module again) never load PyQt5
+    if sys.argv[1:2] == ["batch"]:
+        from pyweight.wmbatch import main as batch_main
+
+        sys.exit(batch_main(sys.argv[2:]))
+
+    from PyQt5.QtWidgets import QApplication
+
+    from pyweight.wmmainwindow import MainWindow
+    import pyweight.qresources  # noqa: F401
+
     app = QApplication(sys.argv)
     app.setOrganizationName("pyweight")
     app.setOrganizationDomain("adam.sh")
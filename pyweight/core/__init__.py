@@ -0,0 +1,5 @@
+# The parts of PyWeight that work without Qt: the data store (data.py), the
+# body model and statistics (bodymodel.py), the settings (settings.py), the
+# timing of hot paths (instrument.py) and the reading of scale exports
+# (importer.py).
+# Nothing in this package may import PyQt5; the GUI modules adapt it to Qt.
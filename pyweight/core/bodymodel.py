@@ -0,0 +1,612 @@
+import math
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+from pyweight.core.instrument import timed, timer
+from pyweight.wmutils import lbs_to_kg
+
+# Note: see the Technical Concepts page in the docs for more details
+
+
+def lambertw_exp(log_z):
+    """Evaluates the principal branch of the Lambert W function at exp(log_z).
+
+    This is the real solution w of w * exp(w) = z for z > 0, which is all
+    the body composition model needs. Taking the logarithm of the argument
+    means it never has to be computed itself, so it cannot overflow for
+    large values; we solve w + log(w) = log_z with Halley's method instead.
+    Works elementwise on NumPy arrays; scalars take a pure Python path.
+
+    Args:
+        log_z: natural logarithm of the argument of W
+    """
+    if np.ndim(log_z) == 0:
+        return _lambertw_exp_scalar(float(log_z))
+    log_z = np.asarray(log_z, dtype=np.float64)
+    # initial guess: W(z) ~ log(1 + z) for small z, log(z) - log(log(z)) for large
+    w = np.where(
+        log_z < 1,
+        np.log1p(np.exp(np.minimum(log_z, 1))),
+        log_z - np.log(np.maximum(log_z, 1)),
+    )
+    # Halley iteration converges cubically from this guess; the loop nearly
+    # always ends after 2-3 iterations, the limit is just a safeguard
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(10):
+            f = w + np.log(w) - log_z
+            df = 1 + 1 / w
+            step = f / (df + f / (2 * w * w * df))
+            w = w - step
+            if not np.any(np.abs(step) > 1e-15 * np.abs(w)):
+                break
+    # W(0) = 0 exactly
+    return np.where(np.isneginf(log_z), 0.0, w)
+
+
+def _lambertw_exp_scalar(log_z):
+    """Scalar version of `lambertw_exp`, avoiding NumPy call overhead."""
+    if log_z == -math.inf:
+        return 0.0
+    if log_z < 1:
+        w = math.log1p(math.exp(log_z))
+    else:
+        w = log_z - math.log(log_z)
+    for _ in range(10):
+        f = w + math.log(w) - log_z
+        df = 1 + 1 / w
+        step = f / (df + f / (2 * w * w * df))
+        w -= step
+        if abs(step) <= 1e-15 * abs(w):
+            break
+    return w
+
+
+def delta_lean(delta_bw, fat_i):
+    """Calculate how much the body's lean mass has changed during weight loss.
+
+    According to Hall (2008), the amount of lean body mass lost can be estimated
+    purely as a function of initial fat mass and the change in body weight. Using
+    this information, we can trivially calculate how much fat mass was lost. With
+    both these values available, we can calculate the calorie deficit associated
+    with a particular change in weight using caloric density values for lean and
+    fat mass also provided by Hall.
+    https://www.ncbi.nlm.nih.gov/pmc/articles/PMC2376744/
+
+    This is a modification of the formula given in Hall.
+
+    The function derives from the claim that relative changes in fat and lean
+    mass satisfy the equation
+
+        L = 10.4 log (F) + A
+
+    where A is a constant specific to the body-type and assumed not to change
+    under weight-loss conditions. (It could change due to e.g. weight lifting.)
+
+    Give this assumption, it is not hard to show that final fat (lean) mass is
+    purely a function of intial fat (lean) mass and total mass change, and that
+    the relation has the following formula.
+
+    Both arguments may be scalars or NumPy arrays (which are broadcast
+    against each other), so a whole history can be evaluated in one call.
+
+    Args:
+        delta_bw: total kg of mass change (positive = increasing)
+        fat_i: kg of fat on the body at the outset of weight change
+    """
+    # W((fat_i / 10.4) * exp(delta_bw / 10.4) * exp(fat_i / 10.4)), in log space
+    log_arg = np.log(fat_i / 10.4) + (delta_bw + fat_i) / 10.4
+    return delta_bw + fat_i - 10.4 * lambertw_exp(log_arg)
+
+
+# weight in kg, age in years, height in meters; returns kg body fat
+def initial_body_fat_est(weight, age, height, gender_prop):
+    """Estimates initial fraction of body weight that is fat.
+
+    Based on the CUN-BAE equation. Far from perfect, better than nothing.
+    https://pubmed.ncbi.nlm.nih.gov/22179957/
+
+    A few notes:
+      1. Flawed in that the study population was exclusively white.
+      2. Cui et al. (2014) found this method to be among the best performing
+         among tested methods. Not without bias, but surprisingly strong
+         correlations even for non-white Americans.
+         https://pubmed.ncbi.nlm.nih.gov/24576861/
+      3. The most promising alternative I could find was Lee et al. (2017)
+         https://pubmed.ncbi.nlm.nih.gov/29110742/
+         There were several issues that I could see with using this model.
+         One is that it's an entirely linear model. From other studies, I'm
+         skeptical that e.g. height has a linear relationship with body fat
+         percentage. Also, it uses race as an explicit variable. That might
+         lead to more slightly more accurate results, but it would mean we
+         have to ask the user for that information - meaning we have to be
+         exclusionary, since not every race (or race-combination) is part of
+         the model. I noticed that in some cases, increased weight had a
+         *negative* correlation with weight in the model, which seems deeply
+         counter-intuitive. Last, the model hasn't yet been validated by an
+         external paper. I'm open to other alternatives, file a Github issue
+         if you have one.
+
+    Args:
+        weight: body weight at outset of tracking, in kg
+        age: age in years
+        height: height in meters(!)
+        gender_prop: the weights to assign to the body fat estimates for each
+            gender; for most people will be 1 (male) or 0 (female).
+    """
+    bmi = weight / height**2
+    bf_perc_female = (
+        -34.299
+        + 0.503 * age
+        + 3.353 * bmi
+        - 0.031 * bmi**2
+        - 0.020 * bmi * age
+        + 0.00021 * bmi**2 * age
+    )
+    bf_perc_male = (
+        -44.988
+        + 0.503 * age
+        + 3.172 * bmi
+        - 0.026 * bmi**2
+        - 0.020 * bmi * age
+        + 0.00021 * bmi**2 * age
+    )
+    return (
+        weight * (bf_perc_male * gender_prop + bf_perc_female * (1 - gender_prop)) / 100
+    )
+
+
+def delta_e(initial_w, previous_w, current_w, fat_i):
+    """Calculates calorie deficit associated with specified weight change.
+
+    Uses the `delta_lean` function to determine how much of a specific
+    period of weight change involved fat change, and how much lean change.
+    Given this information, determines the caloric density of the change.
+
+    Note that this method returns the calorie surplus or deficit associated
+    with the *current* period - meaning the change from `previous_w` to
+    `current_w`. The reason `initial_w` is relevant is that the *total* size
+    of the weight loss affects the `delta_lean` estimate of current fat mass,
+    and therefore, the density of the recent change.
+
+    Any of the arguments may be NumPy arrays, e.g. the weights at the start
+    and end of every cycle, in which case an array of results is returned.
+
+    Args:
+        initial_w: weight at beginning of tracking period (kg)
+        previous_w: weight just before the change (kg)
+        current_w: weight just after the change (kg)
+        fat_i: fat mass on the same date as initial_w (kg)
+    """
+    previous_delta_lean = delta_lean(previous_w - initial_w, fat_i)
+    full_delta_lean = delta_lean(current_w - initial_w, fat_i)
+    current_delta_lean = full_delta_lean - previous_delta_lean
+    weight_change = current_w - previous_w
+    fat_mass_change = weight_change - current_delta_lean
+    # density values from Hall (2008): pf = 39.5 MJ/kg, pl = 7.6 MJ/kg
+    return 9441 * fat_mass_change + 1820 * current_delta_lean
+
+
+def delta_e_auto(initial_w, previous_w, current_w, age, height, gender_prop):
+    """Calculates calorie deficit assoc with weight change, automatic fat_i estimate.
+
+    Identical to (and calls) `delta_e`, except that three additional parameters
+    are first used to get an estimate of initial fat mass, which is used instead
+    of a manually provided value. Accepts arrays in the same way as `delta_e`.
+
+    Args:
+        initial_w: weight at beginning of tracking period (kg)
+        previous_w: weight just before the change (kg)
+        current_w: weight just after the change (kg)
+        fat_i: fat mass on the same date as initial_w (kg)
+        age: age in years
+        height: height in meters(!)
+        gender_prop: weights to assign to the body fat estimates for each gender
+    """
+    fat_i = initial_body_fat_est(initial_w, age, height, gender_prop)
+    return delta_e(initial_w, previous_w, current_w, fat_i)
+
+
+def gender_proportion(gender_selection, gender_prop) -> float:
+    """Converts a text-based gender selection to a decimal gender property."""
+    if gender_selection == "female":
+        return 0.0
+    if gender_selection == "male":
+        return 1.0
+    if gender_selection == "other":
+        return gender_prop
+    return 0.5
+
+
+class LinearSpline:
+    """A least-squares linear (k=1) spline that can be refit incrementally.
+
+    Produces the same fit as scipy's `LSQUnivariateSpline(x, y, t, k=1)`, but
+    exploits the structure of the problem. Each data point only touches the
+    two "hat" basis functions of the interval it falls in, so the normal
+    equations are tridiagonal, and their entries are sums over the points of
+    a single interval. We keep those sums (the raw moments of each interval)
+    around, so that when a few weights change only the affected intervals
+    have to be recomputed (O(cycle) work) before re-solving the banded
+    system, which is linear in the number of knots (O(n / cycle)).
+
+    The moments are taken relative to an anchor point in each interval to
+    avoid losing precision to cancellation for large day numbers.
+
+    Init:
+        x: increasing array of sample points (day numbers)
+        y: array of sample values (weights)
+        t: increasing array of interior knots, strictly inside (x[0], x[-1])
+    """
+
+    def __init__(self, x, y, t):
+        self._x = np.asarray(x, dtype=np.float64)
+        self._y = np.asarray(y, dtype=np.float64)
+        self._t = np.asarray(t, dtype=np.float64)
+        self._build_moments()
+        self._solve()
+
+    def update(self, x, y, t, days):
+        """Refits the spline after some of the data has changed.
+
+        Only the moments of the intervals containing `days`, and of any
+        intervals whose knots changed, are recomputed. The tridiagonal system
+        is then reassembled and solved over all knots, which is O(n / cycle).
+
+        Args:
+            x, y, t: the complete new data and knots, as for `__init__`
+            days: the sample points that were added, removed or changed
+        """
+        old_t = self._t
+        self._x = np.asarray(x, dtype=np.float64)
+        self._y = np.asarray(y, dtype=np.float64)
+        self._t = np.asarray(t, dtype=np.float64)
+        intervals = len(self._t) + 1
+
+        # keep the moments for the intervals whose knots are unchanged
+        common = min(len(old_t), len(self._t))
+        changed = np.flatnonzero(old_t[:common] != self._t[:common])
+        kept = int(changed[0]) if len(changed) else common
+        if kept < common or len(old_t) != len(self._t):
+            self._anchors = np.concatenate(
+                (self._anchors[:kept], np.empty(intervals - kept))
+            )
+            self._moments = np.concatenate(
+                (self._moments[:, :kept], np.empty((5, intervals - kept))), axis=1
+            )
+            dirty = set(range(kept, intervals))
+        else:
+            dirty = set()
+
+        days = np.asarray(days, dtype=np.float64)
+        dirty.update(np.searchsorted(self._t, days, side="right").tolist())
+        self._update_moments(sorted(dirty))
+        self._solve()
+
+    def _build_moments(self):
+        """Computes the moments of every interval from scratch (vectorized)."""
+        intervals = len(self._t) + 1
+        k = np.searchsorted(self._t, self._x, side="right")
+        first = self._t[:1] if len(self._t) else self._x[:1]
+        self._anchors = np.concatenate((first, self._t))
+        x = self._x - self._anchors[k]
+        self._moments = np.stack(
+            [
+                np.bincount(k, weights=w, minlength=intervals)
+                for w in (np.ones_like(x), x, x * x, self._y, x * self._y)
+            ]
+        )
+
+    def _update_moments(self, intervals):
+        """Recomputes count, sum x, sum x^2, sum y and sum xy for intervals."""
+        for k in intervals:
+            lo = np.searchsorted(self._x, self._t[k - 1]) if k > 0 else 0
+            if k < len(self._t):
+                hi = np.searchsorted(self._x, self._t[k])
+            else:
+                hi = len(self._x)
+            x = self._x[lo:hi]
+            y = self._y[lo:hi]
+            if k > 0:
+                anchor = self._t[k - 1]
+            elif len(self._t) > 0:
+                anchor = self._t[0]
+            else:
+                anchor = self._x[0]
+            x = x - anchor
+            self._anchors[k] = anchor
+            self._moments[:, k] = (len(x), x.sum(), x @ x, y.sum(), x @ y)
+
+    def _solve(self):
+        """Assembles and solves the tridiagonal normal equations."""
+        if len(self._t) and not (self._x[0] < self._t[0] and self._t[-1] < self._x[-1]):
+            raise ValueError(
+                "Interior knots t must satisfy Schoenberg-Whitney conditions"
+            )
+        self._knots = np.concatenate(([self._x[0]], self._t, [self._x[-1]]))
+        # interval endpoints, relative to the anchor the moments were taken at
+        a = self._knots[:-1] - self._anchors
+        b = self._knots[1:] - self._anchors
+        h = b - a
+        n, sx, sxx, sy, sxy = self._moments
+        # products of the left (b - x) / h and right (x - a) / h hat functions
+        left_left = (b * b * n - 2 * b * sx + sxx) / h**2
+        left_right = ((a + b) * sx - sxx - a * b * n) / h**2
+        right_right = (sxx - 2 * a * sx + a * a * n) / h**2
+        left_y = (b * sy - sxy) / h
+        right_y = (sxy - a * sy) / h
+
+        size = len(self._knots)
+        banded = np.zeros((3, size))
+        banded[1, :-1] += left_left
+        banded[1, 1:] += right_right
+        banded[0, 1:] = left_right
+        banded[2, :-1] = left_right
+        rhs = np.zeros(size)
+        rhs[:-1] += left_y
+        rhs[1:] += right_y
+        try:
+            coeffs = solve_banded((1, 1), banded, rhs)
+        except np.linalg.LinAlgError:
+            coeffs = None
+        if coeffs is None or not np.all(np.isfinite(coeffs)):
+            raise ValueError(
+                "Interior knots t must satisfy Schoenberg-Whitney conditions"
+            )
+        self._coeffs = coeffs
+
+    def __call__(self, x):
+        """Evaluates the spline at x, extrapolating linearly beyond the data."""
+        x = np.asarray(x, dtype=np.float64)
+        knots = self._knots
+        k = np.clip(np.searchsorted(knots, x, side="right") - 1, 0, len(knots) - 2)
+        u = (x - knots[k]) / (knots[k + 1] - knots[k])
+        return self._coeffs[k] + u * (self._coeffs[k + 1] - self._coeffs[k])
+
+    def get_knots(self):
+        """Returns the full knot vector, including the two boundary knots."""
+        return self._knots
+
+    def get_coeffs(self):
+        """Returns the spline coefficients, i.e. its value at each knot."""
+        return self._coeffs
+
+
+class WeightTracker:
+    """Representation of a set of weight change data and associated properties.
+
+    Takes data from a WeightTable (model) and
+      * calculates an interpolated fit to the data
+      * calculates adjustment advice that can be printed, if desired
+
+    Attributes:
+        data: a WeightTable that the WeightTracker is an assessment of
+        settings: a Plan providing interpretive information (e.g. units)
+        adjustment: difference between wanted and achieved calories this cycle
+        interpolation: a LinearSpline least-squares fit to the data
+        knots: a list of points (in day numbers) where the spline bends
+
+    A WeightTracker is meant to live as long as the data file is open. It
+    listens to changes on both the data and the settings, and only throws
+    away the cached values that depend on what actually changed.
+
+    With `listen=False`, the data and settings can be snapshots (see
+    `WeightTable.snapshot()`), replaced by the owner as they change; the
+    owner then reports the changes with `refit()` and `settings_changed()`.
+    """
+
+    # which cached values need recomputing when a given setting changes;
+    # settings that are not listed here do not affect any cached value
+    setting_dependencies = {
+        "cycle": ("_knots", "_interpolation", "_adjustment"),
+        "units": ("_interpolation", "_adjustment"),
+        "wcrate": ("_adjustment",),
+        "body_fat_method": ("_adjustment",),
+        "age": ("_adjustment",),
+        "height": ("_adjustment",),
+        "gender_selection": ("_adjustment",),
+        "gender_prop": ("_adjustment",),
+        "manual_body_fat": ("_adjustment",),
+    }
+
+    def __init__(self, data, settings, listen=True):
+        self.data = data
+        self.settings = settings
+        self._interpolation = None
+        self._adjustment = None
+        self._knots = None
+        self._knots_end_date = None
+        # day numbers changed since the spline was last (re)fit
+        self._dirty_days = set()
+
+        if listen:
+            data.dataChanged.connect(self.data_changed)
+            data.rowsInserted.connect(self.rows_inserted)
+            settings.subscribe(self.settings_changed)
+
+    def data_changed(self, top_left, bottom_right):
+        """Slot for WeightTable.dataChanged - marks the edited days as dirty."""
+        self.refit(self.data.row_daynumbers(top_left.row(), bottom_right.row()))
+
+    def rows_inserted(self, parent, first, last):
+        """Slot for WeightTable.rowsInserted - marks the new days as dirty."""
+        self.refit(self.data.row_daynumbers(first, last))
+
+    def settings_changed(self, keys):
+        """Drops the cached values that depend on the changed settings."""
+        for key in keys:
+            for attr in self.setting_dependencies.get(key, ()):
+                setattr(self, attr, None)
+        if self._interpolation is None:
+            self._dirty_days.clear()
+
+    @property
+    def knots(self) -> list:
+        """Gets (and caches) a list of points every `cycle` days until end date."""
+        # the knots only depend on the cycle length and the last filled day
+        if self._knots is None or self._knots_end_date != self.data.end_date:
+            self._knots_end_date = self.data.end_date
+            day_distance = (self.data.end_date - self.data.start_date).days
+            number_of_cycles = day_distance // self.settings.cycle
+            self._knots = [
+                i * self.settings.cycle for i in range(1, number_of_cycles + 1)
+            ]
+        return self._knots
+
+    @property
+    def interpolation(self):
+        """Gets (and caches) a least-squares linear spline fit to the data.
+
+        Fits a spline to the user's entire weight history. The spline has knots
+        at each of the cycle endpoints. This mirrors the behavior of a linear
+        regression, but adds the additional constraint that the resulting fit
+        must be continuous.
+
+        Using the interpolation for determining weight values at arbitrary
+        points in the history (e.g. the starting weight) is recommend, because
+        the spline fit is assumed to be much more accurate than the raw value.
+        """
+        # if there's only one data point, nothing to interpolate
+        if len(self.data.dates) <= 1:
+            return None
+        if self._interpolation is not None and self._dirty_days:
+            # update the existing fit in place: only the moments of the changed
+            # intervals are recomputed, plus a banded solve over all the knots;
+            # the table's day number and weight views are still rebuilt in full
+            # (one vectorized pass), but there is no full refit
+            days, self._dirty_days = self._dirty_days, set()
+            try:
+                with timer("fit"):
+                    self._interpolation.update(
+                        self.data.daynumbers,
+                        self.data.weights,
+                        self.knots,
+                        sorted(days),
+                    )
+            except ValueError:
+                self._interpolation = None
+                raise
+        if self._interpolation is None:
+            # spline interpolation: k=1 means linear fit, knots = spline flex points
+            # we use day numbers instead of dates directly because the spline
+            # can't handle dates; note that this is the number of days since the first
+            # record (not number of entries), so linear interpolation remains valid
+            self._dirty_days.clear()
+            with timer("fit"):
+                self._interpolation = LinearSpline(
+                    self.data.daynumbers, self.data.weights, self.knots
+                )
+        return self._interpolation
+
+    def refit(self, days):
+        """Tells the tracker that the weights on some days have changed.
+
+        The spline is not thrown away; it is updated in place the next time
+        the interpolation is needed.
+
+        Args:
+            days: day numbers whose weights were added, removed or changed
+        """
+        self._adjustment = None
+        if self._interpolation is not None:
+            self._dirty_days.update(int(day) for day in days)
+
+    @property
+    def interpolation_metric(self):
+        """Returns a function wrapping `interpolation` for imperial units."""
+        if self.settings.units == "imperial":
+
+            def interp_fn(d):
+                return lbs_to_kg(self.interpolation(d))
+
+            return interp_fn
+        return self.interpolation
+
+    @property
+    def adjustment(self) -> int:
+        """Get calorie difference between chosen rate and calculated rate.
+
+        Returns a cached value, if available.
+
+        This method wraps all the other module functions together,
+        and provides a single value as output. It checks the settings
+        to determine the cycle period, requests the knots and interpolation,
+        and then calls `delta_e` to determine the calories associated with
+        the user's data history. The difference between the expected and
+        achieved calorie deficit (or surplus) is rounded to the nearest
+        calorie and returned.
+        """
+        if self._adjustment is None:
+            self._adjustment = self._compute_adjustment()
+        return self._adjustment
+
+    @timed("adjustment")
+    def _compute_adjustment(self):
+        """Computes the adjustment, see `adjustment`."""
+        # get interpolated weights for three control points in data
+        today = self.data.daynumbers[-1]
+        first_day = self.data.daynumbers[0]
+        if len(self.knots) >= 1:
+            last_cycle = self.knots[-1]
+        else:
+            last_cycle = first_day
+
+        today_weight = self.interpolation_metric(today)
+        first_day_weight = self.interpolation_metric(first_day)
+        last_cycle_weight = self.interpolation_metric(last_cycle)
+
+        # get caloric deficit associated with the current cycle *and*
+        # caloric deficit associated with desired weight loss this cycle
+
+        # use number of days into present cycle to calculate expected change
+        days_in_current_cycle = today - last_cycle
+
+        # evaluate the achieved and desired change together
+        cycle_delta_e, cycle_desired_delta_e = self._delta_e(
+            first_day_weight,
+            last_cycle_weight,
+            np.array(
+                [
+                    today_weight,
+                    last_cycle_weight + (self.settings.wcrate * days_in_current_cycle),
+                ]
+            ),
+        )
+
+        # calculate adjustment from difference between desired and actual
+        return round((cycle_desired_delta_e - cycle_delta_e) / days_in_current_cycle)
+
+    @property
+    def energy_balance(self):
+        """Gets the calorie surplus (deficit if negative) of every cycle.
+
+        Returns an array with one entry per completed cycle, plus one for
+        the current (partial) cycle if it has begun. All cycles are
+        evaluated with a single vectorized call to `delta_e`.
+        """
+        daynumbers = self.data.daynumbers
+        points = np.array([daynumbers[0], *self.knots, daynumbers[-1]], dtype=float)
+        points = np.unique(points)
+        weights = self.interpolation_metric(points)
+        return self._delta_e(weights[0], weights[:-1], weights[1:])
+
+    def _delta_e(self, initial_w, previous_w, current_w):
+        """Calls `delta_e` or `delta_e_auto`, according to the settings."""
+        if self.settings.body_fat_method == "automatic":
+            gender_prop = gender_proportion(
+                self.settings.gender_selection, self.settings.gender_prop
+            )
+            return delta_e_auto(
+                initial_w,
+                previous_w,
+                current_w,
+                self.settings.age,
+                self.settings.height,
+                gender_prop,
+            )
+        return delta_e(
+            initial_w,
+            previous_w,
+            current_w,
+            self.settings.manual_body_fat * initial_w,
+        )
@@ -0,0 +1,905 @@
+import csv
+import hashlib
+import io
+import os
+import struct
+from datetime import date, datetime, timedelta
+from functools import partial
+from itertools import islice
+from tempfile import mkstemp
+
+import numpy as np
+
+from pyweight.core.instrument import timed
+from pyweight.wmutils import kg_to_lbs, lbs_to_kg
+
+# number of rows parsed at a time by `read_csv`
+CSV_CHUNK_ROWS = 65536
+
+# number of journaled edits after which `journal_changes` folds the journal
+# back into the data file instead of appending to it
+JOURNAL_COMPACT_ENTRIES = 1024
+
+# the binary sidecar cache next to each data file, see `read_cache`:
+# magic, CSV size, CSV mtime (ns), first date (days since 1970), number of
+# rows, and CSV SHA-256; followed by the weights (float64) and day offsets
+# (int32) of the rows
+CACHE_MAGIC = b"PWCACHE1"
+_CACHE_HEADER = struct.Struct("<8sqqqq32s")
+
+# how `WeightData.merge_entries()` can pick the weight of a day from several
+# readings: the earliest one, the lowest one, or their mean
+MERGE_POLICIES = ("first", "min", "mean")
+
+
+def read_csv(csvpath):
+    """Reads a PyWeight data file into arrays of dates and weights.
+
+    The file is streamed in chunks of `CSV_CHUNK_ROWS` rows. Each chunk is
+    parsed in bulk by NumPy: the fixed YYYY/MM/DD dates are validated and
+    converted without going through strptime, and blank weights become NaN.
+    Only if a chunk contains a malformed row is it parsed row by row, to
+    report which line is at fault.
+
+    Args:
+        csvpath: path to a CSV file with a header and rows of (date, weight)
+
+    Returns:
+        a tuple of (datetime64[D] array of dates, float64 array of weights)
+
+    Raises:
+        ValueError: the file is empty, malformed, or not in date order
+    """
+    with open(csvpath, encoding="utf-8", newline="") as f:
+        return _read_rows(f, csvpath)
+
+
+def _read_rows(f, csvpath):
+    """Reads a data file from a text file object, see `read_csv()`."""
+    dates = []
+    values = []
+    csvr = csv.reader(f)
+    next(csvr, None)  # skip header
+    line = 2
+    while True:
+        rows = list(islice(csvr, CSV_CHUNK_ROWS))
+        if not rows:
+            break
+        chunk_dates, chunk_values = _parse_rows(rows)
+        if chunk_dates is None:
+            _raise_bad_row(csvpath, rows, line)
+        dates.append(chunk_dates)
+        values.append(chunk_values)
+        line += len(rows)
+
+    if not dates:
+        raise ValueError(f"{csvpath} contains no data.")
+    dates = np.concatenate(dates)
+    values = np.concatenate(values)
+    out_of_order = np.flatnonzero(np.diff(dates) <= np.timedelta64(0, "D"))
+    if len(out_of_order):
+        line = out_of_order[0] + 3
+        raise ValueError(f"{csvpath}, line {line}: dates are not in order.")
+    return dates, values
+
+
+def load_csv(csvpath):
+    """Reads a data file like `read_csv`, through its sidecar cache.
+
+    If the cache is missing or stale, the CSV is parsed, and the cache
+    regenerated for next time.
+    """
+    loaded = read_cache(csvpath)
+    if loaded is None:
+        loaded = read_csv(csvpath)
+        write_cache(csvpath, *loaded)
+    return loaded
+
+
+def read_cache(csvpath):
+    """Reads a data file's contents from its binary sidecar cache.
+
+    The cache (at `<csvpath>.cache`) is only used if it was made from the
+    CSV as it is now: the size and modification time of the CSV have to
+    match, and so does its hash, which also catches edits that keep both.
+    The columns are memory-mapped rather than parsed, so this costs little
+    more than hashing the CSV.
+
+    Returns:
+        a tuple of (datetime64[D] array of dates, float64 array of weights),
+        or None if there is no valid cache
+    """
+    cache_path = f"{csvpath}.cache"
+    try:
+        with open(cache_path, "rb") as f:
+            header = f.read(_CACHE_HEADER.size)
+        if len(header) != _CACHE_HEADER.size:
+            return None
+        magic, size, mtime_ns, epoch, count, digest = _CACHE_HEADER.unpack(header)
+        stat = os.stat(csvpath)
+        if (
+            magic != CACHE_MAGIC
+            or count < 1
+            or (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns)
+            or os.path.getsize(cache_path) != _CACHE_HEADER.size + 12 * count
+            or digest != _file_digest(csvpath)
+        ):
+            return None
+        offset = _CACHE_HEADER.size
+        values = np.memmap(cache_path, np.float64, "r", offset, (count,))
+        days = np.memmap(cache_path, np.int32, "r", offset + 8 * count, (count,))
+        # copy out of the maps: the model edits its arrays in place, and an
+        # open map would keep the cache from being replaced on some systems
+        dates = np.datetime64(epoch, "D") + days.astype(np.int64)
+        values = np.array(values)
+    except (OSError, ValueError):
+        return None
+    return dates, values
+
+
+def write_cache(csvpath, dates, values):
+    """Writes the binary sidecar cache of a data file, see `read_cache()`.
+
+    `dates` and `values` have to be the contents of the CSV as it is on
+    disk. The cache is only an optimization, so failing to write it (e.g.
+    in a read-only directory) is not an error.
+    """
+    dpath, fname = os.path.split(f"{csvpath}.cache")
+    try:
+        stat = os.stat(csvpath)
+        digest = _file_digest(csvpath)
+        epoch = dates[0].astype(np.int64)
+        header = _CACHE_HEADER.pack(
+            CACHE_MAGIC,
+            stat.st_size,
+            stat.st_mtime_ns,
+            epoch,
+            len(dates),
+            digest,
+        )
+        tmpfd, tmppath = mkstemp(prefix=f"{fname}.", dir=dpath or None)
+        try:
+            with os.fdopen(tmpfd, "wb") as f:
+                f.write(header)
+                f.write(np.ascontiguousarray(values, dtype="<f8").tobytes())
+                days = (dates.astype(np.int64) - epoch).astype("<i4")
+                f.write(days.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmppath, f"{csvpath}.cache")
+        except BaseException:
+            os.remove(tmppath)
+            raise
+    except OSError:
+        pass
+
+
+def _file_digest(path):
+    """Returns the SHA-256 digest of a file's contents."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(partial(f.read, 1 << 20), b""):
+            sha.update(block)
+    return sha.digest()
+
+
+def _parse_rows(rows):
+    """Parses a chunk of CSV rows, returns (None, None) if any is malformed."""
+    if any(len(row) != 2 for row in rows):
+        return None, None
+    date_strs, value_strs = zip(*rows)
+    # dates: check the YYYY/MM/DD layout on the raw characters, then turn
+    # the slashes into dashes and let NumPy convert from ISO 8601
+    chars = np.array(date_strs, dtype="U11").view(np.uint32).reshape(-1, 11)
+    digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9]]
+    if not (
+        np.all((digits >= ord("0")) & (digits <= ord("9")))
+        and np.all(chars[:, [4, 7]] == ord("/"))
+        and np.all(chars[:, 10] == 0)
+    ):
+        return None, None
+    chars[:, [4, 7]] = ord("-")
+    blank = np.array([v == "" for v in value_strs], dtype=bool)
+    try:
+        dates = chars.view("U11").ravel().astype("datetime64[D]")
+        values = np.array([v or "nan" for v in value_strs]).astype(np.float64)
+    except ValueError:
+        return None, None
+    # only blank cells may be NaN, and weights have to be finite and positive
+    filled = values[~blank]
+    if np.any(np.isnan(values) != blank) or not np.all(
+        np.isfinite(filled) & (filled > 0)
+    ):
+        return None, None
+    return dates, values
+
+
+@timed("save")
+def _write_csv(csvpath, journal_path, dates, values):
+    """Writes a data file from arrays of dates and weights (NaN for blanks).
+
+    See `WeightData.save_csv()`; this part does not need the model, so that
+    it can run on another thread.
+    """
+    dpath, fname = os.path.split(csvpath)
+    tmpfd, tmppath = mkstemp(prefix=f"{fname}.", dir=dpath, text=True)
+    str_dates = np.char.replace(np.datetime_as_string(dates, unit="D"), "-", "/")
+    # create file object to own the open fd; automatically closes for us
+    with os.fdopen(tmpfd, "w", encoding="utf-8", newline="") as f:
+        csvw = csv.writer(f)
+        csvw.writerow(["Date", "Weight (kg)"])
+        for date, value in zip(str_dates.tolist(), values.tolist()):
+            csvw.writerow([date, "" if np.isnan(value) else value])
+        f.flush()
+        os.fsync(f.fileno())
+    os.rename(tmppath, csvpath)
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+    write_cache(csvpath, dates, values)
+
+
+@timed("journal")
+def _append_journal(journal_path, entries):
+    """Appends (date, weight) entries to a data file's journal."""
+    with open(journal_path, "a", encoding="utf-8", newline="") as f:
+        csvw = csv.writer(f)
+        csvw.writerows(entries)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def collapse_readings(times, weights, policy="first"):
+    """Collapses timed weight readings into one weight per day.
+
+    Args:
+        times: datetime64 array of the reading times, in any order
+        weights: float64 array of the weights
+        policy: one of `MERGE_POLICIES`
+
+    Returns:
+        a tuple of (datetime64[D] array of the distinct days, sorted; float64
+        array of their weights)
+
+    Raises:
+        ValueError: the policy is unknown
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"{policy} is not a merge policy.")
+    order = np.argsort(times, kind="stable")
+    days, starts, counts = np.unique(
+        times[order].astype("datetime64[D]"), return_index=True, return_counts=True
+    )
+    weights = weights[order]
+    if not len(days):
+        return days, weights
+    if policy == "first":
+        return days, weights[starts]
+    if policy == "min":
+        return days, np.minimum.reduceat(weights, starts)
+    return days, np.add.reduceat(weights, starts) / counts
+
+
+def _lookup(days, values, query):
+    """Returns the weights on the `query` days, NaN where there is none."""
+    found = np.full(len(query), np.nan)
+    if len(days):
+        i = np.searchsorted(days, query)
+        hit = days[np.minimum(i, len(days) - 1)] == query
+        found[hit] = values[i[hit]]
+    return found
+
+
+def _same(a, b):
+    """Compares arrays of weights, where NaN (no weight) equals NaN."""
+    return (a == b) | (np.isnan(a) & np.isnan(b))
+
+
+def _raise_bad_row(csvpath, rows, first_line):
+    """Finds the first malformed row in a chunk and reports its line number."""
+    for line, row in enumerate(rows, first_line):
+        try:
+            if len(row) != 2:
+                raise ValueError(f"expected 2 columns, found {len(row)}")
+            year, month, day = row[0][0:4], row[0][5:7], row[0][8:10]
+            if f"{year}/{month}/{day}" != row[0] or not (year + month + day).isdigit():
+                raise ValueError(f"{row[0]!r} is not a YYYY/MM/DD date")
+            date(int(year), int(month), int(day))
+            if row[1] != "" and not 0 < float(row[1]) < float("inf"):
+                raise ValueError(f"{row[1]!r} is not a valid weight")
+        except ValueError as e:
+            raise ValueError(f"{csvpath}, line {line}: {e}") from None
+    raise ValueError(f"{csvpath}: malformed data.")
+
+
+class TableSnapshot:
+    """A frozen copy of the filled rows of a WeightData.
+
+    Provides the same read-only properties as the table it was taken from
+    (`start_date`, `end_date`, `dates`, `daynumbers`, `weights` and
+    `weight_colname`), so it can stand in for it in a WeightTracker, and be
+    used from another thread while the table keeps changing.
+
+    Init:
+        table: the WeightData (or WeightTable) to take a snapshot of
+    """
+
+    def __init__(self, table):
+        self.start_date = table.start_date
+        self.end_date = table.end_date
+        # the cached views are read-only, and replaced rather than modified
+        # when the table changes, so they can be shared without copying
+        self.daynumbers, self.dates, self.weights = table._compact()
+        self.weight_colname = table.weight_colname
+
+
+class WeightData:
+    """The weight log stored in a data file.
+
+    A WeightData contains a set of weight data, and tooling for creating,
+    saving, and manipulating this data in a sensible way. For statistical
+    methods for working with this data, see WeightTracker in
+    bodymodel.py. WeightTable (in wmdatamodel.py) makes it a Qt model.
+
+    Users of WeightData are generally expected to interact with the data
+    through the `dates`, `daynumbers`, and `weights` family of functions.
+    These provide a linear, time-ordered view of the values in the rows,
+    and are guaranteed to coincide. Each is a
+    read-only NumPy array that is cached until the data changes, so repeated
+    reads are free. Each omits blank days, and `daynumbers` provides a
+    one-based incrementing day counter that gives the true day total since
+    the start of the dataset for each day.
+
+    Since the 1-1 correspondence is maintained between dates and daynumbers,
+    a generally useful approach for working with the data is to treat the
+    day numbers and weights as x-y data, respectively, and use the true dates
+    for display.
+
+    Only days with a weight entered are stored, in memory and in the data
+    file. The rows (one per calendar day, from `start_date` up to the last
+    row) are numbered by their day offset, and blank ones are made up on
+    demand, so long absences cost nothing.
+
+    Since PyWeight's underlying data are always stored in metric units, this
+    class hides this implementation detail. Data are presented in the instance
+    owner's preferred units.
+
+    Init:
+        csvpath: initializes the WT with a CSV file
+
+    Attributes:
+      * end_date: get date of the last *filled* cell
+      * row_count: get number of rows (days), blank or not
+      * dates: get array of dates for every filled cell
+      * daynumbers: get array of days since start for each filled cell
+      * weights: get array of weights for every filled cell
+      * weight_colname: display version of the weight unit
+
+    Important Methods:
+      * add_days(): add empty days at the end
+      * create_csv(): make a new blank csv at a path
+      * journal_changes(): cheaply persist new edits to a sidecar journal
+      * save_job(): snapshot new edits, to be persisted on another thread
+      * snapshot(): get a frozen copy of the data, e.g. for another thread
+      * save_csv(): saves stored data to the backing file
+      * set_units(): choose which units to present the data in to viewers
+      * set_value(): set the weight of a row from user input
+    """
+
+    @timed("load")
+    def __init__(self, csvpath, units):
+        # Internally, only the days with a weight entered are stored, in
+        # NumPy arrays:
+        #   _days: day offset of each entry from `start_date` (int64, sorted)
+        #   _values: weight in kg of each entry (float64)
+        # The rows run from `start_date` to `_end_day` days after it, one per
+        # calendar day, so the row of a day is simply its offset; blank rows
+        # are not stored at all, and are made up on demand.
+        self._days = np.empty(0, dtype=np.int64)
+        self._values = np.empty(0, dtype=np.float64)
+        self._end_day = 0
+
+        # Compacted views handed out by `dates`, `weights` and `daynumbers`;
+        # rebuilt lazily after the data changes.
+        self._filled = None
+
+        # Rows edited since they were last saved or journaled, and how many
+        # entries the journal next to the data file holds (see
+        # `journal_changes()`).
+        self._unjournaled = set()
+        self._journal_entries = 0
+
+        # What the data file held when it was last read or written here, as
+        # (_days, _values, tail), for `disk_changes()`. The tail is the
+        # (inode, size, SHA-256 digest, last row) of the file when it was
+        # read, or None if unknown.
+        self._disk = None
+
+        # If the user prefers imperial units to metric, this class pretends
+        # that all the data is imperial, even though we only save metric data
+        # to the underlying CSV.
+        self.set_units(units)
+
+        # If the CSV does not already exist, it is automatically created
+        if not os.path.exists(csvpath):
+            self.create_csv(csvpath)
+
+        # initialize the table from a CSV (or its sidecar cache, when that
+        # is up to date); currently we depend on a very specific format,
+        # which should be created for the user as needed with `create_csv()`
+        dates, values = load_csv(csvpath)
+
+        self.start_date = dates[0].astype(date)
+        self._epoch = dates[0]
+        days = (dates - self._epoch).astype(np.int64)
+        # files written before blank days were left out still contain them
+        filled = ~np.isnan(values)
+        self._days = days[filled]
+        self._values = values[filled]
+        self._end_day = int(days[-1])
+        self._disk = (self._days, self._values.copy(), None)
+        self.csvpath = csvpath
+        self.journal_path = f"{csvpath}.journal"
+        # edits that were journaled but never saved to the CSV
+        self._replay_journal()
+
+    def set_units(self, units):
+        """Changes the units the public data is in.
+
+        Args:
+            units: "imperial" or "metric" (default)
+        """
+        self.imperial = units == "imperial"
+        self.unit = "lbs" if self.imperial else "kg"
+        self.weight_colname = f"Weight ({self.unit})"
+        self._filled = None
+
+    @property
+    def row_count(self):
+        """Returns the number of rows: one per day, blank or not."""
+        return self._end_day + 1
+
+    def display_value(self, row):
+        """Returns the weight of a row as shown to users ("" for blanks)."""
+        val = self._weight(row)
+        if val is None:
+            return ""
+        # conversion to imperial (if needed) is here
+        # we read data rarely enough that cacheing this is probably not worth it
+        if self.imperial:
+            val = kg_to_lbs(val)
+        # we store high precision internally, but for display round the values
+        return str(round(val, 2))
+
+    def set_value(self, row, value):
+        """Sets the weight of a row from user input, in preferred units.
+
+        Transparently handles values (which are floats) and empty values
+        (which are "" strings, and remove the entry).
+
+        Returns:
+            whether the stored weight changed
+
+        Raises:
+            ValueError: the value is not a sensible weight
+        """
+        # handle the case of deleting an entry
+        if value != "":
+            value = float(value)
+            if self.imperial:
+                value = lbs_to_kg(value)
+            # handle absurd values that might otherwise cause a crash
+            if value > 2000 or value <= 0:
+                raise ValueError(f"{value} is not a valid weight.")
+        else:
+            value = None
+        if not self._put(row, value):
+            return False
+        self._unjournaled.add(row)
+        return True
+
+    def _put(self, day, value):
+        """Stores the weight in kg (None for blank) of a day in range.
+
+        Returns whether anything changed.
+        """
+        i = int(np.searchsorted(self._days, day))
+        found = i < len(self._days) and self._days[i] == day
+        if value is None:
+            if not found:
+                return False
+            self._days = np.delete(self._days, i)
+            self._values = np.delete(self._values, i)
+        elif found:
+            if self._values[i] == value:
+                return False
+            self._values[i] = value
+        else:
+            self._days = np.insert(self._days, i, day)
+            self._values = np.insert(self._values, i, value)
+        self._filled = None
+        return True
+
+    def _put_many(self, days, values):
+        """Stores weights in kg (NaN to remove the entry) on many days at once.
+
+        Args:
+            days: array of distinct day offsets, possibly past the last row
+            values: array of weights for those days
+        """
+        if not len(days):
+            return
+        keep = ~np.isin(self._days, days)
+        filled = ~np.isnan(values)
+        new_days = np.concatenate((self._days[keep], days[filled]))
+        new_values = np.concatenate((self._values[keep], values[filled]))
+        order = np.argsort(new_days, kind="stable")
+        self._days = new_days[order]
+        self._values = new_values[order]
+        self._end_day = max(self._end_day, int(days.max()))
+        self._filled = None
+
+    def merge_entries(self, readings, policy="first", overwrite=False):
+        """Merges many weight readings at once, e.g. a scale's export.
+
+        See `merge_changes()`, which this applies; the merged days are
+        journaled like edits.
+
+        Returns:
+            a tuple of (the number of days that changed, list of the dates
+            that were skipped)
+        """
+        days, values, skipped = self.merge_changes(readings, policy, overwrite)
+        self._put_many(days, values)
+        self._unjournaled.update(days.tolist())
+        return len(days), skipped
+
+    def merge_changes(self, readings, policy="first", overwrite=False):
+        """Works out the changes merging weight readings would make.
+
+        Several readings on one day are collapsed into one weight, see
+        `collapse_readings()`. Readings from before `start_date` can't be
+        shown, so they are skipped.
+
+        Args:
+            readings: iterable of (datetime or date, weight in kg) pairs
+            policy: how to pick the weight of a day with several readings,
+                one of `MERGE_POLICIES`
+            overwrite: whether to replace weights already in the table; by
+                default only blank days are filled in
+
+        Returns:
+            a tuple of (day offsets, weights in kg) to apply with
+            `_put_many()`, and a list of the dates that were skipped
+
+        Raises:
+            ValueError: a weight is not sensible, or the policy is unknown
+        """
+        readings = list(readings)
+        times = np.array([when for when, _ in readings], dtype="datetime64[s]")
+        weights = np.array([kg for _, kg in readings], dtype=np.float64)
+        valid = (weights > 0) & (weights <= 2000)
+        if not np.all(valid):
+            raise ValueError(f"{weights[~valid][0]} is not a valid weight.")
+        dates, values = collapse_readings(times, weights, policy)
+        days = (dates - self._epoch).astype(np.int64)
+        skipped = dates[days < 0].astype(date).tolist()
+        days, values = days[days >= 0], values[days >= 0]
+        current = _lookup(self._days, self._values, days)
+        change = ~_same(current, values)
+        if not overwrite:
+            change &= np.isnan(current)
+        return days[change], values[change], skipped
+
+    def disk_changes(self):
+        """Finds the changes other programs made to the data file.
+
+        The file is compared with what it held when it was last read or
+        written here. If it only had rows appended since it was last read
+        (everything it held then is still there, as the digest shows), just
+        those are parsed; otherwise the whole file is.
+
+        Changes to days that were also edited here since (whether journaled
+        or not) are conflicts: the edits made here win.
+
+        Returns:
+            a tuple of (day offsets, weights in kg with NaN for removed
+            entries) to apply with `_put_many()`, and an array of the day
+            offsets in conflict; days before `start_date` can't be shown,
+            so they are always conflicts
+
+        Raises:
+            OSError, ValueError: the file can't be read (e.g. it's being
+                written); nothing changes, so this can simply be retried
+        """
+        base_days, base_values, tail = self._disk
+        appended = self._read_appended(tail) if tail is not None else None
+        if appended is not None:
+            days, values, tail = appended
+            disk = (
+                np.concatenate((base_days, days)),
+                np.concatenate((base_values, values)),
+                tail,
+            )
+        else:
+            disk = self._read_disk()
+            all_days = np.union1d(base_days, disk[0])
+            disk_values = _lookup(disk[0], disk[1], all_days)
+            changed = ~_same(_lookup(base_days, base_values, all_days), disk_values)
+            days, values = all_days[changed], disk_values[changed]
+        self._disk = disk
+
+        base = _lookup(base_days, base_values, days)
+        current = _lookup(self._days, self._values, days)
+        edited = ~_same(current, base)
+        conflicts = (edited & ~_same(current, values)) | (days < 0)
+        apply = ~edited & (days >= 0)
+        return days[apply], values[apply], days[conflicts]
+
+    def _read_disk(self):
+        """Reads the whole data file, returns it in the form of `_disk`."""
+        with open(self.csvpath, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            data = f.read()
+        dates, values = _read_rows(
+            io.StringIO(data.decode("utf-8"), newline=""), self.csvpath
+        )
+        days = (dates - self._epoch).astype(np.int64)
+        filled = ~np.isnan(values)
+        tail = None
+        # rows appended to a last line without a line break would be garbled
+        if data.endswith(b"\n"):
+            digest = hashlib.sha256(data).digest()
+            tail = (inode, len(data), digest, int(days[-1]))
+        return days[filled], values[filled], tail
+
+    def _read_appended(self, tail):
+        """Reads the rows appended to the data file since it was read.
+
+        Returns:
+            (day offsets, weights, new tail) of the appended entries, or
+            None if the file was changed in any other way (or replaced)
+        """
+        inode, size, digest, last_day = tail
+        with open(self.csvpath, "rb") as f:
+            if os.fstat(f.fileno()).st_ino != inode:
+                return None
+            # hashing is much cheaper than parsing, and catches rows that
+            # were rewritten in place along with the appending
+            sha = hashlib.sha256()
+            remaining = size
+            while remaining:
+                block = f.read(min(remaining, 1 << 20))
+                if not block:
+                    return None
+                sha.update(block)
+                remaining -= len(block)
+            if sha.digest() != digest:
+                return None
+            data = f.read()
+        # a row that is still being written is left for the next time
+        end = data.rfind(b"\n") + 1
+        text = data[:end].decode("utf-8")
+        rows = [row for row in csv.reader(io.StringIO(text, newline="")) if row]
+        days = np.empty(0, dtype=np.int64)
+        values = np.empty(0, dtype=np.float64)
+        if rows:
+            dates, values = _parse_rows(rows)
+            if dates is None:
+                return None
+            days = (dates - self._epoch).astype(np.int64)
+            if days[0] <= last_day or np.any(np.diff(days) <= 0):
+                return None
+            last_day = int(days[-1])
+        sha.update(data[:end])
+        tail = (inode, size + end, sha.digest(), last_day)
+        filled = ~np.isnan(values)
+        return days[filled], values[filled], tail
+
+    def missing_days(self):
+        """Returns how many days `add_days` should add to be up to date.
+
+        The data should always contain dates up to the present day, and at
+        least one empty day after the last entry.
+        """
+        today = datetime.now().date()
+        days_passed = (today - self._date(self._end_day)).days
+        # last line is blank: add 0, last line is not blank: add 1
+        return max(int(self._weight(self._end_day) is not None), days_passed)
+
+    def add_days(self, count):
+        """Adds `count` empty days at the end of the data."""
+        self._end_day += count
+
+    def _replay_journal(self):
+        """Applies the journaled edits on top of the data read from the CSV.
+
+        Journal entries are (date, weight) rows in the data file's own format,
+        so replaying them is idempotent. Entries past the end of the data add
+        blank days up to them. A crash while appending can leave a torn last
+        entry; anything that does not parse is ignored.
+        """
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding="utf-8", newline="") as f:
+            entries = list(csv.reader(f))
+        for entry in entries:
+            try:
+                day_date = datetime.strptime(entry[0], "%Y/%m/%d").date()
+                value = float(entry[1]) if entry[1] != "" else None
+            except (IndexError, ValueError):
+                continue
+            day = (day_date - self.start_date).days
+            if day < 0:
+                continue
+            self._end_day = max(self._end_day, day)
+            self._put(day, value)
+        self._journal_entries = len(entries)
+
+    def _weight(self, row):
+        """Returns the weight in kg of a row, or None if it is blank."""
+        i = int(np.searchsorted(self._days, row))
+        if i < len(self._days) and self._days[i] == row:
+            return float(self._values[i])
+        return None
+
+    def _date(self, row):
+        """Returns the date of a row in the model as a `datetime.date`."""
+        return self.start_date + timedelta(days=int(row))
+
+    def _row(self, row):
+        """Returns a row as a [date, str_date, value] list ("" for blanks)."""
+        date = self._date(row)
+        value = self._weight(row)
+        return [date, date.strftime("%Y/%m/%d"), "" if value is None else value]
+
+    def _compact(self):
+        """Gets (and caches) read-only arrays of the non-blank rows.
+
+        Returns a tuple of (daynumbers, dates, weights in preferred units).
+        """
+        if self._filled is None:
+            daynumbers = 1 + self._days
+            dates = self._epoch + self._days
+            # a copy: edits change `_values` in place
+            weights = self._values.copy()
+            if self.imperial:
+                weights = kg_to_lbs(weights)
+            for arr in (daynumbers, dates, weights):
+                arr.flags.writeable = False
+            self._filled = (daynumbers, dates, weights)
+        return self._filled
+
+    @property
+    def end_date(self):
+        """Returns the last non-blank date in the model."""
+        # when no data has been entered, use the first date as the end date
+        return self._date(self._days[-1] if len(self._days) else 0)
+
+    @property
+    def dates(self):
+        """Get an array (datetime64[D]) of non-blank dates in chrono order."""
+        return self._compact()[1]
+
+    @property
+    def weights(self):
+        """Returns an array of weights (in preferred units) in chrono order."""
+        return self._compact()[2]
+
+    @property
+    def csvdata(self):
+        """Returns the full data, up to the last day with a weight entry.
+
+        FIXME: this should probably be a private method.
+        """
+        last = self._days[-1] if len(self._days) else 0
+        return [self._row(i) for i in range(last + 1)]
+
+    @property
+    def daynumbers(self):
+        """Returns an array with the number of days for each entry since the start.
+
+        The first day is 1, instead of 0, because a knot happens every `n` days,
+        and if the day count starts at 0 users would have to wait n+1 days to hit
+        the first knot.
+
+        The day numbers should not be used for anything except for a linear
+        representation of time deltas, as when interpolating, determining advice
+        intervals, etc.
+        """
+        return self._compact()[0]
+
+    @property
+    def nbytes(self):
+        """Returns roughly how much memory the data takes up, in bytes."""
+        arrays = (self._days, self._values, *(self._filled or ()))
+        return sum(arr.nbytes for arr in arrays)
+
+    def snapshot(self):
+        """Returns a TableSnapshot of the current data."""
+        return TableSnapshot(self)
+
+    def row_daynumbers(self, first, last):
+        """Returns the day numbers of rows `first` to `last` (inclusive).
+
+        Unlike `daynumbers`, this includes blank rows.
+        """
+        return np.arange(first + 1, last + 2, dtype=np.int64)
+
+    def create_csv(self, csvpath):
+        """Make a new blank CSV data file, from a template.
+
+        FIXME: could be a static method?"""
+        with open(csvpath, "w", encoding="utf-8", newline="") as f:
+            csvw = csv.writer(f)
+            csvw.writerow(["Date", "Weight (kg)"])
+            today = datetime.now()
+            csvw.writerow([today.strftime("%Y/%m/%d"), ""])
+
+    def save_job(self):
+        """Takes a snapshot of the edits made since the last save.
+
+        Returns a function that persists them, or None if there is nothing
+        new to save. Everything the function needs is copied here, so it can
+        run on another thread while the model keeps changing, as long as jobs
+        run in the order they were made.
+
+        Usually only the edited rows are appended (and fsynced) to a small
+        journal next to the CSV, so the cost does not depend on the length of
+        the history. The journal is replayed when the file is next opened.
+        Once it holds more than `JOURNAL_COMPACT_ENTRIES` edits, the job
+        rewrites the CSV instead, like `save_csv()`.
+        """
+        if not self._unjournaled:
+            return None
+        if self._journal_entries + len(self._unjournaled) > JOURNAL_COMPACT_ENTRIES:
+            return self._compact_job()
+        entries = [self._row(row)[1:] for row in sorted(self._unjournaled)]
+        self._journal_entries += len(entries)
+        self._unjournaled.clear()
+        return partial(_append_journal, self.journal_path, entries)
+
+    def journal_changes(self):
+        """Persists the edits made since the last save to the journal."""
+        job = self.save_job()
+        if job is not None:
+            job()
+
+    def compact_journal(self):
+        """Folds journaled edits into the CSV data file, if there are any."""
+        if self._journal_entries:
+            self.save_csv()
+
+    def _compact_job(self):
+        """Takes a snapshot of the whole table for `_write_csv()`.
+
+        Only the entries are written, so the size of the file does not
+        depend on the number of blank days. The first day is always written,
+        blank or not, since it is where the data starts.
+        """
+        self._journal_entries = 0
+        self._unjournaled.clear()
+        entries = (self._days, self._values.copy())
+        days, values = entries
+        if not len(days) or days[0] != 0:
+            days = np.insert(days, 0, 0)
+            values = np.insert(values, 0, np.nan)
+        write = partial(
+            _write_csv, self.csvpath, self.journal_path, self._epoch + days, values
+        )
+        return partial(self._write_job, write, entries)
+
+    def _write_job(self, write, entries):
+        """Runs `write`, then remembers the (_days, _values) it put on disk."""
+        write()
+        # a single assignment, as this may run on another thread
+        self._disk = (*entries, None)
+
+    def save_csv(self):
+        """Save the CSV data file associated with the data model.
+
+        Blank days are left out, see `_compact_job()`. Creates a temporary
+        file and moves it on top of the old one, in an attempt to be mostly
+        atomic in case of a crash. The journal is removed afterwards, since
+        the CSV now contains all of its edits.
+        """
+        self._compact_job()()
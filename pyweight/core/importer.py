@@ -0,0 +1,187 @@
+import csv
+import json
+from datetime import datetime
+from itertools import product
+
+from pyweight.wmutils import lbs_to_kg
+
+# Reading of the weight logs smart scales and fitness services export, as
+# CSV or JSON, for `WeightData.merge_entries()`. Exports differ in their
+# column names, date formats and units, so the fields are found by name:
+# the reading time is in the first field named like one of `TIME_FIELDS`
+# (with a separate "time" field added to a "date" one), and the weight is
+# in the first field with "weight" in its name, or named like one of
+# `WEIGHT_FIELDS`. Weights are in kg unless the field name, a "unit" field
+# or the value itself says pounds.
+
+TIME_FIELDS = ("date", "datetime", "timestamp", "date/time", "measured at", "time")
+WEIGHT_FIELDS = ("kg", "lb", "lbs", "value")
+
+# the formats dates are tried in when they are not ISO 8601; day-first dates
+# are only recognized with dots, to tell them apart from US ones
+DATE_FORMATS = (
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%Y/%m/%d",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y",
+    "%m/%d/%y %H:%M:%S",
+    "%m/%d/%y",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y",
+    "%b %d, %Y %H:%M:%S",
+    "%b %d, %Y",
+)
+
+# the delimiters CSV exports are tried with, on each line until one of them
+# splits it into a header with date and weight columns
+DELIMITERS = (",", ";", "\t")
+
+
+def read_export(path, units="metric"):
+    """Reads the weight readings in a scale's CSV or JSON export.
+
+    A JSON export is a list of readings (objects), or an object holding one
+    somewhere. A CSV export may have lines before its header, which are
+    skipped; readings with a blank weight are skipped too.
+
+    Args:
+        path: path to the export
+        units: "imperial" or "metric", the units of weights the export
+            doesn't give units for
+
+    Returns:
+        a list of (datetime, weight in kg) pairs, in file order; times with
+        a time zone are converted to local time
+
+    Raises:
+        ValueError: the file is not a weight log, or a reading is malformed
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+    if text.lstrip()[:1] in ("[", "{"):
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"{path} is not valid JSON: {e}") from None
+        records = _json_records(data)
+        if records is None:
+            raise ValueError(f"{path} holds no weight readings.")
+        located = ((f"{path}, reading {i}", r) for i, r in enumerate(records, 1))
+        return _readings(located, units, path)
+
+    lines = text.splitlines()
+    for line, delimiter in product(range(len(lines)), DELIMITERS):
+        header = next(csv.reader([lines[line]], delimiter=delimiter), [])
+        header = [name.strip().lower() for name in header]
+        if _fields(header) is not None:
+            break
+    else:
+        raise ValueError(f"{path} has no date and weight columns.")
+    rows = csv.reader(lines[line + 1 :], delimiter=delimiter)
+    located = (
+        (f"{path}, line {i}", dict(zip(header, row)))
+        for i, row in enumerate(rows, line + 2)
+        if any(row)
+    )
+    return _readings(located, units, path)
+
+
+def _json_records(data):
+    """Finds the list of readings in parsed JSON, or returns None."""
+    if isinstance(data, list) and data and all(isinstance(r, dict) for r in data):
+        return [{str(k).lower(): v for k, v in record.items()} for record in data]
+    children = data.values() if isinstance(data, dict) else ()
+    for child in children:
+        if isinstance(child, (dict, list)):
+            records = _json_records(child)
+            if records is not None and _fields(list(records[0])) is not None:
+                return records
+    return None
+
+
+def _fields(names):
+    """Returns the (time, extra time, weight) field names, or None.
+
+    Args:
+        names: the lowercase field names of a header or record
+    """
+    time = next((name for name in TIME_FIELDS if name in names), None)
+    weight = next((name for name in names if "weight" in name), None)
+    if weight is None:
+        weight = next((name for name in WEIGHT_FIELDS if name in names), None)
+    if time is None or weight is None:
+        return None
+    extra = "time" if time == "date" and "time" in names else None
+    return time, extra, weight
+
+
+def _readings(located, units, path):
+    """Reads (datetime, kg) pairs from (location, record) pairs.
+
+    See `read_export()`; the locations are for error messages.
+    """
+    readings = []
+    fields = None
+    for location, record in located:
+        if fields is None:
+            fields = _fields(list(record))
+            if fields is None:
+                raise ValueError(f"{path} has no date and weight fields.")
+        time_field, extra_field, weight_field = fields
+        weight = record.get(weight_field)
+        if weight is None or str(weight).strip() == "":
+            continue
+        try:
+            when = _parse_time(record.get(time_field), record.get(extra_field))
+            kg = _parse_weight(weight, weight_field, record.get("unit"), units)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{location}: {e}") from None
+        readings.append((when, kg))
+    return readings
+
+
+def _parse_time(value, extra=None):
+    """Parses a reading time: a date string, or a Unix timestamp in s or ms."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # timestamps past 5138 AD in seconds are taken to be in milliseconds
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds)
+    text = str(value).strip()
+    if extra is not None:
+        text = f"{text} {str(extra).strip()}"
+    if text.isdigit():
+        return _parse_time(int(text))
+    try:
+        # before Python 3.11, fromisoformat() doesn't take a Z for UTC
+        iso = text[:-1] + "+00:00" if text.endswith("Z") else text
+        when = datetime.fromisoformat(iso)
+    except ValueError:
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                pass
+        raise ValueError(f"'{text}' is not a date.") from None
+    if when.tzinfo is not None:
+        when = when.astimezone().replace(tzinfo=None)
+    return when
+
+
+def _parse_weight(value, field, unit, units):
+    """Parses a weight in the units the export implies, returns it in kg."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number, suffix = float(value), ""
+    else:
+        text = str(value).strip().lower()
+        number = text.rstrip("abcdefghijklmnopqrstuvwxyz. ")
+        suffix = text[len(number) :].strip(" .")
+        number = float(number.replace(",", ".") if "." not in number else number)
+    unit = suffix or str(unit or "").strip().lower() or field
+    if "lb" in unit or ("kg" not in unit and units == "imperial"):
+        number = lbs_to_kg(number)
+    if not 0 < number <= 2000:
+        raise ValueError(f"{value} is not a valid weight.")
+    return number
@@ -0,0 +1,143 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+# Opt-in timing of the hot paths (loading, saving, fitting, plotting).
+# Set PYWEIGHT_PROFILE to a non-empty value to turn it on; with
+# PYWEIGHT_PROFILE_DUMP set as well, every edit cycle is also written to
+# that path, as a Chrome trace if it ends in ".json", or as cProfile stats
+# otherwise (see `EditCycle`).
+enabled = bool(os.environ.get("PYWEIGHT_PROFILE"))
+dump_path = os.environ.get("PYWEIGHT_PROFILE_DUMP") or None
+
+# how many recent timings of each hot path the percentiles are taken over
+TIMINGS_WINDOW = 256
+
+# recent durations in seconds, by name; deques are safe to append to from
+# several threads
+_timings = defaultdict(lambda: deque(maxlen=TIMINGS_WINDOW))
+# Chrome trace events of the edit cycle being captured, if any
+_events = None
+_events_lock = threading.Lock()
+
+
+def record(name, start, end):
+    """Records that `name` ran from `start` to `end` (perf_counter seconds)."""
+    _timings[name].append(end - start)
+    if _events is not None:
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        with _events_lock:
+            _events.append(event)
+
+
+@contextmanager
+def timer(name):
+    """Times the enclosed code as `name`, if instrumentation is enabled."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, start, time.perf_counter())
+
+
+def timed(name):
+    """Decorator: times each call of a function as `name`, see `timer()`."""
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter())
+
+        return wrapper
+
+    return decorator
+
+
+def percentiles(name, qs=(50, 90, 99)):
+    """Returns the percentiles of the recent timings of `name`, in seconds.
+
+    Returns:
+        a dict mapping each of `qs` to a duration, or None if `name` has
+        not been timed yet
+    """
+    durations = list(_timings.get(name, ()))
+    if not durations:
+        return None
+    return dict(zip(qs, np.percentile(durations, qs).tolist()))
+
+
+def readout():
+    """Returns a one-line summary of the timings, e.g. for a status bar.
+
+    Shows the last and the 90th percentile duration of everything timed
+    so far, in milliseconds.
+    """
+    parts = []
+    for name, durations in sorted(_timings.items()):
+        if durations:
+            p90 = percentiles(name)[90]
+            parts.append(f"{name} {durations[-1] * 1e3:.1f} ms (p90 {p90 * 1e3:.1f})")
+    return " · ".join(parts)
+
+
+class EditCycle:
+    """Times one edit cycle: from an edit to the updated plot being shown.
+
+    The whole cycle is recorded as "edit". If a dump path is given, every
+    timing recorded during the cycle (on any thread) is written to it as a
+    Chrome trace (for a path ending in ".json", see chrome://tracing), or
+    the cycle is profiled with cProfile and the stats are written there.
+    cProfile only sees the thread the cycle was started on; the statistics
+    computed by the plot pipeline only show up in traces.
+
+    Init:
+        path: where to dump the cycle (default: nothing is dumped)
+    """
+
+    def __init__(self, path=None):
+        global _events
+        self.path = path
+        self._profile = None
+        if path is not None and path.endswith(".json"):
+            with _events_lock:
+                _events = []
+        elif path is not None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self.start = time.perf_counter()
+
+    def finish(self):
+        """Ends the cycle, and writes the dump if one was asked for."""
+        global _events
+        record("edit", self.start, time.perf_counter())
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.path)
+        elif self.path is not None:
+            with _events_lock:
+                events, _events = _events, None
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events}, f)
@@ -0,0 +1,406 @@
+import configparser
+import os
+from tempfile import mkstemp
+from types import SimpleNamespace
+from weakref import WeakMethod
+
+
+class Setting:
+    """A wrapped Setting object that behaves like its underlying value.
+
+    Do not create instances of this class directly, call `get_setting` instead.
+
+    Instances of this class should also inherit a basic Python type (int, str, etc).
+
+    Objects of this class behave (in most cases, use caution) exactly like the
+    types they mimic, but this class provides an additional method to class
+    owners (Settings instances), in that they contain a callback intended to
+    store an inflight (i.e. modified setting) on the parent.
+
+    The parent can implement methods to save or flush these settings as desired.
+    Note that Setting instances are read-only; attempts to edit them should change
+    attributes on the parent Settings instance instead.
+
+    Init:
+        name: the name of the Setting (FIXME: unused?)
+        value: the underlying value stored in the setting; never modified
+        inflight: the method provided by the parent to save inflights
+    """
+
+    def __init__(self, name, value, inflight):
+        self.__name = name
+        # there's nothing wrong, in theory, with using a Setting as a value
+        # but it can't be stored (e.g. by QSettings), so keep the real value around
+        self._raw = value
+        self.__inflight = inflight
+
+    def inflight(self, value):
+        """Set an inflight value of the Setting on the parent Settings."""
+        self.__inflight(value)
+
+
+class BoolSetting(Setting):
+    def __bool__(self):
+        return self._raw
+
+
+# the Setting subclass for each type of value, see `get_setting`
+_setting_classes = {}
+
+
+def get_setting(name, value, inflight):
+    """Returns an appropriate subclass of Setting for the type.
+
+    Usually we want a transparent class that inherits both the Setting
+    class and the type of the value given. However, bools are singletons
+    in Python, so they require special handling.
+
+    The class for each type is only created once, and then reused.
+    """
+    if isinstance(value, bool):
+        return BoolSetting(name, value, inflight)
+
+    setting_class = _setting_classes.get(type(value))
+    if setting_class is None:
+        # multi-inheritance so that our Setting behaves exactly like value's type
+        class VarSetting(Setting, type(value)):
+            def __new__(cls, name, value, inflight):
+                return super().__new__(cls, value)
+
+        setting_class = _setting_classes[type(value)] = VarSetting
+    return setting_class(name, value, inflight)
+
+
+# escape sequences used in INI values, besides \x for hex character codes
+_INI_ESCAPES = {
+    "\0": "0",
+    "\a": "a",
+    "\b": "b",
+    "\f": "f",
+    "\n": "n",
+    "\r": "r",
+    "\t": "t",
+    "\v": "v",
+    '"': '"',
+    "\\": "\\",
+}
+_INI_UNESCAPES = {code: char for char, code in _INI_ESCAPES.items()}
+_INI_UNESCAPES.update({"?": "?", "'": "'"})
+
+
+def _ini_escape(value):
+    """Encodes a setting value for an INI file, the way QSettings does."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if not isinstance(value, str):
+        return str(value)
+    out = []
+    escape_next_hex = False
+    for char in value:
+        if escape_next_hex and char in "0123456789abcdefABCDEF":
+            # a hex digit would be read as part of the previous \x escape
+            out.append(f"\\x{ord(char):x}")
+            continue
+        escape_next_hex = False
+        if char in _INI_ESCAPES:
+            out.append("\\" + _INI_ESCAPES[char])
+            escape_next_hex = char == "\0"
+        elif ord(char) < 0x20 or ord(char) >= 0x7F:
+            out.append(f"\\x{ord(char):x}")
+            escape_next_hex = True
+        else:
+            out.append(char)
+    result = "".join(out)
+    if value.startswith("@"):
+        result = "@" + result
+    if any(char in value for char in ",;=") or result[:1] == " " or result[-1:] == " ":
+        result = f'"{result}"'
+    return result
+
+
+def _ini_unescape(raw):
+    """Decodes a value from an INI file written by QSettings (or us)."""
+    parts = [[]]
+    quoted = False
+    i = 0
+    while i < len(raw):
+        char = raw[i]
+        i += 1
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            # QSettings would read a list; we only have single values
+            parts.append([])
+        elif char == "\\" and i < len(raw):
+            code = raw[i]
+            i += 1
+            if code == "x":
+                end = i
+                while end < len(raw) and raw[end] in "0123456789abcdefABCDEF":
+                    end += 1
+                parts[-1].append(chr(int(raw[i:end] or "0", 16)))
+                i = end
+            elif code in "01234567":
+                end = i
+                while end < len(raw) and end < i + 2 and raw[end] in "01234567":
+                    end += 1
+                parts[-1].append(chr(int(code + raw[i:end], 8)))
+                i = end
+            else:
+                parts[-1].append(_INI_UNESCAPES.get(code, code))
+        else:
+            parts[-1].append(char)
+    value = ", ".join(
+        "".join(part).strip() if len(parts) > 1 else "".join(part) for part in parts
+    )
+    if value.startswith("@@"):
+        value = value[1:]
+    return value
+
+
+class IniStorage:
+    """Reads and writes settings in an INI file, without Qt.
+
+    Files are compatible with the ones QSettings writes in its IniFormat:
+    the settings are in a [General] section, and values are encoded the
+    same way, so either can read what the other wrote.
+
+    Init:
+        path: the INI file; it does not have to exist yet
+    """
+
+    section = "General"
+
+    def __init__(self, path):
+        self.path = path
+        self._parser = configparser.RawConfigParser(
+            delimiters=("=",), comment_prefixes=(";", "#"), strict=False
+        )
+        self._parser.optionxform = str
+        try:
+            self._parser.read(path, encoding="latin-1")
+        except configparser.Error:
+            # like QSettings, ignore what we can't read
+            pass
+
+    def value(self, key, default, conversion):
+        """Returns the value of a setting, or `default` if there is none."""
+        try:
+            value = _ini_unescape(self._parser.get(self.section, key))
+            if conversion is bool:
+                return value.lower() not in ("", "0", "false")
+            return conversion(value)
+        except (configparser.Error, ValueError):
+            return default
+
+    def set_value(self, key, value):
+        """Sets the value of a setting; see `sync()`."""
+        if not self._parser.has_section(self.section):
+            self._parser.add_section(self.section)
+        self._parser.set(self.section, key, _ini_escape(value))
+
+    def sync(self):
+        """Writes the settings to the file, returns whether that worked.
+
+        The file is replaced atomically, as with the data files.
+        """
+        dpath, fname = os.path.split(os.path.abspath(self.path))
+        try:
+            tmpfd, tmppath = mkstemp(prefix=f"{fname}.", dir=dpath, text=True)
+            with os.fdopen(tmpfd, "w", encoding="latin-1") as f:
+                self._parser.write(f, space_around_delimiters=False)
+            os.replace(tmppath, self.path)
+        except OSError:
+            return False
+        return True
+
+
+class Settings:
+    """Typed settings with defaults, kept in a storage such as an INI file.
+
+    Properly handles type conversions and defaults.
+    Provides facilities for saving inflight settings, and perforaming
+    coversions. Each property specified in the `settings` dict can be
+    accessed directly as a property of a Settings instance.
+
+    All settings are read once, when the instance is created, so reading
+    one is just a dictionary lookup. Changes made through the instance
+    update this cache; changes made to the file by anything else are not
+    seen.
+
+    This class should be subclassed for convenience.
+
+    Init:
+        settings: a dict mapping all available settings to their defaults
+        conversions: a dict mapping settings to type conversions where needed
+        storage: where the settings are kept, e.g. an IniStorage; provides
+            `value(key, default, conversion)`, `set_value(key, value)` and
+            `sync()`, which returns whether the settings could be written
+
+    Attributes:
+        [settings]: all settings known to the class are available as attributes
+
+    Important Methods:
+      * apply(): write several settings at once
+      * save(): apply the inflight settings
+      * snapshot(): get a frozen copy of the current settings
+      * subscribe(): get notified of the names of settings that change
+    """
+
+    def __init__(self, settings, conversions, storage):
+        self.__storage = storage
+        self.__defaults = settings
+        self.__settings = settings.keys()  # just for clarity
+        self.__conversions = conversions
+        self.__inflight = {}
+        self.__subscribers = []
+        # every setting is read from the storage once, and kept as a Setting
+        # until it is changed through this object
+        self.__cache = {}
+        for attr in self.__settings:
+            self.__load(attr)
+
+    def __getattr__(self, attr):
+        try:
+            return self.__cache[attr]
+        except KeyError:
+            raise AttributeError(f"{attr} is not a valid setting for {self}.") from None
+
+    def __load(self, attr):
+        """Reads a setting from the storage into the cache."""
+        # we expect anything with no conversion to return a str, so
+        # make this assumption explicit
+        conversion = self.__conversions.get(attr, str)
+        value = self.__storage.value(attr, self.__defaults[attr], conversion)
+
+        def inflight(value):
+            self.__inflight[attr] = value
+
+        self.__cache[attr] = get_setting(attr, value, inflight)
+
+    def __setattr__(self, attr, value):
+        if attr.startswith("_"):
+            super().__setattr__(attr, value)
+        else:
+            # a transaction of one, written right away
+            self.apply({attr: value})
+
+    def __write(self, attr, value):
+        """Writes a setting to the storage, returns whether it changed."""
+        # storages can't accept our Setting class, so send the raw value
+        if isinstance(value, Setting):
+            value = value._raw
+        old_value = self.__cache[attr]._raw
+        self.__storage.set_value(attr, value)
+        # read it back, so the cache has the value the storage will return
+        self.__load(attr)
+        return self.__cache[attr]._raw != old_value
+
+    def apply(self, changes):
+        """Writes several settings at once, as a single transaction.
+
+        All the values are checked before any is written: each must be a
+        known setting, and convertible to its type. They are then written
+        with a single sync of the underlying file, and subscribers are
+        notified once, with the names of the settings whose values changed.
+
+        Args:
+            changes: a dict mapping setting names to their new values
+
+        Returns:
+            whether the settings could be written
+
+        Raises:
+            AttributeError: a setting is unknown
+            ValueError: a value can't be converted to the setting's type
+        """
+        for attr, value in changes.items():
+            if attr not in self.__settings:
+                raise AttributeError(f"{attr} is not a valid setting for {self}.")
+            conversion = self.__conversions.get(attr, str)
+            try:
+                conversion(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{value!r} is not a valid {attr}.") from None
+        changed = {attr for attr, value in changes.items() if self.__write(attr, value)}
+        ok = self.__storage.sync()
+        if changed:
+            self._notify(changed)
+        return ok
+
+    def snapshot(self):
+        """Returns the current (saved) settings as plain attributes.
+
+        Unlike the settings object itself, the snapshot does not touch the
+        underlying storage, so it can be read from another thread.
+        """
+        return SimpleNamespace(
+            **{key: setting._raw for key, setting in self.__cache.items()}
+        )
+
+    def subscribe(self, callback):
+        """Registers a method to be called with the names of changed settings.
+
+        Only a weak reference to the method is kept, so subscribing does
+        not keep the subscriber alive.
+        """
+        self.__subscribers.append(WeakMethod(callback))
+
+    def _notify(self, keys):
+        """Calls each live subscriber with the set of changed setting names."""
+        live = []
+        for ref in self.__subscribers:
+            callback = ref()
+            if callback is not None:
+                callback(keys)
+                live.append(ref)
+        self.__subscribers = live
+
+    def save(self):
+        """Safe inflights to the underlying storage, see `apply()`.
+
+        Returns whether the settings could be written.
+        """
+        try:
+            return self.apply(self.__inflight)
+        finally:
+            self.flush()
+
+    def flush(self):
+        """Delete all inflights."""
+        self.__inflight.clear()
+
+
+class Plan(Settings):
+    """The settings of a weight management plan, kept in an INI file.
+
+    Init:
+        path: the plan file
+    """
+
+    defaults = {
+        "wcrate": -0.4536 / 7,  # kg/day
+        "cycle": 14,
+        "path": "",
+        "units": "imperial",
+        "always_show_adj": True,
+        "body_fat_method": "automatic",
+        "age": 25,
+        "height": 1.651,  # meters
+        "gender_selection": "none",
+        "gender_prop": 0.5,
+        "manual_body_fat": 0.25,
+    }
+
+    conversions = {
+        "wcrate": float,
+        "cycle": int,
+        "always_show_adj": bool,
+        "age": int,
+        "height": float,
+        "gender_prop": float,
+        "manual_body_fat": float,
+    }
+
+    def __init__(self, path):
+        super().__init__(self.defaults, self.conversions, IniStorage(path))
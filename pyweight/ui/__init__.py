@@ -0,0 +1,40 @@
+import importlib
+import os
+
+
+class RuntimeUi:
+    """Stand-in for a compiled UI class that parses the .ui file instead.
+
+    Used during development, when the UI modules have not been built (see
+    build.sh in this directory) or PYWEIGHT_LOAD_UI is set in the environment
+    to pick up changes to the .ui files without rebuilding.
+    """
+
+    uifile = None
+
+    def setupUi(self, widget):
+        from PyQt5 import uic
+
+        uic.loadUi(self.uifile, widget)
+
+
+def ui_class(name):
+    """Returns the class that sets up the UI `name` (e.g. "main") on a widget.
+
+    Windows should inherit the returned class and call `self.setupUi(self)`.
+    Normally this is the class generated by pyuic5; see `RuntimeUi` for when
+    it is not.
+    """
+    if not os.environ.get("PYWEIGHT_LOAD_UI"):
+        module_name = f"pyweight.ui.{name}"
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            # only a missing compiled module is expected; errors from inside
+            # it (e.g. missing resources) are packaging bugs and must surface
+            if e.name != module_name:
+                raise
+        else:
+            return next(v for k, v in vars(module).items() if k.startswith("Ui_"))
+    uifile = os.path.join(os.path.dirname(__file__), f"{name}.ui")
+    return type(f"RuntimeUi_{name}", (RuntimeUi,), {"uifile": uifile})
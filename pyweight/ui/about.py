@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'about.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.setWindowModality(QtCore.Qt.ApplicationModal)
+        Form.resize(455, 623)
+        icon = QtGui.QIcon.fromTheme("pyweight")
+        Form.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Form)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.label = QtWidgets.QLabel(Form)
+        self.label.setObjectName("label")
+        self.horizontalLayout.addWidget(self.label)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem1)
+        self.verticalLayout_2.addLayout(self.horizontalLayout)
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem2)
+        self.version_label = QtWidgets.QLabel(Form)
+        self.version_label.setObjectName("version_label")
+        self.horizontalLayout_2.addWidget(self.version_label)
+        spacerItem3 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem3)
+        self.verticalLayout_2.addLayout(self.horizontalLayout_2)
+        self.verticalLayout.addLayout(self.verticalLayout_2)
+        self.groupBox = QtWidgets.QGroupBox(Form)
+        self.groupBox.setObjectName("groupBox")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.groupBox)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.label_2 = QtWidgets.QLabel(self.groupBox)
+        self.label_2.setWordWrap(True)
+        self.label_2.setObjectName("label_2")
+        self.verticalLayout_4.addWidget(self.label_2)
+        self.verticalLayout.addWidget(self.groupBox)
+        self.groupBox_2 = QtWidgets.QGroupBox(Form)
+        self.groupBox_2.setObjectName("groupBox_2")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.groupBox_2)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.plainTextEdit = QtWidgets.QPlainTextEdit(self.groupBox_2)
+        self.plainTextEdit.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.plainTextEdit.setUndoRedoEnabled(False)
+        self.plainTextEdit.setReadOnly(True)
+        self.plainTextEdit.setPlainText("The following libraries are used by this program under the respective copyrights of their owners. The license for each library should be included with this program under the subdirectory \"licenses\".\n"
+"\n"
+"Qt 5 development libraries\n"
+"Copyright (C) The Qt Company.\n"
+"Licensed under GNU General Public License (GPL) version 3.\n"
+"\n"
+"PyQt5\n"
+"Copyright (C) Riverbank Computing Limited.\n"
+"Licensed under GNU General Public License (GPL) version 3.\n"
+"\n"
+"SciPy\n"
+"Copyright (C) 2001-2002 Enthought, Inc. 2003-2022, SciPy Developers.\n"
+"Licensed under the New BSD 3-Clause License.\n"
+"\n"
+"matplotlib\n"
+"Copyright (C) 2012- Matplotlib Development Team; All Rights Reserved.\n"
+"Licensed under the Matplotlib License Agreement.\n"
+"\n"
+"Windows distributions of PyWeight may require MSVC runtime libraries. The developers of PyWeight consider these to be \"System Libraries\" under Section 1 of the GPL 3.0 license, and explicitly grant permission to link this program with them or distribute the program along with these libraries.\n"
+"\n"
+"MSVC Runtime Libraries\n"
+"Copyright (C) Microsoft\n"
+"Redistribution of these libraries is explicitly permitted by Microsoft.\n"
+"")
+        self.plainTextEdit.setObjectName("plainTextEdit")
+        self.verticalLayout_3.addWidget(self.plainTextEdit)
+        self.verticalLayout.addWidget(self.groupBox_2)
+        self.config_buttons = QtWidgets.QDialogButtonBox(Form)
+        self.config_buttons.setStandardButtons(QtWidgets.QDialogButtonBox.Ok)
+        self.config_buttons.setObjectName("config_buttons")
+        self.verticalLayout.addWidget(self.config_buttons)
+
+        self.retranslateUi(Form)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "About - PyWeight"))
+        self.label.setText(_translate("Form", "<html><head/><body><p><span style=\" font-size:18pt; font-weight:600;\">PyWeight</span></p></body></html>"))
+        self.version_label.setText(_translate("Form", "Version:"))
+        self.groupBox.setTitle(_translate("Form", "License"))
+        self.label_2.setText(_translate("Form", "Copyright (C) 2022 Adam Fontenot\n"
+"\n"
+"This program is free software: you can redistribute it and/or modify\n"
+"it under the terms of version 3 the GNU General Public License as\n"
+"published by the Free Software Foundation.\n"
+"\n"
+"This program is distributed in the hope that it will be useful,\n"
+"but WITHOUT ANY WARRANTY; without even the implied warranty of\n"
+"MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the\n"
+"GNU General Public License for more details.\n"
+"\n"
+"You should have received a copy of the GNU General Public License\n"
+"along with this program.  If not, see <https://www.gnu.org/licenses/>."))
+        self.groupBox_2.setTitle(_translate("Form", "Additional Licenses"))
@@ -0,0 +1,10 @@
+#!/usr/bin/env bash
+
+set -euo pipefail
+
+# Compiles the Qt Designer files into Python modules (main.ui -> main.py),
+# which the windows use instead of parsing the XML at runtime.
+cd "$(dirname "$0")"
+for file in *.ui; do pyuic5 -o "${file%.ui}.py" "$file"; done
+# our resources are compiled to pyweight/qresources.py, not resources_rc.py
+sed -i 's/^import resources_rc$/import pyweight.qresources  # noqa: F401/' main.py
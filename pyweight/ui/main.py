@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'main.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(931, 686)
+        icon = QtGui.QIcon.fromTheme("pyweight")
+        MainWindow.setWindowIcon(icon)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.centralwidget)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.tableView = QtWidgets.QTableView(self.centralwidget)
+        self.tableView.setEnabled(True)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(4)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.tableView.sizePolicy().hasHeightForWidth())
+        self.tableView.setSizePolicy(sizePolicy)
+        self.tableView.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+        self.tableView.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.tableView.setSizeAdjustPolicy(QtWidgets.QAbstractScrollArea.AdjustToContents)
+        self.tableView.setEditTriggers(QtWidgets.QAbstractItemView.AnyKeyPressed|QtWidgets.QAbstractItemView.DoubleClicked|QtWidgets.QAbstractItemView.EditKeyPressed|QtWidgets.QAbstractItemView.SelectedClicked)
+        self.tableView.setProperty("showDropIndicator", False)
+        self.tableView.setAlternatingRowColors(True)
+        self.tableView.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.tableView.setObjectName("tableView")
+        self.horizontalLayout.addWidget(self.tableView)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menuBar = QtWidgets.QMenuBar(MainWindow)
+        self.menuBar.setGeometry(QtCore.QRect(0, 0, 931, 32))
+        self.menuBar.setObjectName("menuBar")
+        self.menuFile = QtWidgets.QMenu(self.menuBar)
+        self.menuFile.setObjectName("menuFile")
+        self.menuData = QtWidgets.QMenu(self.menuBar)
+        self.menuData.setObjectName("menuData")
+        self.menuSettings = QtWidgets.QMenu(self.menuBar)
+        self.menuSettings.setObjectName("menuSettings")
+        self.menuHelp = QtWidgets.QMenu(self.menuBar)
+        self.menuHelp.setObjectName("menuHelp")
+        MainWindow.setMenuBar(self.menuBar)
+        self.action_about = QtWidgets.QAction(MainWindow)
+        self.action_about.setObjectName("action_about")
+        self.action_new_file = QtWidgets.QAction(MainWindow)
+        self.action_new_file.setObjectName("action_new_file")
+        self.action_open_file = QtWidgets.QAction(MainWindow)
+        self.action_open_file.setObjectName("action_open_file")
+        self.action_save_file = QtWidgets.QAction(MainWindow)
+        self.action_save_file.setObjectName("action_save_file")
+        self.action_new_plan = QtWidgets.QAction(MainWindow)
+        self.action_new_plan.setObjectName("action_new_plan")
+        self.action_open_plan = QtWidgets.QAction(MainWindow)
+        self.action_open_plan.setObjectName("action_open_plan")
+        self.action_quit = QtWidgets.QAction(MainWindow)
+        self.action_quit.setObjectName("action_quit")
+        self.action_refresh = QtWidgets.QAction(MainWindow)
+        self.action_refresh.setObjectName("action_refresh")
+        self.action_export = QtWidgets.QAction(MainWindow)
+        self.action_export.setObjectName("action_export")
+        self.action_import = QtWidgets.QAction(MainWindow)
+        self.action_import.setObjectName("action_import")
+        self.action_plan_settings = QtWidgets.QAction(MainWindow)
+        self.action_plan_settings.setObjectName("action_plan_settings")
+        self.action_pyweight_settings = QtWidgets.QAction(MainWindow)
+        self.action_pyweight_settings.setObjectName("action_pyweight_settings")
+        self.action_user_guide = QtWidgets.QAction(MainWindow)
+        self.action_user_guide.setObjectName("action_user_guide")
+        self.menuFile.addAction(self.action_new_file)
+        self.menuFile.addAction(self.action_open_file)
+        self.menuFile.addAction(self.action_save_file)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.action_new_plan)
+        self.menuFile.addAction(self.action_open_plan)
+        self.menuFile.addSeparator()
+        self.menuFile.addAction(self.action_quit)
+        self.menuData.addAction(self.action_refresh)
+        self.menuData.addAction(self.action_export)
+        self.menuData.addAction(self.action_import)
+        self.menuSettings.addAction(self.action_plan_settings)
+        self.menuSettings.addAction(self.action_pyweight_settings)
+        self.menuHelp.addAction(self.action_about)
+        self.menuHelp.addAction(self.action_user_guide)
+        self.menuBar.addAction(self.menuFile.menuAction())
+        self.menuBar.addAction(self.menuData.menuAction())
+        self.menuBar.addAction(self.menuSettings.menuAction())
+        self.menuBar.addAction(self.menuHelp.menuAction())
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "PyWeight"))
+        self.menuFile.setTitle(_translate("MainWindow", "File"))
+        self.menuData.setTitle(_translate("MainWindow", "Data"))
+        self.menuSettings.setTitle(_translate("MainWindow", "Settings"))
+        self.menuHelp.setTitle(_translate("MainWindow", "Help"))
+        self.action_about.setText(_translate("MainWindow", "About PyWeight"))
+        self.action_new_file.setText(_translate("MainWindow", "New File"))
+        self.action_new_file.setShortcut(_translate("MainWindow", "Ctrl+N"))
+        self.action_open_file.setText(_translate("MainWindow", "Open File"))
+        self.action_open_file.setShortcut(_translate("MainWindow", "Ctrl+O"))
+        self.action_save_file.setText(_translate("MainWindow", "Save File"))
+        self.action_save_file.setShortcut(_translate("MainWindow", "Ctrl+S"))
+        self.action_new_plan.setText(_translate("MainWindow", "New Plan"))
+        self.action_open_plan.setText(_translate("MainWindow", "Open Plan"))
+        self.action_quit.setText(_translate("MainWindow", "Quit"))
+        self.action_quit.setShortcut(_translate("MainWindow", "Ctrl+Q"))
+        self.action_refresh.setText(_translate("MainWindow", "Refresh Plot"))
+        self.action_refresh.setShortcut(_translate("MainWindow", "Ctrl+R"))
+        self.action_export.setText(_translate("MainWindow", "Export Plot"))
+        self.action_export.setShortcut(_translate("MainWindow", "Ctrl+E"))
+        self.action_import.setText(_translate("MainWindow", "Import Weights..."))
+        self.action_plan_settings.setText(_translate("MainWindow", "Plan Settings"))
+        self.action_pyweight_settings.setText(_translate("MainWindow", "PyWeight Settings"))
+        self.action_user_guide.setText(_translate("MainWindow", "User Guide"))
+import pyweight.qresources  # noqa: F401
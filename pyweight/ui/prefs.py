@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'prefs.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.setWindowModality(QtCore.Qt.ApplicationModal)
+        Form.resize(455, 282)
+        icon = QtGui.QIcon.fromTheme("pyweight")
+        Form.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Form)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.groupBox_3 = QtWidgets.QGroupBox(Form)
+        self.groupBox_3.setObjectName("groupBox_3")
+        self.verticalLayout_4 = QtWidgets.QVBoxLayout(self.groupBox_3)
+        self.verticalLayout_4.setObjectName("verticalLayout_4")
+        self.reopen_cbox = QtWidgets.QCheckBox(self.groupBox_3)
+        self.reopen_cbox.setChecked(True)
+        self.reopen_cbox.setObjectName("reopen_cbox")
+        self.verticalLayout_4.addWidget(self.reopen_cbox)
+        self.auto_save_cbox = QtWidgets.QCheckBox(self.groupBox_3)
+        self.auto_save_cbox.setObjectName("auto_save_cbox")
+        self.verticalLayout_4.addWidget(self.auto_save_cbox)
+        self.verticalLayout.addWidget(self.groupBox_3)
+        self.groupBox = QtWidgets.QGroupBox(Form)
+        self.groupBox.setObjectName("groupBox")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.groupBox)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.language_selection = QtWidgets.QComboBox(self.groupBox)
+        self.language_selection.setObjectName("language_selection")
+        self.verticalLayout_2.addWidget(self.language_selection)
+        self.label = QtWidgets.QLabel(self.groupBox)
+        self.label.setWordWrap(True)
+        self.label.setObjectName("label")
+        self.verticalLayout_2.addWidget(self.label)
+        self.verticalLayout.addWidget(self.groupBox)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem)
+        self.config_buttons = QtWidgets.QDialogButtonBox(Form)
+        self.config_buttons.setStandardButtons(QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
+        self.config_buttons.setObjectName("config_buttons")
+        self.verticalLayout.addWidget(self.config_buttons)
+
+        self.retranslateUi(Form)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "Preferences - PyWeight"))
+        self.groupBox_3.setTitle(_translate("Form", "Options"))
+        self.reopen_cbox.setText(_translate("Form", "Reopen last used plan automatically"))
+        self.auto_save_cbox.setText(_translate("Form", "Save changes to data files automatically"))
+        self.groupBox.setTitle(_translate("Form", "Language"))
+        self.label.setText(_translate("Form", "If you would like to contribute translations for this program, please file an issue on Github."))
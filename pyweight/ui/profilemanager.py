@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'profilemanager.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.setWindowModality(QtCore.Qt.ApplicationModal)
+        Form.resize(472, 597)
+        icon = QtGui.QIcon.fromTheme("pyweight")
+        Form.setWindowIcon(icon)
+        self.verticalLayout = QtWidgets.QVBoxLayout(Form)
+        self.verticalLayout.setObjectName("verticalLayout")
+        self.groupBox = QtWidgets.QGroupBox(Form)
+        self.groupBox.setAlignment(QtCore.Qt.AlignLeading|QtCore.Qt.AlignLeft|QtCore.Qt.AlignVCenter)
+        self.groupBox.setObjectName("groupBox")
+        self.horizontalLayout_11 = QtWidgets.QHBoxLayout(self.groupBox)
+        self.horizontalLayout_11.setObjectName("horizontalLayout_11")
+        self.kg_radio = QtWidgets.QRadioButton(self.groupBox)
+        self.kg_radio.setObjectName("kg_radio")
+        self.units_buttongroup = QtWidgets.QButtonGroup(Form)
+        self.units_buttongroup.setObjectName("units_buttongroup")
+        self.units_buttongroup.addButton(self.kg_radio)
+        self.horizontalLayout_11.addWidget(self.kg_radio)
+        self.lbs_radio = QtWidgets.QRadioButton(self.groupBox)
+        self.lbs_radio.setChecked(True)
+        self.lbs_radio.setObjectName("lbs_radio")
+        self.units_buttongroup.addButton(self.lbs_radio)
+        self.horizontalLayout_11.addWidget(self.lbs_radio)
+        self.verticalLayout.addWidget(self.groupBox)
+        self.groupBox_3 = QtWidgets.QGroupBox(Form)
+        self.groupBox_3.setObjectName("groupBox_3")
+        self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.groupBox_3)
+        self.verticalLayout_3.setObjectName("verticalLayout_3")
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setContentsMargins(-1, -1, -1, 0)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.wcrate_spin_box = QtWidgets.QDoubleSpinBox(self.groupBox_3)
+        self.wcrate_spin_box.setDecimals(2)
+        self.wcrate_spin_box.setMinimum(-3.0)
+        self.wcrate_spin_box.setMaximum(3.0)
+        self.wcrate_spin_box.setSingleStep(0.1)
+        self.wcrate_spin_box.setProperty("value", -1.0)
+        self.wcrate_spin_box.setObjectName("wcrate_spin_box")
+        self.horizontalLayout.addWidget(self.wcrate_spin_box)
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout.addItem(spacerItem)
+        self.verticalLayout_3.addLayout(self.horizontalLayout)
+        self.label = QtWidgets.QLabel(self.groupBox_3)
+        self.label.setObjectName("label")
+        self.verticalLayout_3.addWidget(self.label)
+        self.verticalLayout.addWidget(self.groupBox_3)
+        self.groupBox_2 = QtWidgets.QGroupBox(Form)
+        self.groupBox_2.setObjectName("groupBox_2")
+        self.gridLayout = QtWidgets.QGridLayout(self.groupBox_2)
+        self.gridLayout.setObjectName("gridLayout")
+        self.cycle_spinbox = QtWidgets.QSpinBox(self.groupBox_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.cycle_spinbox.sizePolicy().hasHeightForWidth())
+        self.cycle_spinbox.setSizePolicy(sizePolicy)
+        self.cycle_spinbox.setMinimumSize(QtCore.QSize(114, 0))
+        self.cycle_spinbox.setFrame(True)
+        self.cycle_spinbox.setMinimum(7)
+        self.cycle_spinbox.setMaximum(30)
+        self.cycle_spinbox.setProperty("value", 14)
+        self.cycle_spinbox.setObjectName("cycle_spinbox")
+        self.gridLayout.addWidget(self.cycle_spinbox, 1, 0, 1, 1)
+        self.show_adjust_cbox = QtWidgets.QCheckBox(self.groupBox_2)
+        self.show_adjust_cbox.setChecked(True)
+        self.show_adjust_cbox.setObjectName("show_adjust_cbox")
+        self.gridLayout.addWidget(self.show_adjust_cbox, 1, 1, 1, 1)
+        self.verticalLayout.addWidget(self.groupBox_2)
+        self.groupBox_4 = QtWidgets.QGroupBox(Form)
+        self.groupBox_4.setObjectName("groupBox_4")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.groupBox_4)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_6.setSpacing(6)
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.bfp_automatic_radio = QtWidgets.QRadioButton(self.groupBox_4)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.bfp_automatic_radio.sizePolicy().hasHeightForWidth())
+        self.bfp_automatic_radio.setSizePolicy(sizePolicy)
+        self.bfp_automatic_radio.setChecked(True)
+        self.bfp_automatic_radio.setObjectName("bfp_automatic_radio")
+        self.bfp_mode_buttongroup = QtWidgets.QButtonGroup(Form)
+        self.bfp_mode_buttongroup.setObjectName("bfp_mode_buttongroup")
+        self.bfp_mode_buttongroup.addButton(self.bfp_automatic_radio)
+        self.horizontalLayout_6.addWidget(self.bfp_automatic_radio)
+        self.bfp_info_button = QtWidgets.QPushButton(self.groupBox_4)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.bfp_info_button.sizePolicy().hasHeightForWidth())
+        self.bfp_info_button.setSizePolicy(sizePolicy)
+        icon = QtGui.QIcon.fromTheme("help-about")
+        self.bfp_info_button.setIcon(icon)
+        self.bfp_info_button.setObjectName("bfp_info_button")
+        self.horizontalLayout_6.addWidget(self.bfp_info_button)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_6.addItem(spacerItem1)
+        self.gridLayout_2.addLayout(self.horizontalLayout_6, 0, 0, 1, 1)
+        self.horizontalLayout_3 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_3.setObjectName("horizontalLayout_3")
+        self.age_label = QtWidgets.QLabel(self.groupBox_4)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.age_label.sizePolicy().hasHeightForWidth())
+        self.age_label.setSizePolicy(sizePolicy)
+        self.age_label.setObjectName("age_label")
+        self.horizontalLayout_3.addWidget(self.age_label)
+        self.age_spinbox = QtWidgets.QSpinBox(self.groupBox_4)
+        self.age_spinbox.setEnabled(True)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.age_spinbox.sizePolicy().hasHeightForWidth())
+        self.age_spinbox.setSizePolicy(sizePolicy)
+        self.age_spinbox.setMinimum(18)
+        self.age_spinbox.setMaximum(120)
+        self.age_spinbox.setProperty("value", 25)
+        self.age_spinbox.setObjectName("age_spinbox")
+        self.horizontalLayout_3.addWidget(self.age_spinbox)
+        self.height_label = QtWidgets.QLabel(self.groupBox_4)
+        self.height_label.setObjectName("height_label")
+        self.horizontalLayout_3.addWidget(self.height_label)
+        self.height_spinbox = QtWidgets.QDoubleSpinBox(self.groupBox_4)
+        self.height_spinbox.setDecimals(1)
+        self.height_spinbox.setMinimum(0.0)
+        self.height_spinbox.setMaximum(300.0)
+        self.height_spinbox.setSingleStep(0.1)
+        self.height_spinbox.setObjectName("height_spinbox")
+        self.horizontalLayout_3.addWidget(self.height_spinbox)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_3.addItem(spacerItem2)
+        self.gridLayout_2.addLayout(self.horizontalLayout_3, 1, 0, 1, 1)
+        self.gender_selection_gbox = QtWidgets.QGroupBox(self.groupBox_4)
+        self.gender_selection_gbox.setObjectName("gender_selection_gbox")
+        self.horizontalLayout_7 = QtWidgets.QHBoxLayout(self.gender_selection_gbox)
+        self.horizontalLayout_7.setContentsMargins(5, 5, 5, 5)
+        self.horizontalLayout_7.setObjectName("horizontalLayout_7")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_2.setContentsMargins(-1, -1, 0, -1)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.bfp_female_radio = QtWidgets.QRadioButton(self.gender_selection_gbox)
+        self.bfp_female_radio.setObjectName("bfp_female_radio")
+        self.verticalLayout_2.addWidget(self.bfp_female_radio)
+        self.bfp_male_radio = QtWidgets.QRadioButton(self.gender_selection_gbox)
+        self.bfp_male_radio.setObjectName("bfp_male_radio")
+        self.verticalLayout_2.addWidget(self.bfp_male_radio)
+        self.bfp_othergender_radio = QtWidgets.QRadioButton(self.gender_selection_gbox)
+        self.bfp_othergender_radio.setObjectName("bfp_othergender_radio")
+        self.verticalLayout_2.addWidget(self.bfp_othergender_radio)
+        self.horizontalLayout_7.addLayout(self.verticalLayout_2)
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.sex_label_1 = QtWidgets.QLabel(self.gender_selection_gbox)
+        self.sex_label_1.setObjectName("sex_label_1")
+        self.horizontalLayout_2.addWidget(self.sex_label_1)
+        spacerItem3 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_2.addItem(spacerItem3)
+        self.sex_label_2 = QtWidgets.QLabel(self.gender_selection_gbox)
+        self.sex_label_2.setObjectName("sex_label_2")
+        self.horizontalLayout_2.addWidget(self.sex_label_2)
+        self.verticalLayout_5.addLayout(self.horizontalLayout_2)
+        self.sex_slider = QtWidgets.QSlider(self.gender_selection_gbox)
+        self.sex_slider.setStyleSheet("")
+        self.sex_slider.setMaximum(100)
+        self.sex_slider.setProperty("value", 50)
+        self.sex_slider.setOrientation(QtCore.Qt.Horizontal)
+        self.sex_slider.setInvertedAppearance(False)
+        self.sex_slider.setInvertedControls(False)
+        self.sex_slider.setTickPosition(QtWidgets.QSlider.TicksAbove)
+        self.sex_slider.setObjectName("sex_slider")
+        self.verticalLayout_5.addWidget(self.sex_slider)
+        self.usage_advice_label = QtWidgets.QLabel(self.gender_selection_gbox)
+        self.usage_advice_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.usage_advice_label.setObjectName("usage_advice_label")
+        self.verticalLayout_5.addWidget(self.usage_advice_label)
+        self.horizontalLayout_7.addLayout(self.verticalLayout_5)
+        self.gridLayout_2.addWidget(self.gender_selection_gbox, 2, 0, 1, 1)
+        self.horizontalLayout_4 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_4.setContentsMargins(-1, -1, 10, -1)
+        self.horizontalLayout_4.setObjectName("horizontalLayout_4")
+        self.bfp_manual_radio = QtWidgets.QRadioButton(self.groupBox_4)
+        self.bfp_manual_radio.setObjectName("bfp_manual_radio")
+        self.bfp_mode_buttongroup.addButton(self.bfp_manual_radio)
+        self.horizontalLayout_4.addWidget(self.bfp_manual_radio)
+        spacerItem4 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_4.addItem(spacerItem4)
+        self.gridLayout_2.addLayout(self.horizontalLayout_4, 0, 1, 1, 1)
+        self.horizontalLayout_5 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_5.setObjectName("horizontalLayout_5")
+        spacerItem5 = QtWidgets.QSpacerItem(50, 20, QtWidgets.QSizePolicy.MinimumExpanding, QtWidgets.QSizePolicy.Minimum)
+        self.horizontalLayout_5.addItem(spacerItem5)
+        self.manual_bfp_label = QtWidgets.QLabel(self.groupBox_4)
+        self.manual_bfp_label.setObjectName("manual_bfp_label")
+        self.horizontalLayout_5.addWidget(self.manual_bfp_label)
+        self.manual_bfp_spinbox = QtWidgets.QDoubleSpinBox(self.groupBox_4)
+        self.manual_bfp_spinbox.setDecimals(1)
+        self.manual_bfp_spinbox.setMaximum(100.0)
+        self.manual_bfp_spinbox.setSingleStep(0.1)
+        self.manual_bfp_spinbox.setProperty("value", 25.0)
+        self.manual_bfp_spinbox.setObjectName("manual_bfp_spinbox")
+        self.horizontalLayout_5.addWidget(self.manual_bfp_spinbox)
+        self.gridLayout_2.addLayout(self.horizontalLayout_5, 1, 1, 1, 1)
+        self.verticalLayout.addWidget(self.groupBox_4)
+        spacerItem6 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.verticalLayout.addItem(spacerItem6)
+        self.config_buttons = QtWidgets.QDialogButtonBox(Form)
+        self.config_buttons.setStandardButtons(QtWidgets.QDialogButtonBox.Apply|QtWidgets.QDialogButtonBox.Cancel|QtWidgets.QDialogButtonBox.Ok)
+        self.config_buttons.setObjectName("config_buttons")
+        self.verticalLayout.addWidget(self.config_buttons)
+
+        self.retranslateUi(Form)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "Profile - PyWeight"))
+        self.groupBox.setTitle(_translate("Form", "Units"))
+        self.kg_radio.setText(_translate("Form", "Metric (kilograms)"))
+        self.lbs_radio.setText(_translate("Form", "Imperial (pounds)"))
+        self.groupBox_3.setTitle(_translate("Form", "Desired Rate of Weight Change"))
+        self.wcrate_spin_box.setSuffix(_translate("Form", " lbs/wk"))
+        self.label.setText(_translate("Form", "Note: positive values indicate increases, negative decreases."))
+        self.groupBox_2.setTitle(_translate("Form", "Diet Adjustment Frequency"))
+        self.cycle_spinbox.setSuffix(_translate("Form", " days"))
+        self.show_adjust_cbox.setText(_translate("Form", "Show adjustment value every day"))
+        self.groupBox_4.setTitle(_translate("Form", "Initial Body Fat Percentage"))
+        self.bfp_automatic_radio.setText(_translate("Form", "Automatic"))
+        self.bfp_info_button.setText(_translate("Form", "Help"))
+        self.age_label.setText(_translate("Form", "Age:"))
+        self.age_spinbox.setSuffix(_translate("Form", " years"))
+        self.height_label.setText(_translate("Form", "Height:"))
+        self.height_spinbox.setSuffix(_translate("Form", " in"))
+        self.gender_selection_gbox.setTitle(_translate("Form", "Gender"))
+        self.bfp_female_radio.setText(_translate("Form", "Female"))
+        self.bfp_male_radio.setText(_translate("Form", "Male"))
+        self.bfp_othergender_radio.setText(_translate("Form", "Non-binary"))
+        self.sex_label_1.setText(_translate("Form", "Female"))
+        self.sex_label_2.setText(_translate("Form", "Male"))
+        self.usage_advice_label.setText(_translate("Form", "Click Help for usage advice"))
+        self.bfp_manual_radio.setText(_translate("Form", "Manual"))
+        self.manual_bfp_label.setToolTip(_translate("Form", "Body Fat Percentage"))
+        self.manual_bfp_label.setText(_translate("Form", "BFP:"))
+        self.manual_bfp_spinbox.setSuffix(_translate("Form", "%"))
@@ -1,11 +1,12 @@
-from PyQt5 import uic
 from PyQt5.QtWidgets import QDialog, QDialogButtonBox
 
+from pyweight.ui import ui_class
 
-class AboutWindow(QDialog):
+
+class AboutWindow(QDialog, ui_class("about")):
     def __init__(self, versioninfo, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        uic.loadUi("pyweight/ui/about.ui", self)
+        self.setupUi(self)
         self.setFixedSize(self.size())
 
         self.version_label.setText(f"Version: {versioninfo}")
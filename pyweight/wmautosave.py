@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# how long the user has to stop editing before changes are autosaved
+AUTOSAVE_DELAY_MS = 1000
+
+
+class AutoSaver(QObject):
+    """Saves a WeightTable in the background once edits have settled down.
+
+    Each call to `schedule()` restarts a short timer, so a burst of edits
+    results in a single save. When the timer fires, the model's pending
+    edits are snapshotted on the GUI thread (see `WeightTable.save_job()`)
+    and written on a worker thread, so slow disks never block the UI. A
+    single worker runs the jobs, in order.
+
+    Failures are reported through the `failed` signal, with the error
+    message; the edits involved are then only in memory, so the owner
+    should treat the file as modified.
+
+    Init:
+        parent: the owning QObject
+    """
+
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._last_job = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(AUTOSAVE_DELAY_MS)
+        self._timer.timeout.connect(self._save)
+
+    def schedule(self, model):
+        """Saves the edits to `model` once no new ones arrive for a while."""
+        if self.model is not model:
+            self.flush()
+            self.model = model
+        self._timer.start()
+
+    def flush(self):
+        """Saves any pending edits now, and waits for every save to finish."""
+        if self._timer.isActive():
+            self._timer.stop()
+            self._save()
+        if self._last_job is not None:
+            # failures have already been reported by `_done`
+            self._last_job.exception()
+            self._last_job = None
+
+    def _save(self):
+        """Snapshots the pending edits and hands them to the worker."""
+        job = self.model.save_job()
+        if job is not None:
+            self._last_job = self._executor.submit(job)
+            self._last_job.add_done_callback(self._done)
+
+    def _done(self, future):
+        """Reports a failed save; may be called from the worker thread."""
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(str(error))
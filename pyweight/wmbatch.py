@@ -0,0 +1,109 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# the columns of the results, in order
+FIELDS = ("plan", "data", "end_date", "units", "adjustment", "error")
+
+
+def assess_plan(plan_path):
+    """Computes the current adjustment for a plan file.
+
+    Runs in a worker process, so everything it needs is imported here.
+
+    Args:
+        plan_path: path to a plan (INI) file
+
+    Returns:
+        a dict with an entry for each of `FIELDS`; on failure, `error`
+        describes what went wrong and the fields that need the data are None
+    """
+    from pyweight.core.bodymodel import WeightTracker
+    from pyweight.core.data import WeightData
+    from pyweight.core.settings import Plan
+
+    result = dict.fromkeys(FIELDS)
+    result["plan"] = plan_path
+    try:
+        if not os.path.exists(plan_path):
+            raise FileNotFoundError(f"{plan_path} does not exist.")
+        plan = Plan(plan_path)
+        result["data"] = str(plan.path)
+        result["units"] = str(plan.units)
+        # unlike the GUI, never create a missing data file
+        if not os.path.exists(plan.path):
+            raise FileNotFoundError(f"{plan.path} does not exist.")
+        data = WeightData(plan.path, plan.units)
+        tracker = WeightTracker(data, plan, listen=False)
+        result["end_date"] = tracker.data.end_date.isoformat()
+        if tracker.interpolation is None:
+            raise ValueError("not enough data to compute an adjustment.")
+        result["adjustment"] = int(tracker.adjustment)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def assess_plans(plan_paths, jobs=None):
+    """Computes the adjustments of many plans, in parallel.
+
+    Args:
+        plan_paths: paths to plan files
+        jobs: number of worker processes (default: one per CPU); with 1,
+            the plans are processed in this process
+
+    Returns:
+        a list of results (see `assess_plan`), in the order of `plan_paths`
+    """
+    if jobs == 1:
+        return [assess_plan(path) for path in plan_paths]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # hand out plans in chunks, so workers are not kept waiting on us
+        chunksize = max(1, len(plan_paths) // (4 * (jobs or os.cpu_count() or 1)))
+        return list(executor.map(assess_plan, plan_paths, chunksize=chunksize))
+
+
+def write_results(results, fmt, out):
+    """Writes results to a file object as "json" or "csv"."""
+    if fmt == "json":
+        json.dump(results, out, indent=2)
+        out.write("\n")
+    else:
+        csvw = csv.DictWriter(out, fieldnames=FIELDS, lineterminator="\n")
+        csvw.writeheader()
+        csvw.writerows(results)
+
+
+def main(argv=None):
+    """Runs `pyweight batch` (or `pyweight-batch`), returns the exit status.
+
+    Computes the current calorie adjustment for each plan given on the
+    command line, without creating any windows, and writes the results to
+    stdout as JSON or CSV. The exit status is 1 if any plan could not be
+    assessed.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pyweight batch",
+        description="Compute the current calorie adjustment for many plans.",
+    )
+    parser.add_argument("plans", nargs="+", help="plan files to assess")
+    parser.add_argument(
+        "-f", "--format", choices=("json", "csv"), default="json", help="output format"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: one per CPU)",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    results = assess_plans(args.plans, args.jobs)
+    write_results(results, args.format, sys.stdout)
+    return 1 if any(result["error"] for result in results) else 0
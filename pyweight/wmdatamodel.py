@@ -1,93 +1,91 @@
-import csv
-import os
-from datetime import datetime, timedelta
-from tempfile import mkstemp
+from PyQt5.QtCore import (
+    Qt,
+    QAbstractListModel,
+    QFileSystemWatcher,
+    QModelIndex,
+    pyqtSignal,
+)
 
-from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from pyweight.core.data import WeightData
 
-from pyweight.wmutils import kg_to_lbs, lbs_to_kg
 
-
-class WeightTable(QAbstractListModel):
+class WeightTable(QAbstractListModel, WeightData):
     """A model for QT's MVC architecture.
 
-    A WeightTable contains a set of weight data, and tooling for creating,
-    saving, and manipulating this data in a sensible way. For statistical
-    methods for working with this data, see WeightTracker in wmbodymodel.py.
-
-    Users of WeightTable (other than MVC members) are generally expected
-    to interact with the data through the `dates`, `daynumbers`, and `weights`
-    family of functions. These provide a linear, time-ordered view of the
-    values in the list model, and are guaranteed to coincide. Each omits blank
-    days, and `daynumbers` provides a one-based incrementing day counter that
-    gives the true day total since the start of the dataset for each day.
+    A WeightTable is the WeightData of a data file (see core/data.py, which
+    holds the data and all the tooling for loading, saving, and manipulating
+    it), presented as a Qt list model. This is a *list* model; the "data" is
+    just the weights. Row headers (the date strings) are generated from the
+    day offsets.
 
-    Since the 1-1 correspondence is maintained between dates and daynumbers,
-    a generally useful approach for working with the data is to treat the
-    day numbers and weights as x-y data, respectively, and use the true dates
-    for display.
+    Every change made through the model is announced to views with the
+    usual Qt signals.
 
-    Since PyWeight's underlying data are always stored in metric units, this
-    class hides this implementation detail. Data are presented in the instance
-    owner's preferred units.
+    The data file is watched, and changes other programs make to it (a sync
+    client, a scale's importer) are merged into the model, see `reload()`.
 
     Init:
         csvpath: initializes the WT with a CSV file
+        units: "imperial" or "metric", see `set_units()`
 
     Attributes:
-      * end_date: get date of the last *filled* cell
-      * dates: get list of dates for every filled cell
-      * daynumbers: get list of days since start for each filled cell
       * has_new_plottable_data: indicate whether changes to data need plotting
-      * weights: get list of weights for every filled cell
-      * weight_colname: display version of the weight unit
+      * (all of WeightData's)
+
+    Signals:
+      * reloaded(list): changes to the data file were merged into the model;
+        carries the dates whose changes were dropped as conflicts
 
     Important Methods:
       * add_dates(): fill model with empty dates when needed
-      * create_csv(): make a new blank csv at a path
-      * save_csv(): saves stored data to the backing file
-      * set_units(): tell WT which units to present the data in to viewers
+      * reload(): merge changes made to the data file by other programs
+      * merge_entries(): merge many weight readings at once
+      * (all of WeightData's)
     """
 
-    def __init__(self, csvpath, units):
-        super().__init__()
+    reloaded = pyqtSignal(list)
 
-        # Internally, the data has three columns:
-        #   [datetime, str_date, value]
-        # This is a *list* model, however; the "data" is just the last column
-        # The second column is used for the row headers, and keeping track of
-        #   the date is useful internally
-        self._data = []
+    def __init__(self, csvpath, units):
+        # the keyword arguments are passed on to WeightData
+        super().__init__(csvpath=csvpath, units=units)
 
         # We use this to determine when we need to replot. Adding new (blank)
         # dates also triggers the dataChanged() slot, but we don't want to
         # replot when that happens.
         self.has_new_plottable_data = False
 
-        # If the user prefers imperial units to metric, this class pretends
-        # that all the data is imperial, even though we only save metric data
-        # to the underlying CSV.
-        self.set_units(units)
-
-        # If the CSV does not already exist, it is automatically created
-        if not os.path.exists(csvpath):
-            self.create_csv(csvpath)
-
-        # initialize the table from a CSV
-        # currently we depend on a very specific format, which should
-        # be created for the user as needed with `create_csv()`
-        with open(csvpath, encoding="utf-8", newline="") as f:
-            csvr = csv.reader(f)
-            next(csvr)  # skip header
-            for row in csvr:
-                date = datetime.strptime(row[0], "%Y/%m/%d").date()
-                value = row[1]
-                if value != "":
-                    value = float(value)
-                self._data.append([date, row[0], value])
-
-        self.start_date = self._data[0][0]
-        self.csvpath = csvpath
+        self.watcher = QFileSystemWatcher([csvpath], self)
+        self.watcher.fileChanged.connect(self.file_changed)
+
+    def close(self):
+        """Stops watching the data file, for a table that is done with."""
+        if self.watcher.files():
+            self.watcher.removePaths(self.watcher.files())
+
+    def file_changed(self, path):
+        """Slot: the data file changed on disk."""
+        # files replaced by a rename (as our own saves do) stop being watched
+        if path not in self.watcher.files():
+            self.watcher.addPath(path)
+        self.reload()
+
+    def reload(self):
+        """Merges the changes other programs made to the data file.
+
+        See `WeightData.disk_changes()`. The changes are announced to views
+        all at once, see `_apply_changes()`; if anything changed or was in
+        conflict, `reloaded` is emitted. The merged changes are already on
+        disk, so they are not journaled. A file that can't be read (e.g.
+        half written) is ignored, as it will change again.
+        """
+        try:
+            days, values, conflicts = self.disk_changes()
+        except (OSError, ValueError):
+            return
+        if len(days):
+            self._apply_changes(days, values)
+        if len(days) or len(conflicts):
+            self.reloaded.emit([self._date(day) for day in conflicts.tolist()])
 
     def set_units(self, units):
         """Changes the units the model's public data is in.
@@ -97,61 +95,68 @@ class WeightTable(QAbstractListModel):
         Args:
             units: "imperial" or "metric" (default)
         """
-        self.imperial = units == "imperial"
-        self.unit = "lbs" if self.imperial else "kg"
-        self.weight_colname = f"Weight ({self.unit})"
-        self.dataChanged.emit(self.index(0), self.index(len(self._data)))
+        super().set_units(units)
+        self.dataChanged.emit(self.index(0), self.index(self.row_count - 1))
 
     def rowCount(self, parent):
         """Reimplements QAbstractListModel - count rows in model"""
         if parent.isValid():
             return 0
-        return len(self._data)
+        return self.row_count
 
-    #
     def data(self, index, role):
         """Reimplements QAbstractListModel - read data from model"""
         if role in (Qt.DisplayRole, Qt.EditRole):
-            # the third column contains the public data
-            val = self._data[index.row()][2]
-            # conversion to imperial (if needed) is here
-            # we read data rarely enough that cacheing this is probably not worth it
-            if val != "":
-                if self.imperial:
-                    val = kg_to_lbs(val)
-                # we store high precision internally, but for display round the values
-                val = round(val, 2)
-            return str(val)
+            return self.display_value(index.row())
         return None
 
     def setData(self, index, value, role):
         """Reimplements QAbstractListModel - set data in model
 
-        Transparently handles values in the model (which are floats)
-        and empty values (which are "" strings).
+        See `WeightData.set_value()`; invalid values are rejected.
         """
         if role == Qt.EditRole:
-            # handle the case of deleting an entry
-            if value != "":
-                try:
-                    value = float(value)
-                    if self.imperial:
-                        value = lbs_to_kg(value)
-                    # handle absurd values that might otherwise cause a crash
-                    # FIXME: maybe Qt views have validation?
-                    if value > 2000 or value <= 0:
-                        return False
-                except ValueError:
-                    return False
-            # check that data has actually changed before emitting an event
-            oldvalue = self._data[index.row()][2]
-            if oldvalue != value:
-                self._data[index.row()][2] = value
+            try:
+                changed = self.set_value(index.row(), value)
+            except ValueError:
+                return False
+            # only emit an event if the data has actually changed
+            if changed:
                 self.has_new_plottable_data = True
                 self.dataChanged.emit(index, index)
             return True
         return super().setData(index, value, role)
 
+    def merge_entries(self, readings, policy="first", overwrite=False):
+        """Merges many weight readings at once, e.g. a scale's export.
+
+        See `WeightData.merge_entries()`. The changes are announced to views
+        all at once (see `_apply_changes()`), so the plot is updated and the
+        data saved once for the whole batch.
+        """
+        days, values, skipped = self.merge_changes(readings, policy, overwrite)
+        if len(days):
+            self._unjournaled.update(days.tolist())
+            self.has_new_plottable_data = True
+            self._apply_changes(days, values)
+        return len(days), skipped
+
+    def _apply_changes(self, days, values):
+        """Stores many weights (see `_put_many()`), and tells the views.
+
+        Rows past the end are inserted first, then a single dataChanged()
+        covers every row from the first change to the last.
+        """
+        row_count = self.row_count
+        first, last = int(days.min()), int(days.max())
+        if last >= row_count:
+            self.beginInsertRows(QModelIndex(), row_count, last)
+            self._put_many(days, values)
+            self.endInsertRows()
+        else:
+            self._put_many(days, values)
+        self.dataChanged.emit(self.index(first), self.index(last))
+
     def flags(self, index):
         """Reimplement QAbstractListModel - mark editable entries (all)."""
         if index.isValid():
@@ -170,7 +175,7 @@ class WeightTable(QAbstractListModel):
             # Otherwise, return our "date" column for display.
             if orientation == Qt.Horizontal:
                 return self.weight_colname
-            return self._data[section][1]
+            return self._date(section).strftime("%Y/%m/%d")
         return super().headerData(section, orientation, role)
 
     def add_dates(self):
@@ -178,88 +183,10 @@ class WeightTable(QAbstractListModel):
 
         Also checks that model contains at least one empty cell after last entry.
         """
-        today = datetime.now().date()
-        days_passed = (today - self._data[-1][0]).days
-        # last line is blank: add 0, last line is not blank: add 1
-        days_to_add = int((self._data[-1][2]) != "")
-        days_to_add = max(days_to_add, days_passed)
+        days_to_add = self.missing_days()
         if days_to_add > 0:
-            row_count = len(self._data)
+            row_count = self.row_count
             # we have to warn views which rows are about to be edited
             self.beginInsertRows(QModelIndex(), row_count, row_count + days_to_add - 1)
-            last_date_in_model = self._data[-1][0]
-            for i in range(days_to_add):
-                new_date = last_date_in_model + timedelta(days=i + 1)
-                self._data.append([new_date, new_date.strftime("%Y/%m/%d"), ""])
+            self.add_days(days_to_add)
             self.endInsertRows()
-
-    @property
-    def end_date(self):
-        """Returns the last non-blank date in the model."""
-        dates = self.dates
-        # when no data has been entered, use the first date as the end date
-        if len(dates) != 0:
-            return dates[-1]
-        return self._data[0][0]
-
-    @property
-    def dates(self):
-        """Get a list of non-blank dates in chrono order."""
-        return [row[0] for row in self._data if row[2] != ""]
-
-    @property
-    def weights(self):
-        """Returns a list of weights (in preferred units) in chrono order."""
-        if self.imperial:
-            return [kg_to_lbs(row[2]) for row in self._data if row[2] != ""]
-        return [row[2] for row in self._data if row[2] != ""]
-
-    @property
-    def csvdata(self):
-        """Returns the full data, up to the last day with a weight entry.
-
-        FIXME: this should probably be a private method.
-        """
-        return [row for row in self._data if row[0] <= self.end_date]
-
-    @property
-    def daynumbers(self):
-        """Returns a list with the number of days for each entry since the start.
-
-        The first day is 1, instead of 0, because a knot happens every `n` days,
-        and if the day count starts at 0 users would have to wait n+1 days to hit
-        the first knot.
-
-        The day numbers should not be used for anything except for a linear
-        representation of time deltas, as when interpolating, determining advice
-        intervals, etc.
-        """
-        return [
-            1 + (row[0] - self.start_date).days for row in self._data if row[2] != ""
-        ]
-
-    def create_csv(self, csvpath):
-        """Make a new blank CSV data file, from a template.
-
-        FIXME: could be a static method?"""
-        with open(csvpath, "w", encoding="utf-8", newline="") as f:
-            csvw = csv.writer(f)
-            csvw.writerow(["Date", "Weight (kg)"])
-            today = datetime.now()
-            csvw.writerow([today.strftime("%Y/%m/%d"), ""])
-
-    def save_csv(self):
-        """Save the CSV data file associated with the data model.
-
-        Creates a temporary file and moves it on top of the old one,
-        in an attempt to be mostly atomic in case of a crash.
-        """
-        dpath, fname = os.path.split(self.csvpath)
-        tmpfd, tmppath = mkstemp(prefix=f"{fname}.", dir=dpath, text=True)
-        # create file object to own the open fd; automatically closes for us
-        with os.fdopen(tmpfd, "w", encoding="utf-8", newline="") as f:
-            csvw = csv.writer(f)
-            csvw.writerow(["Date", "Weight (kg)"])
-            for row in self._data:
-                csvw.writerow(row[1:])
-        os.rename(tmppath, self.csvpath)
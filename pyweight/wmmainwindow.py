@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import os
 
-from PyQt5 import uic
 from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import QIcon, QPixmap, QKeySequence
 from PyQt5.QtWidgets import (
@@ -13,16 +12,19 @@ from PyQt5.QtWidgets import (
     QAbstractItemDelegate,
 )
 
+from pyweight.core import instrument
+from pyweight.core.importer import read_export
+from pyweight.ui import ui_class
 from pyweight.wmabout import AboutWindow
-from pyweight.wmbodymodel import WeightTracker
+from pyweight.wmautosave import AutoSaver
 from pyweight.wmdatamodel import WeightTable
 from pyweight.wmhelp import open_help
-from pyweight.wmplot import Canvas
+from pyweight.wmplancache import CachedPlan, PlanCache
 from pyweight.wmprefs import Preferences, PreferencesWindow
 from pyweight.wmprofile import Profile, ProfileWindow
 
 
-class MainWindow(QMainWindow):
+class MainWindow(QMainWindow, ui_class("main")):
     """This class controls the UI for the main window.
 
     This should be the only object in this source file.
@@ -39,7 +41,7 @@ class MainWindow(QMainWindow):
     def __init__(self, app, *args, **kwargs):
         self.app = app
         super().__init__(*args, **kwargs)
-        uic.loadUi("pyweight/ui/main.ui", self)
+        self.setupUi(self)
 
         # for environments that don't set an icon theme, use our own
         if QIcon.themeName() == "":
@@ -55,11 +57,22 @@ class MainWindow(QMainWindow):
         self.file_open = False
         self.file_modified = False
         self.plan = None
+        self.plan_path = None
         self.canvas = None
+        # the PlotData on the canvas
+        self.plot_data = None
         self.table_is_loaded = False
         # sometimes we need to move focus down a row after a QTableView update
         self.table_needs_focusmove = False
         self.wt = None
+        self.pipeline = None
+        # the edit being timed, when instrumentation is on (see core/instrument.py)
+        self.edit_cycle = None
+        # autosaves edits in the background, once the user pauses
+        self.autosaver = AutoSaver(self)
+        self.autosaver.failed.connect(self.autosave_failed)
+        # recently opened plans, ready to be shown again
+        self.plan_cache = PlanCache()
 
         # connect signals
         self.action_new_file.triggered.connect(self.new_file)
@@ -70,6 +83,7 @@ class MainWindow(QMainWindow):
         self.action_quit.triggered.connect(self.close)
         self.action_refresh.triggered.connect(self.refresh)
         self.action_export.triggered.connect(self.save_graph)
+        self.action_import.triggered.connect(self.import_file)
         self.action_plan_settings.triggered.connect(self.edit_plan)
         self.action_pyweight_settings.triggered.connect(self.edit_preferences)
         self.action_about.triggered.connect(self.show_about)
@@ -116,6 +130,7 @@ class MainWindow(QMainWindow):
         if path[0] != "":
             if self.check_file_modified() == QMessageBox.Cancel:
                 return
+            self.compact_data_file()
             # this is safe because the QFileDialog asks user to overwrite it
             if os.path.exists(path[0]):
                 os.unlink(path[0])
@@ -137,6 +152,7 @@ class MainWindow(QMainWindow):
         if path[0] != "":
             if self.check_file_modified() == QMessageBox.Cancel:
                 return
+            self.compact_data_file()
             self.plan.path = path[0]
             self.open_data_file()
 
@@ -145,6 +161,8 @@ class MainWindow(QMainWindow):
 
         Unconditionally saves the CSV, and resets window modification states.
         """
+        # let pending autosaves finish first, so they can't overwrite this
+        self.autosaver.flush()
         self.wt.save_csv()
         self.file_modified = False
         self.action_save_file.setEnabled(False)
@@ -190,6 +208,8 @@ class MainWindow(QMainWindow):
         the WeightTable, which results in this method being called.
         But we also let the user activate this manually.
         """
+        if not self.file_open:
+            return
         self.wt.add_dates()
         self.update_plot()
 
@@ -221,6 +241,43 @@ class MainWindow(QMainWindow):
         elif path.lower().endswith(".svg"):
             self.canvas.export(path, "svg")
 
+    def import_file(self):
+        """Imports the weights in a scale's export into the data file.
+
+        Asks the user to choose a CSV or JSON export (see
+        `pyweight.core.importer`), and merges its readings into the open
+        table in one go; days that already have a weight keep it. Several
+        readings on one day are collapsed by the `import_policy` preference.
+
+        Only called by user actions.
+        """
+        path = QFileDialog.getOpenFileName(
+            self, "Import Weights", filter="Scale Exports (*.csv *.json)"
+        )[0]
+        if path == "":
+            return
+        mbox = QMessageBox()
+        try:
+            readings = read_export(path, self.plan.units)
+            merged, skipped = self.wt.merge_entries(
+                readings, policy=self.prefs.import_policy
+            )
+        except (OSError, ValueError) as e:
+            mbox.setIcon(QMessageBox.Warning)
+            mbox.setText("The weights could not be imported.")
+            mbox.setInformativeText(str(e))
+            mbox.exec()
+            return
+        mbox.setIcon(QMessageBox.Information)
+        mbox.setText(f"Weights imported: {merged}.")
+        if skipped:
+            start = self.wt.start_date.strftime("%Y/%m/%d")
+            mbox.setInformativeText(
+                f"Readings from before the start of the data file ({start}) were "
+                "left out."
+            )
+        mbox.exec()
+
     def edit_plan(self, mode=None):
         """Opens the plan editor window.
 
@@ -248,7 +305,8 @@ class MainWindow(QMainWindow):
         saved because until then the user is viewing the plan editing modal.
         """
         old_units = self.plan.units
-        self.plan.save()
+        if not self.plan.save():
+            self.settings_not_saved("plan")
         if self.file_open:
             if self.plan.units != old_units:
                 self.wt.set_units(self.plan.units)
@@ -264,7 +322,8 @@ class MainWindow(QMainWindow):
         if ret != QDialog.Accepted:
             self.prefs.flush()
             return
-        self.prefs.save()
+        if not self.prefs.save():
+            self.settings_not_saved("preferences")
         self.update_plot()
 
     def show_about(self):
@@ -298,6 +357,8 @@ class MainWindow(QMainWindow):
         if self.check_file_modified() == QMessageBox.Cancel:
             event.ignore()
             return
+        self.compact_data_file()
+        self.plan_cache.clear()
         event.accept()
 
     # Above: Qt slots
@@ -339,7 +400,11 @@ class MainWindow(QMainWindow):
             self.action_save_file,
             self.action_plan_settings,
         )
-        file_open_actions = (self.action_refresh, self.action_export)
+        file_open_actions = (
+            self.action_refresh,
+            self.action_export,
+            self.action_import,
+        )
         for action in plan_active_actions:
             action.setEnabled(self.plan is not None)
         for action in file_open_actions:
@@ -362,6 +427,16 @@ class MainWindow(QMainWindow):
             return resp
         return None
 
+    def compact_data_file(self):
+        """Folds autosaved edits from the journal into the open data file.
+
+        Edits the user chose to discard are left alone; the journal only
+        ever holds edits that were autosaved.
+        """
+        self.autosaver.flush()
+        if self.wt is not None and not self.file_modified:
+            self.wt.compact_journal()
+
     def open_data_file(self):
         """Open a data file (non-interactive).
 
@@ -373,7 +448,7 @@ class MainWindow(QMainWindow):
         Performs initial setup for the tableView widget and MVC.
         """
         try:
-            self.wt = WeightTable(self.plan.path, self.plan.units)
+            wt = WeightTable(self.plan.path, self.plan.units)
         except Exception as e:
             # file not found / corrupt / etc
             mbox = QMessageBox()
@@ -385,6 +460,25 @@ class MainWindow(QMainWindow):
                 mbox.setText("File could not be opened.")
             mbox.exec()
             return
+        self.show_table(wt)
+
+    def show_table(self, wt, pipeline=None, plot_data=None):
+        """Shows a loaded weight table, and hooks it up to the window.
+
+        Args:
+            wt: the WeightTable
+            pipeline: its PlotPipeline, if it already has one
+            plot_data: PlotData to show until the pipeline has caught up
+        """
+        self.wt = wt
+        # one pipeline per open file; it keeps up with the table and plan,
+        # so that edits don't redo all the statistics
+        if pipeline is None:
+            self._new_pipeline()
+        else:
+            self.pipeline = pipeline
+            self.pipeline.finished.connect(self.show_plot)
+            self.pipeline.failed.connect(self.plot_failed)
 
         self.file_open = True
         self.file_modified = False
@@ -395,25 +489,86 @@ class MainWindow(QMainWindow):
         self.tableView.setVisible(True)
 
         self.refresh()
+        if plot_data is not None:
+            self.show_plot(plot_data)
         self.refresh_actions()
         self.tableView.scrollToBottom()
 
         # FIXME: could this go somewhere else?
         self.wt.dataChanged.connect(self.table_changed)
         self.wt.rowsInserted.connect(self.maybe_move_cursor_down)
+        self.wt.reloaded.connect(self.table_reloaded)
 
     def open_plan_file(self, path):
         """Opens a plan file (non-interactively).
 
         Also opens a data file if appropriate given settings and state.
         Creates the class-wide `plan` instance.
+
+        Recently opened plans are shown again from the plan cache, unless
+        their files have changed; the plan being replaced is cached.
         """
-        self.plan = Profile(path)
+        cached = self.plan_cache.take(path) if self.prefs.open_prev else None
+        plan = cached.plan if cached is not None else Profile(path)
+        self.cache_plan()
+        self.plan = plan
+        self.plan_path = path
         self.refresh_actions()
         self.prefs.prev_plan = path
-        if self.prefs.open_prev and self.plan.path != "":
+        if cached is not None:
+            self.show_table(cached.table, cached.pipeline, cached.plot_data)
+        elif self.prefs.open_prev and self.plan.path != "":
             self.open_data_file()
 
+    def cache_plan(self):
+        """Moves the open plan and data file into the plan cache.
+
+        Only files without unsaved edits are cached; the window is left
+        without a data file either way.
+        """
+        if not self.file_open:
+            return
+        self.compact_data_file()
+        self.wt.dataChanged.disconnect(self.table_changed)
+        self.wt.rowsInserted.disconnect(self.maybe_move_cursor_down)
+        self.wt.reloaded.disconnect(self.table_reloaded)
+        self.pipeline.finished.disconnect(self.show_plot)
+        self.pipeline.failed.disconnect(self.plot_failed)
+        if self.file_modified:
+            self.pipeline.close()
+        else:
+            self.plan_cache.put(
+                CachedPlan(
+                    self.plan_path, self.plan, self.wt, self.pipeline, self.plot_data
+                )
+            )
+        self.wt = None
+        self.pipeline = None
+        self.plot_data = None
+        self.file_open = False
+        self.table_is_loaded = False
+        self.tableView.setVisible(False)
+
+    def table_reloaded(self, conflicts):
+        """Responds to changes made to the data file by another program.
+
+        The merged entries are plotted; if some of them clashed with edits
+        made here, the user is told which dates kept their local values.
+
+        Args:
+            conflicts: the dates whose changes on disk were dropped
+        """
+        self.refresh()
+        if conflicts:
+            dates = ", ".join(d.strftime("%Y/%m/%d") for d in conflicts)
+            mbox = QMessageBox()
+            mbox.setIcon(QMessageBox.Warning)
+            mbox.setText("The data file was changed by another program.")
+            mbox.setInformativeText(
+                f"Entries edited here were kept, and the file's were ignored: {dates}"
+            )
+            mbox.exec()
+
     def table_changed(self):
         """Responds to changes on the tableView's underlying model.
 
@@ -424,14 +579,40 @@ class MainWindow(QMainWindow):
         """
         self.maybe_move_cursor_down()
         if self.table_is_loaded and self.wt.has_new_plottable_data:
-            self.action_save_file.setEnabled(True)
+            if instrument.enabled and self.edit_cycle is None:
+                self.edit_cycle = instrument.EditCycle(instrument.dump_path)
             self.refresh()
             if self.prefs.auto_save_data:
-                self.save_file()
+                # edits are journaled in the background, and the journal is
+                # folded into the file when it is closed
+                self.autosaver.schedule(self.wt)
             else:
+                self.action_save_file.setEnabled(True)
                 self.file_modified = True
                 self.update_window_title()
 
+    def settings_not_saved(self, name):
+        """Warns the user that settings could not be written to disk."""
+        mbox = QMessageBox()
+        mbox.setIcon(QMessageBox.Warning)
+        mbox.setText(f"Your {name} could not be saved.")
+        mbox.exec()
+
+    def autosave_failed(self, message):
+        """Warns the user that autosaved edits could not be written.
+
+        The edits are still in the table; marking the file as modified makes
+        sure the user is asked to save them before they are lost.
+        """
+        self.file_modified = True
+        self.action_save_file.setEnabled(True)
+        self.update_window_title()
+        mbox = QMessageBox()
+        mbox.setIcon(QMessageBox.Warning)
+        mbox.setText("Your changes could not be saved automatically.")
+        mbox.setInformativeText(message)
+        mbox.exec()
+
     def maybe_move_cursor_down(self):
         """Checks whether cursor needs to move down a row, and moves it.
 
@@ -462,19 +643,56 @@ class MainWindow(QMainWindow):
             title = f"{fn} - {title}"
         self.setWindowTitle(title)
 
+    @instrument.timed("update_plot")
     def update_plot(self):
-        """Creates a Canvas widget and plots a new WeightTracker on it."""
+        """Creates a Canvas widget if needed and plots the WeightTracker on it."""
         if not self.canvas:
+            # matplotlib is slow to import, so wait until we have something to plot
+            from pyweight.wmplot import Canvas
+
             self.canvas = Canvas()
             self.centralwidget.layout().addWidget(self.canvas)
             self.centralwidget.layout().setStretch(0, 1)
             self.centralwidget.layout().setStretch(1, 4)
-        # It seems expensive to recreate this class and do a complete redraw
-        # every time, but WT is extremely dependent on specific details. For
-        # example, even one new data point will change the spline fit.
+        # the pipeline belongs to the plan it was created with
+        if self.pipeline is None or self.pipeline.settings is not self.plan:
+            self._new_pipeline()
         self.wt.has_new_plottable_data = False
-        weightloss = WeightTracker(self.wt, self.plan)
-        self.canvas.plot(weightloss)
-        self.canvas.draw()
+        # the plot is updated by `show_plot` once the statistics are ready
+        self.pipeline.request()
+
+    def show_plot(self, plot_data):
+        """Shows the plot data computed by the pipeline."""
+        self.plot_data = plot_data
+        self.canvas.show_plot(plot_data)
+        self._finish_edit_cycle()
+
+    def plot_failed(self, message):
+        """Reports errors from computing the plot data."""
+        print(message)
+        self._finish_edit_cycle()
+
+    def _finish_edit_cycle(self):
+        """Stops timing the current edit, and shows the timings so far."""
+        if self.edit_cycle is not None:
+            self.edit_cycle.finish()
+            self.edit_cycle = None
+        if instrument.enabled:
+            self.statusBar().showMessage(instrument.readout())
+
+    def _new_pipeline(self):
+        """Creates a PlotPipeline for the open data file and plan.
+
+        The body model pulls in scipy, and the plot matplotlib, so they are
+        only imported the first time a data file is opened rather than at
+        program start.
+        """
+        from pyweight.wmpipeline import PlotPipeline
+
+        if self.pipeline is not None:
+            self.pipeline.close()
+        self.pipeline = PlotPipeline(self.wt, self.plan, self)
+        self.pipeline.finished.connect(self.show_plot)
+        self.pipeline.failed.connect(self.plot_failed)
 
     # Above: utility methods
@@ -0,0 +1,127 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from pyweight.core.bodymodel import WeightTracker
+from pyweight.wmplot import PlotData
+
+
+class PlotPipeline(QObject):
+    """Computes the statistics and plot data for a table off the GUI thread.
+
+    Each `request()` takes snapshots of the table and plan (see
+    `WeightTable.snapshot()` and `WMSettings.snapshot()`), and hands them to a
+    worker thread. The worker keeps its own WeightTracker over the snapshots,
+    so the spline is still updated incrementally: the pipeline listens to the
+    table and plan on the GUI thread, and passes on what changed with each
+    request. The resulting PlotData arrives through the queued `finished`
+    signal, ready for `Canvas.show_plot()`.
+
+    Only the newest request matters: older ones still waiting for the worker
+    are skipped (apart from passing on their changes), and their results are
+    never emitted. Errors are reported through `failed`, with a traceback.
+
+    Init:
+        data: the WeightTable to plot
+        settings: the plan to interpret it with
+        parent: the owning QObject
+    """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    # from the worker thread, with the number of the request
+    _result = pyqtSignal(int, object)
+    _error = pyqtSignal(int, str)
+
+    def __init__(self, data, settings, parent=None):
+        super().__init__(parent)
+        self.data = data
+        self.settings = settings
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # only touched by the worker thread
+        self._tracker = None
+        # changes since the last request, collected on the GUI thread
+        self._dirty_days = set()
+        self._changed_settings = set()
+        # the number of the newest request; older ones are stale
+        self._generation = 0
+
+        self._result.connect(self._deliver)
+        self._error.connect(self._report)
+        data.dataChanged.connect(self.data_changed)
+        data.rowsInserted.connect(self.rows_inserted)
+        settings.subscribe(self.settings_changed)
+
+    def data_changed(self, top_left, bottom_right):
+        """Slot for WeightTable.dataChanged - remembers the edited days."""
+        days = self.data.row_daynumbers(top_left.row(), bottom_right.row())
+        self._dirty_days.update(days.tolist())
+
+    def rows_inserted(self, parent, first, last):
+        """Slot for WeightTable.rowsInserted - remembers the new days."""
+        self._dirty_days.update(self.data.row_daynumbers(first, last).tolist())
+
+    def settings_changed(self, keys):
+        """Remembers which settings have changed."""
+        self._changed_settings.update(keys)
+
+    def request(self):
+        """Starts computing the plot data for the current table and plan."""
+        self._generation += 1
+        job = (
+            self._generation,
+            self.data.snapshot(),
+            self.settings.snapshot(),
+            self._dirty_days,
+            self._changed_settings,
+        )
+        self._dirty_days = set()
+        self._changed_settings = set()
+        self._executor.submit(self._run, *job)
+
+    def close(self):
+        """Drops any results still to come; the pipeline can't be reused.
+
+        The pipeline stops following the table, and is deleted once control
+        returns to the event loop, so that neither its owner nor the table
+        keeps the other alive.
+        """
+        if self.data is None:
+            return
+        self._generation += 1
+        self._executor.shutdown(wait=False)
+        self.data.dataChanged.disconnect(self.data_changed)
+        self.data.rowsInserted.disconnect(self.rows_inserted)
+        self.data = None
+        self.deleteLater()
+
+    def _run(self, generation, data, settings, days, keys):
+        """Brings the tracker up to date, and computes the plot data."""
+        try:
+            if self._tracker is None:
+                self._tracker = WeightTracker(data, settings, listen=False)
+            else:
+                self._tracker.data = data
+                self._tracker.settings = settings
+                self._tracker.settings_changed(keys)
+                self._tracker.refit(days)
+            if generation != self._generation:
+                return
+            plot_data = PlotData(self._tracker)
+        except Exception:
+            # the next request starts from scratch
+            self._tracker = None
+            self._error.emit(generation, traceback.format_exc())
+            return
+        self._result.emit(generation, plot_data)
+
+    def _deliver(self, generation, plot_data):
+        """Passes on results on the GUI thread, unless they are stale."""
+        if generation == self._generation:
+            self.finished.emit(plot_data)
+
+    def _report(self, generation, message):
+        """Passes on errors on the GUI thread, unless they are stale."""
+        if generation == self._generation:
+            self.failed.emit(message)
@@ -0,0 +1,122 @@
+import os
+from collections import OrderedDict
+
+# limits for the plans kept by a PlanCache: the memory their data may take
+# up, and how many there may be (each keeps a worker thread)
+PLAN_CACHE_BYTES = 64 * 1024 * 1024
+PLAN_CACHE_ENTRIES = 8
+
+# rough memory use of a cached plan besides its data (Qt objects, the plan,
+# the spline fit); the tracker and plot data share the table's arrays
+ENTRY_OVERHEAD_BYTES = 256 * 1024
+
+
+def file_stamp(path):
+    """Returns the modification time of a file in ns, or None if it's missing."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class CachedPlan:
+    """A plan that was open, with everything needed to show it again.
+
+    The files involved are stamped when the plan is cached; see
+    `is_current()`.
+
+    Init:
+        plan_path: the path of the plan file
+        plan: the Profile
+        table: its WeightTable, with no unsaved edits
+        pipeline: the PlotPipeline of the table, holding the fitted tracker
+        plot_data: the PlotData last shown, or None
+    """
+
+    def __init__(self, plan_path, plan, table, pipeline, plot_data):
+        self.plan_path = plan_path
+        self.plan = plan
+        self.table = table
+        self.pipeline = pipeline
+        self.plot_data = plot_data
+        self.stamps = self._stamps()
+
+    def _stamps(self):
+        paths = (self.plan_path, self.table.csvpath, self.table.journal_path)
+        return tuple(file_stamp(path) for path in paths)
+
+    def is_current(self):
+        """Returns whether none of the files have changed since caching."""
+        return self._stamps() == self.stamps
+
+    @property
+    def nbytes(self):
+        """Returns roughly how much memory the cached plan takes up."""
+        return self.table.nbytes + ENTRY_OVERHEAD_BYTES
+
+    def close(self):
+        """Releases the resources held by the cached plan.
+
+        The pipeline is deleted (see `PlotPipeline.close()`) and the table
+        stops watching its file, so nothing keeps them alive once the
+        entry is dropped.
+        """
+        self.pipeline.close()
+        self.table.close()
+
+
+class PlanCache:
+    """Keeps recently opened plans in memory, so switching back is instant.
+
+    Holds CachedPlans by plan path, up to `max_bytes` of memory and
+    `max_entries` plans; the least recently cached ones are closed and
+    dropped first.
+
+    Init:
+        max_bytes: the memory the cached plans may take up
+        max_entries: the number of plans that may be cached
+    """
+
+    def __init__(self, max_bytes=PLAN_CACHE_BYTES, max_entries=PLAN_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """Returns roughly how much memory the cached plans take up."""
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def put(self, entry):
+        """Caches a CachedPlan, replacing any for the same plan file."""
+        key = os.path.realpath(entry.plan_path)
+        old = self._entries.pop(key, None)
+        if old is not None and old is not entry:
+            old.close()
+        self._entries[key] = entry
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            evicted.close()
+
+    def take(self, plan_path):
+        """Removes and returns the cached plan for a plan file.
+
+        Returns None if the plan isn't cached, or if any of its files have
+        changed since (the stale entry is dropped).
+        """
+        entry = self._entries.pop(os.path.realpath(plan_path), None)
+        if entry is not None and not entry.is_current():
+            entry.close()
+            return None
+        return entry
+
+    def clear(self):
+        """Closes and drops all cached plans."""
+        while self._entries:
+            _, entry = self._entries.popitem()
+            entry.close()
@@ -3,9 +3,44 @@ from datetime import timedelta
 from dateutil import rrule
 
 import matplotlib
+import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 
+from pyweight.core.instrument import timed
+
+
+class PlotData:
+    """Everything `Canvas` needs to show a WeightTracker.
+
+    Computing it is the expensive part of plotting: fitting the spline and
+    working out the advice. It only holds plain values and arrays, so it can
+    be computed on another thread (see wmpipeline.py) and shown later.
+
+    Init:
+        wtracker: the WeightTracker to compute the plot data of
+
+    Attributes:
+        start_date, end_date: the date range of the data
+        daynumbers, weights: the data points, as x-y data
+        weight_colname: label for the weight axis
+        knots, fit: the spline fit at its knots, or None if there is none
+        advice: the advice text, shown as the plot title
+    """
+
+    def __init__(self, wtracker):
+        data = wtracker.data
+        self.start_date = data.start_date
+        self.end_date = data.end_date
+        self.daynumbers = data.daynumbers
+        self.weights = data.weights
+        self.weight_colname = data.weight_colname
+        self.knots = self.fit = None
+        if wtracker.interpolation:
+            self.knots = wtracker.interpolation.get_knots()
+            self.fit = wtracker.interpolation(self.knots)
+        self.advice = Canvas.advice(wtracker)
+
 
 class Canvas(FigureCanvasQTAgg):
     """A wrapper class for matplotlib's Canvas for Qt.
@@ -14,6 +49,9 @@ class Canvas(FigureCanvasQTAgg):
     Mostly we just store a figure and plot WeightTracker objects to it.
     """
 
+    # above this density, data points are reduced to per-pixel envelopes
+    max_points_per_pixel = 2
+
     locator = matplotlib.dates.AutoDateLocator(interval_multiples=False)
     locator.intervald[rrule.HOURLY] = [24]
     locator.intervald[rrule.MINUTELY] = [24 * 60]
@@ -39,66 +77,209 @@ class Canvas(FigureCanvasQTAgg):
         self.fig = Figure(dpi=dpi)
         super().__init__(self.fig)
 
-    def clear(self):
-        self.fig.clear()
+        # The figure is laid out once, and the artists that depend on the data
+        # are kept around and updated in place by `plot`. They are animated,
+        # meaning a full draw leaves them out; `_on_draw` then saves the
+        # resulting background so that later updates can be blitted onto it.
         self.axes = self.fig.add_subplot(111)
+        self.axes.xaxis_date()
+        self.axes.xaxis.set_major_locator(self.locator)
+        self.axes.xaxis.set_major_formatter(self.formatter)
+        self.axes.grid(True)
+        self.axes.set_xlabel("Date", labelpad=15)
+        self.fig.suptitle("Weight Tracking")
+        (self.points,) = self.axes.plot([], [], "o", c="xkcd:burgundy", ms=4)
+        (self.fit,) = self.axes.plot([], [], c="xkcd:dark navy blue")
+        self.title = self.axes.set_title("", fontsize=10, pad=20)
+        # the full resolution data, the points artist shows a decimated version
+        self._xdata = np.empty(0)
+        self._ydata = np.empty(0)
+        self.axes.callbacks.connect("xlim_changed", self._update_points)
+        self.animated_artists = (self.points, self.fit, self.title)
+        for artist in self.animated_artists:
+            artist.set_animated(True)
+
+        # the background without the animated artists, and the layout it has
+        self._background = None
+        self._layout = None
+        self.mpl_connect("draw_event", self._on_draw)
 
     def plot(self, wtracker):
-        """Plots the WeightTracker instance to our stored axes.
+        """Plots the WeightTracker instance to our stored axes, and redraws.
 
         Args:
-            wtracker: the WeightTracker instance to plot (see wmbodymodel.py)
+            wtracker: the WeightTracker instance to plot (see core/bodymodel.py)
         """
-        self.clear()
+        self.show_plot(PlotData(wtracker))
 
-        # plot using the original independent variable, the date, to get nicer output
-        self.axes.plot(
-            wtracker.data.dates, wtracker.data.weights, "o", c="xkcd:burgundy", ms=4
-        )
+    @timed("plot")
+    def show_plot(self, plot_data):
+        """Shows precomputed PlotData on our stored axes, and redraws.
 
-        # if interpolation is available, plot it and provide advice
-        info = ""
-        if wtracker.interpolation:
-            self.axes.plot(
-                wtracker.data.dates,
-                wtracker.interpolation(wtracker.data.daynumbers),
-                c="xkcd:dark navy blue",
-            )
+        Only the data of the existing artists is replaced. If the axis limits
+        or labels change, the whole figure is redrawn; otherwise (e.g. when
+        a point is appended, or only the advice changes) just the data and
+        title are drawn over the saved background.
 
-            # Every `cycle` days, print out instructions
-            if wtracker.data.daynumbers[-1] % wtracker.settings.cycle == 0:
-                if wtracker.adjustment != 0:
-                    adjword = "increasing" if wtracker.adjustment > 0 else "decreasing"
-                    info = f"Consider {adjword} intake by {abs(wtracker.adjustment)} calories per day."
-            else:
-                days_to_go = wtracker.settings.cycle - (
-                    wtracker.data.daynumbers[-1] % wtracker.settings.cycle
-                )
-                plural = "s" if days_to_go > 1 else ""
-                info = f"Continue current intake for next {days_to_go} day{plural}."
-                if wtracker.settings.always_show_adj:
-                    info += f" Adjustment value is {wtracker.adjustment:+}."
-
-        # from here to the end of the method it's just formatting stuff
-        # found by trial and error, mostly
-        self.axes.set_xlabel("Date", labelpad=15)
-        self.axes.set_ylabel(wtracker.data.weight_colname, labelpad=15)
+        Args:
+            plot_data: the PlotData to show, from `plot()` or a PlotPipeline
+        """
+        # plot using the original independent variable, the date, to get nicer
+        # output; matplotlib represents dates as (float) days since its epoch
+        epoch = matplotlib.dates.date2num(plot_data.start_date) - 1
+        self._xdata = epoch + plot_data.daynumbers
+        self._ydata = plot_data.weights
+        ylim = (
+            np.min(self._ydata, initial=np.inf),
+            np.max(self._ydata, initial=-np.inf),
+        )
+        if plot_data.knots is not None:
+            # the fit is piecewise linear, so it only needs drawing at its knots
+            self.fit.set_data(epoch + plot_data.knots, plot_data.fit)
+            ylim = (
+                min(ylim[0], plot_data.fit.min()),
+                max(ylim[1], plot_data.fit.max()),
+            )
+        else:
+            self.fit.set_data([], [])
+        self.title.set_text(plot_data.advice)
+        self.axes.set_ylabel(plot_data.weight_colname, labelpad=15)
 
+        # keep the current limits while they still fit the data, so that most
+        # updates can be blitted instead of needing a full redraw
+        previous = self._layout or (None, None, None)
+        xmargin, ymargin = self.axes.margins()
         # pick a reasonable date range if we haven't seen enough data
-        if (wtracker.data.end_date - wtracker.data.start_date).days < 14:
+        if (plot_data.end_date - plot_data.start_date).days < 14:
             self.axes.set_xlim(
-                left=wtracker.data.start_date + timedelta(days=-1),
-                right=wtracker.data.start_date + timedelta(days=15),
+                left=plot_data.start_date + timedelta(days=-1),
+                right=plot_data.start_date + timedelta(days=15),
             )
-        if len(wtracker.data.dates) == 0:
+        else:
+            xlim = (self._xdata[0], self._xdata[-1])
+            self.axes.set_xlim(self._limits(previous[0], *xlim, xmargin))
+        if len(plot_data.weights) == 0:
             self.axes.set_ylim(bottom=90, top=200)
+        else:
+            self.axes.set_ylim(self._limits(previous[1], *ylim, ymargin))
+        self._update_points()
 
-        self.fig.suptitle("Weight Tracking")
-        self.axes.set_title(info, fontsize=10, pad=20)
+        if self._background is None or self._current_layout() != self._layout:
+            self.draw()
+        else:
+            self._blit()
 
-        self.axes.xaxis.set_major_locator(self.locator)
-        self.axes.xaxis.set_major_formatter(self.formatter)
-        self.axes.grid(True)
+    def _update_points(self, axes=None):
+        """Shows the data points, decimated for the visible date range.
+
+        Also connected to the x limits of the axes, so that zooming in brings
+        back the full detail.
+        """
+        self.points.set_data(*self.decimate(self._xdata, self._ydata))
+
+    def decimate(self, x, y):
+        """Reduces sorted x-y data to a level of detail fit for the screen.
+
+        Drops the points outside of the visible x range. If there are still
+        more than `max_points_per_pixel` per pixel of axes width, the points
+        in each pixel column are replaced by their minimum, mean and maximum,
+        which looks the same but takes time proportional to the width of the
+        plot to draw, rather than to the length of the history.
+        """
+        left, right = self.axes.get_xlim()
+        width = max(int(self.axes.bbox.width), 1)
+        start, end = np.searchsorted(x, (left, right))
+        x, y = x[start:end], y[start:end]
+        if len(x) <= self.max_points_per_pixel * width:
+            return x, y
+        columns = ((x - left) * (width / (right - left))).astype(int)
+        starts = np.flatnonzero(np.diff(columns, prepend=-1))
+        counts = np.diff(starts, append=len(y))
+        envelope = (
+            np.minimum.reduceat(y, starts),
+            np.add.reduceat(y, starts) / counts,
+            np.maximum.reduceat(y, starts),
+        )
+        centers = left + (columns[starts] + 0.5) * ((right - left) / width)
+        return np.repeat(centers, 3), np.column_stack(envelope).ravel()
+
+    def resizeEvent(self, event):
+        """Reimplements FigureCanvasQT - redo decimation for the new width."""
+        super().resizeEvent(event)
+        self._update_points()
+
+    @staticmethod
+    def _limits(current, low, high, margin):
+        """Chooses axis limits for data spanning from `low` to `high`.
+
+        New limits look like matplotlib's autoscaling: `margin` (a fraction
+        of the data range) is added on both sides. The current limits are
+        kept instead as long as they contain the data without leaving more
+        than twice that margin on either side, so that e.g. appending a day
+        does not force a full redraw.
+        """
+        margin = margin * (high - low) or 0.5
+        if current is not None:
+            left, right = current
+            if low - 2 * margin <= left <= low and high <= right <= high + 2 * margin:
+                return current
+        return (low - margin, high + margin)
+
+    @staticmethod
+    def advice(wtracker):
+        """Returns the advice text for the tracker, shown as the plot title."""
+        # if interpolation is not available, there is no advice
+        if not wtracker.interpolation:
+            return ""
+        # Every `cycle` days, print out instructions
+        today = wtracker.data.daynumbers[-1]
+        if today % wtracker.settings.cycle == 0:
+            if wtracker.adjustment != 0:
+                adjword = "increasing" if wtracker.adjustment > 0 else "decreasing"
+                return f"Consider {adjword} intake by {abs(wtracker.adjustment)} calories per day."
+            return ""
+        days_to_go = wtracker.settings.cycle - (today % wtracker.settings.cycle)
+        plural = "s" if days_to_go > 1 else ""
+        info = f"Continue current intake for next {days_to_go} day{plural}."
+        if wtracker.settings.always_show_adj:
+            info += f" Adjustment value is {wtracker.adjustment:+}."
+        return info
+
+    def _on_draw(self, event):
+        """Saves the background after a full draw, then adds the artists."""
+        # not for draws by savefig, which already include the artists
+        if event.canvas is not self or not self.title.get_animated():
+            return
+        self._background = self.copy_from_bbox(self.fig.bbox)
+        self._layout = self._current_layout()
+        self._draw_animated()
+
+    def _current_layout(self):
+        """Returns the properties that require a full redraw when changed."""
+        return (self.axes.get_xlim(), self.axes.get_ylim(), self.axes.get_ylabel())
+
+    def _draw_animated(self):
+        for artist in self.animated_artists:
+            self.fig.draw_artist(artist)
+
+    @timed("draw")
+    def draw(self):
+        """Reimplements FigureCanvasQTAgg - renders the whole figure."""
+        super().draw()
+
+    @timed("blit")
+    def _blit(self):
+        """Draws the animated artists over the saved background."""
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.fig.bbox)
 
     def export(self, path, filetype):
-        self.fig.savefig(path, format=filetype)
+        # animated artists are skipped when saving, so turn that off for now
+        for artist in self.animated_artists:
+            artist.set_animated(False)
+        try:
+            self.fig.savefig(path, format=filetype)
+        finally:
+            for artist in self.animated_artists:
+                artist.set_animated(True)
@@ -1,6 +1,6 @@
-from PyQt5 import uic
 from PyQt5.QtWidgets import QDialog, QDialogButtonBox
 
+from pyweight.ui import ui_class
 from pyweight.wmsettings import WMSettings
 
 
@@ -17,6 +17,9 @@ class Preferences(WMSettings):
         "auto_save_data": False,
         "prev_plan": "",
         "language": "English",
+        # how imported readings are collapsed to one per day, see
+        # `pyweight.core.data.MERGE_POLICIES`
+        "import_policy": "first",
     }
 
     conversions = {"open_prev": bool, "auto_save_data": bool}
@@ -25,7 +28,7 @@ class Preferences(WMSettings):
         super().__init__(self.defaults, self.conversions)
 
 
-class PreferencesWindow(QDialog):
+class PreferencesWindow(QDialog, ui_class("prefs")):
     """A class to manage the preferences window UI.
 
     Init:
@@ -35,7 +38,7 @@ class PreferencesWindow(QDialog):
 
     def __init__(self, prefs, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        uic.loadUi("pyweight/ui/prefs.ui", self)
+        self.setupUi(self)
         self.setFixedSize(self.size())
 
         # Preferences class in use by parent window
@@ -1,7 +1,7 @@
-from PyQt5 import uic
 from PyQt5.QtWidgets import QDialog, QDialogButtonBox, QMessageBox
 
-from pyweight.wmsettings import WMSettings
+from pyweight.core.settings import Plan
+from pyweight.ui import ui_class
 from pyweight.wmutils import lbs_to_kg, kg_to_lbs, m_to_in, m_to_cm, in_to_m, cm_to_m
 
 
@@ -12,43 +12,15 @@ WCRATE_MAX_KG = round(lbs_to_kg(WCRATE_MAX_LBS), 2)
 WCRATE_MIN_KG = -1 * WCRATE_MAX_KG
 
 
-class Profile(WMSettings):
+class Profile(Plan):
     """A class to allow instantiating plan settings.
 
-    Users could just call WMSettings directly, but this class provides
-    a way for other classes to get a plan settings instance without
-    knowing anything about its defaults, conversions, etc.
+    The settings themselves are defined by Plan (see core/settings.py),
+    which can be used without Qt; this is the class the GUI uses.
     """
 
-    defaults = {
-        "wcrate": -0.4536 / 7,  # kg/day
-        "cycle": 14,
-        "path": "",
-        "units": "imperial",
-        "always_show_adj": True,
-        "body_fat_method": "automatic",
-        "age": 25,
-        "height": 1.651,  # meters
-        "gender_selection": "none",
-        "gender_prop": 0.5,
-        "manual_body_fat": 0.25,
-    }
-
-    conversions = {
-        "wcrate": float,
-        "cycle": int,
-        "always_show_adj": bool,
-        "age": int,
-        "height": float,
-        "gender_prop": float,
-        "manual_body_fat": float,
-    }
-
-    def __init__(self, path):
-        super().__init__(self.defaults, self.conversions, path)
-
-
-class ProfileWindow(QDialog):
+
+class ProfileWindow(QDialog, ui_class("profilemanager")):
     """Class representing the UI for the Plan Editor.
 
     Init:
@@ -60,7 +32,7 @@ class ProfileWindow(QDialog):
 
     def __init__(self, profile, save_fn, mode, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        uic.loadUi("pyweight/ui/profilemanager.ui", self)
+        self.setupUi(self)
         self.setFixedSize(self.size())
 
         # the Profile class in use by the parent
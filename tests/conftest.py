@@ -0,0 +1,84 @@
+import json
+import timeit
+
+import pytest
+
+# where `--bench-save` keeps the timings that later runs are compared with
+BASELINES = ".benchmarks/baselines.json"
+
+# (stored baselines, timings of this run), by test id
+bench_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--bench-save",
+        action="store_true",
+        help=f"store the benchmark timings as the new baselines (in {BASELINES})",
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=1.5,
+        help="fail benchmarks this many times slower than their baseline",
+    )
+
+
+class Bench:
+    """Times a benchmark, and compares it with its stored baseline.
+
+    Calling it with a function runs the function enough times to get a
+    stable timing, and records the best time per call. Benchmarks more than
+    `--bench-tolerance` times slower than their baseline fail.
+    """
+
+    def __init__(self, config, name):
+        self.config = config
+        self.name = name
+
+    def __call__(self, fn, repeat=5):
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        seconds = min(timer.repeat(repeat, number)) / number
+        baselines, results = self.config.stash[bench_key]
+        results[self.name] = seconds
+        baseline = baselines.get(self.name)
+        tolerance = self.config.getoption("--bench-tolerance")
+        if baseline and not self.config.getoption("--bench-save"):
+            ratio = seconds / baseline
+            if ratio > tolerance:
+                pytest.fail(
+                    f"{seconds * 1e3:.3f} ms per call, {ratio:.1f}x slower than "
+                    f"the baseline of {baseline * 1e3:.3f} ms"
+                )
+        return seconds
+
+
+def pytest_configure(config):
+    path = config.rootpath / BASELINES
+    baselines = json.loads(path.read_text()) if path.exists() else {}
+    config.stash[bench_key] = (baselines, {})
+
+
+@pytest.fixture
+def bench(request):
+    """Times a function, see `Bench`."""
+    return Bench(request.config, request.node.nodeid)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    baselines, results = config.stash[bench_key]
+    if not results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, seconds in sorted(results.items()):
+        line = f"{seconds * 1e3:10.3f} ms  {name}"
+        if name in baselines:
+            line += f"  ({seconds / baselines[name]:.2f}x baseline)"
+        terminalreporter.write_line(line)
+    if config.getoption("--bench-save"):
+        path = config.rootpath / BASELINES
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps({**baselines, **results}, indent=2) + "\n")
+        terminalreporter.write_line(f"saved as baselines in {path}")
@@ -0,0 +1,55 @@
+import csv
+import os
+from datetime import datetime
+
+import pytest
+from PyQt5.QtCore import Qt
+
+from pyweight.wmautosave import AutoSaver
+from pyweight.wmdatamodel import WeightTable
+
+
+@pytest.fixture
+def wt(tmp_path):
+    path = str(tmp_path / "data.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csvw = csv.writer(f)
+        csvw.writerow(["Date", "Weight (kg)"])
+        csvw.writerow([datetime.now().strftime("%Y/%m/%d"), ""])
+    return WeightTable(path, "metric")
+
+
+@pytest.fixture
+def saver(qtbot):
+    return AutoSaver()
+
+
+def test_edits_coalesce(qtbot, wt, saver, monkeypatch):
+    jobs = []
+    save_job = wt.save_job
+    monkeypatch.setattr(wt, "save_job", lambda: jobs.append(1) or save_job())
+    for value in ("100", "101", "102"):
+        wt.setData(wt.index(0), value, Qt.EditRole)
+        saver.schedule(wt)
+    assert not jobs
+    qtbot.waitUntil(lambda: os.path.exists(wt.journal_path))
+    saver.flush()
+    assert len(jobs) == 1
+    assert WeightTable(wt.csvpath, "metric").weights.tolist() == [102]
+
+
+def test_flush(qtbot, wt, saver):
+    wt.setData(wt.index(0), "100", Qt.EditRole)
+    saver.schedule(wt)
+    saver.flush()
+    assert WeightTable(wt.csvpath, "metric").weights.tolist() == [100]
+    # nothing left to do
+    saver.flush()
+
+
+def test_failure_reported(qtbot, wt, saver):
+    os.mkdir(wt.journal_path)
+    wt.setData(wt.index(0), "100", Qt.EditRole)
+    with qtbot.waitSignal(saver.failed) as blocker:
+        saver.schedule(wt)
+    assert blocker.args[0]
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+from pyweight.wmbatch import assess_plans, main
+from pyweight.core.bodymodel import WeightTracker
+from pyweight.core.data import WeightData
+from pyweight.core.settings import Plan
+
+
+def write_plan(tmp_path, name, days):
+    datapath = str(tmp_path / f"{name}.csv")
+    with open(datapath, "w") as f:
+        f.write("Date,Weight (kg)")
+        for i in range(days):
+            f.write(f"\n{date(2000, 1, 1) + timedelta(days=i):%Y/%m/%d},")
+            f.write(f"{100 - 0.05 * i:.2f}")
+    planpath = str(tmp_path / f"{name}.wmplan")
+    Plan(planpath).apply({"path": datapath, "units": "metric"})
+    return planpath
+
+
+@pytest.fixture
+def plans(tmp_path):
+    return [write_plan(tmp_path, f"plan{i}", 30 + 10 * i) for i in range(3)]
+
+
+def expected_adjustment(planpath):
+    plan = Plan(planpath)
+    data = WeightData(plan.path, plan.units)
+    return WeightTracker(data, plan, listen=False).adjustment
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_assess_plans(plans, jobs):
+    results = assess_plans(plans, jobs)
+    assert [result["plan"] for result in results] == plans
+    for result in results:
+        assert result["error"] is None
+        assert result["adjustment"] == expected_adjustment(result["plan"])
+
+
+def test_assess_errors(tmp_path, plans):
+    short = write_plan(tmp_path, "short", 1)
+    missing = str(tmp_path / "missing.wmplan")
+    results = assess_plans([plans[0], short, missing], 1)
+    assert results[0]["error"] is None
+    assert "not enough data" in results[1]["error"]
+    assert results[1]["adjustment"] is None
+    assert "does not exist" in results[2]["error"]
+
+
+def test_main_json(plans, capsys):
+    assert main(["-j", "1", *plans]) == 0
+    results = json.loads(capsys.readouterr().out)
+    assert [result["plan"] for result in results] == plans
+
+
+def test_main_csv(tmp_path, plans, capsys):
+    missing = str(tmp_path / "missing.wmplan")
+    assert main(["--format", "csv", "-j", "1", plans[0], missing]) == 1
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert rows[0]["adjustment"] == str(expected_adjustment(plans[0]))
+    assert rows[1]["adjustment"] == ""
+
+
+def test_batch_without_qt(plans):
+    # -X importtime reports the imports of the worker processes too
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pyweight", "batch", "-j", "2"]
+        + plans,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0
+    assert [result["plan"] for result in json.loads(proc.stdout)] == plans
+    assert "PyQt5" not in proc.stderr
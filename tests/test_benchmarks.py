@@ -0,0 +1,229 @@
+import csv
+import datetime
+import itertools
+import time
+
+import numpy as np
+import pytest
+from PyQt5.QtCore import Qt
+
+import pyweight.core.data
+from pyweight.core.bodymodel import WeightTracker
+from pyweight.core.data import read_cache, read_csv
+from pyweight.wmdatamodel import WeightTable
+from pyweight.wmmainwindow import MainWindow
+from pyweight.wmplot import Canvas
+from pyweight.wmprofile import Profile
+from tests.test_mainwindow import FakePrefs
+
+# everything here is timing-based; run with `pytest -m benchmark`, and see
+# conftest.py for storing baselines and comparing with them
+pytestmark = pytest.mark.benchmark
+
+START_DATE = datetime.date(2000, 1, 1)
+
+
+def write_log(path, days):
+    """Writes a data file with a plausible history of `days` days.
+
+    The weight wanders up and down over the years, with some daily noise,
+    and about one day in seven is skipped, like a real log.
+    """
+    rng = np.random.default_rng(0)
+    years = np.arange(days) / 365
+    weights = 90 + 10 * np.sin(years) + rng.normal(0, 0.5, days)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        csvw = csv.writer(f)
+        csvw.writerow(["Date", "Weight (kg)"])
+        for i, weight in enumerate(weights.round(1).tolist()):
+            if i == 0 or rng.random() > 1 / 7:
+                date = START_DATE + datetime.timedelta(days=i)
+                csvw.writerow([date.strftime("%Y/%m/%d"), weight])
+
+
+def toggle_last_entry(table):
+    """Returns a function that edits the last entry of a table each call."""
+    row = int(table.daynumbers[-1]) - 1
+    values = itertools.cycle(("90", "91"))
+    return lambda: table.setData(table.index(row), next(values), Qt.EditRole)
+
+
+@pytest.fixture(params=[31, 5 * 365, 50 * 365], ids=["1 month", "5 years", "50 years"])
+def log(request, tmp_path):
+    path = str(tmp_path / "data.csv")
+    write_log(path, request.param)
+    return path
+
+
+@pytest.fixture
+def table(qtbot, log):
+    return WeightTable(log, "metric")
+
+
+@pytest.fixture
+def plan(tmp_path):
+    plan = Profile(str(tmp_path / "plan.wmplan"))
+    plan.units = "metric"
+    return plan
+
+
+def test_load(bench, qtbot, log):
+    bench(lambda: WeightTable(log, "metric"))
+
+
+def test_parse(bench, log):
+    bench(lambda: read_csv(log))
+
+
+def test_save(bench, table):
+    bench(table.save_csv)
+
+
+def test_merge_entries(bench, table):
+    # three readings a day over the whole log, as from a smart scale
+    days = int(table.daynumbers[-1])
+    start = datetime.datetime.combine(START_DATE, datetime.time(7))
+    readings = [
+        (start + datetime.timedelta(days=day, hours=hour), 80 + hour / 10)
+        for day in range(days)
+        for hour in (0, 4, 12)
+    ]
+    bench(lambda: table.merge_entries(readings, policy="mean", overwrite=True))
+
+
+def test_views(bench, table):
+    def views():
+        # changing the units throws away the cached views
+        table.set_units("metric")
+        return table.dates, table.weights, table.daynumbers
+
+    bench(views)
+
+
+def test_interpolation(bench, table, plan):
+    bench(lambda: WeightTracker(table, plan, listen=False).interpolation)
+
+
+def test_interpolation_after_edit(bench, table, plan):
+    tracker = WeightTracker(table, plan)
+    edit = toggle_last_entry(table)
+
+    def refit():
+        edit()
+        return tracker.interpolation
+
+    bench(refit)
+
+
+def test_adjustment(bench, table, plan):
+    tracker = WeightTracker(table, plan)
+    tracker.interpolation
+
+    def adjustment():
+        tracker.refit(())
+        return tracker.adjustment
+
+    bench(adjustment)
+
+
+def test_plot(bench, qtbot, table, plan):
+    canvas = Canvas()
+    qtbot.addWidget(canvas)
+    canvas.resize(600, 400)
+    tracker = WeightTracker(table, plan)
+
+    def plot():
+        canvas.plot(tracker)
+        # a full Agg render, not just a blit
+        canvas.draw()
+
+    bench(plot)
+
+
+def test_table_changed(bench, qtbot, tmp_path, log):
+    # an edit in the main window, up to the new plot being shown
+    mw = MainWindow(app=None)
+    qtbot.addWidget(mw)
+    mw.prefs = FakePrefs(tmp_path)
+    mw.open_plan_file(str(tmp_path / "plan.wmplan"))
+    mw.plan.path = log
+    mw.open_data_file()
+    edit = toggle_last_entry(mw.wt)
+
+    def table_changed():
+        with qtbot.waitSignal(mw.pipeline.finished):
+            edit()
+
+    bench(table_changed)
+
+
+def _best_time(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _synthetic_table(path, days):
+    write_log(path, days)
+    return WeightTable(str(path), "metric")
+
+
+def _read_csv_strptime(csvpath):
+    # the row-by-row loader `read_csv` replaced, kept as a baseline
+    dates = []
+    values = []
+    with open(csvpath, encoding="utf-8", newline="") as f:
+        csvr = csv.reader(f)
+        next(csvr)  # skip header
+        for row in csvr:
+            dates.append(datetime.datetime.strptime(row[0], "%Y/%m/%d").date())
+            values.append(float(row[1]) if row[1] != "" else np.nan)
+    return np.array(dates, dtype="datetime64[D]"), np.array(values)
+
+
+@pytest.mark.parametrize("days", [10_000, 100_000, 1_000_000])
+def test_read_csv_speedup(tmp_path, days):
+    path = tmp_path / "data.csv"
+    write_log(path, days)
+    new, old = read_csv(path), _read_csv_strptime(path)
+    np.testing.assert_array_equal(new[0], old[0])
+    np.testing.assert_array_equal(new[1], old[1])
+    speedup = _best_time(lambda: _read_csv_strptime(path), 3) / _best_time(
+        lambda: read_csv(path), 3
+    )
+    print(f"read_csv, {days} rows: {speedup:.1f}x faster than strptime")
+    assert speedup > 2
+
+
+@pytest.mark.parametrize("days", [100_000, 1_000_000])
+def test_cache_speedup(tmp_path, days):
+    path = tmp_path / "data.csv"
+    write_log(path, days)
+    pyweight.core.data.load_csv(path)  # writes the cache
+    cached = read_cache(path)
+    np.testing.assert_array_equal(cached[0], read_csv(path)[0])
+    speedup = _best_time(lambda: read_csv(path), 3) / _best_time(
+        lambda: read_cache(path), 3
+    )
+    print(f"read_cache, {days} rows: {speedup:.1f}x faster than read_csv")
+    assert speedup > 5
+
+
+def test_end_date_csvdata_scaling(qtbot, tmp_path):
+    # regression benchmark: end_date must be O(1) and csvdata O(n)
+    wt_small = _synthetic_table(tmp_path / "small.csv", 10_000)
+    wt_large = _synthetic_table(tmp_path / "large.csv", 100_000)
+
+    def end_dates(wt):
+        return lambda: [wt.end_date for _ in range(1000)]
+
+    ratio = _best_time(end_dates(wt_large)) / _best_time(end_dates(wt_small))
+    assert ratio < 3
+    # 10x the rows: linear is ~10x, quadratic would be ~100x
+    ratio = _best_time(lambda: wt_large.csvdata, 3) / _best_time(
+        lambda: wt_small.csvdata, 3
+    )
+    assert ratio < 30
@@ -1,11 +1,18 @@
+import numpy as np
 import pytest
+from PyQt5.QtCore import Qt
+from scipy.interpolate import LSQUnivariateSpline
+from scipy.special import lambertw
 
 from datetime import datetime, timedelta
-from pyweight.wmbodymodel import (
+import pyweight.core.bodymodel
+from pyweight.core.bodymodel import (
+    LinearSpline,
     WeightTracker,
     delta_lean,
     initial_body_fat_est,
     delta_e,
+    lambertw_exp,
 )
 from pyweight.wmdatamodel import WeightTable
 from pyweight.wmprofile import Profile
@@ -198,3 +205,119 @@ def test_adjustment_sanity_3(fd):
         delta_e(fd.weight_i, fd.weight, target_weight, body_fat_i) / fd.profile.cycle
     )
     assert fd.tracker.adjustment == correct
+
+
+def test_linear_spline_matches_scipy():
+    rng = np.random.default_rng(0)
+    x = np.arange(1, 2001, dtype=float)
+    x = x[rng.random(len(x)) > 0.3]
+    y = 100 + rng.standard_normal(len(x))
+    t = np.arange(14, x[-1], 14, dtype=float)
+    expected = LSQUnivariateSpline(x, y, t, k=1)
+    actual = LinearSpline(x, y, t)
+    points = np.linspace(-10, x[-1] + 10, 500)
+    assert np.allclose(actual(points), expected(points), rtol=0, atol=1e-9)
+    assert np.allclose(actual.get_knots(), expected.get_knots())
+
+
+def test_linear_spline_update():
+    rng = np.random.default_rng(1)
+    x = np.arange(1, 100, dtype=float)
+    y = 100 + rng.standard_normal(len(x))
+    spline = LinearSpline(x, y, np.arange(14, x[-1], 14, dtype=float))
+    # change a value in the middle, and add a new day that creates a knot
+    y[50] += 5
+    x = np.append(x, 100.0)
+    y = np.append(y, 99.0)
+    t = np.arange(14, x[-1], 14, dtype=float)
+    spline.update(x, y, t, [x[50], 100.0])
+    expected = LSQUnivariateSpline(x, y, t, k=1)
+    assert np.allclose(spline(x), expected(x), rtol=0, atol=1e-9)
+
+
+def test_linear_spline_schoenberg_whitney():
+    x = np.array([1.0, 2.0, 30.0])
+    with pytest.raises(ValueError):
+        LinearSpline(x, np.ones(3), [10.0, 20.0])
+
+
+def test_refit(fd):
+    for _ in range(2 * fd.profile.cycle):
+        fd.add_day(weight_change=-0.1)
+    fd.add_day()
+    tracker = fd.tracker
+    assert tracker.interpolation is not None
+    spline = tracker.interpolation
+    table = tracker.data
+    table.setData(table.index(2 * fd.profile.cycle), "90", Qt.EditRole)
+    assert tracker.interpolation is spline
+    expected = LSQUnivariateSpline(table.daynumbers, table.weights, tracker.knots, k=1)
+    assert np.allclose(spline(table.daynumbers), expected(table.daynumbers))
+
+
+def test_settings_invalidation(fd):
+    for _ in range(fd.profile.cycle):
+        fd.add_day(weight_change=0)
+    tracker = fd.tracker
+    spline = tracker.interpolation
+    adjustment = tracker.adjustment
+    fd.profile.wcrate = 0
+    assert tracker.interpolation is spline
+    assert tracker.adjustment != adjustment
+    fd.profile.cycle = 7
+    assert tracker.interpolation is not spline
+    assert tracker.knots == [7]
+
+
+def test_zero_adjustment_cached(fd, monkeypatch):
+    for _ in range(fd.profile.cycle):
+        fd.add_day(weight_change=fd.profile.wcrate)
+    tracker = fd.tracker
+    assert tracker.adjustment == 0
+    monkeypatch.setattr(tracker, "_interpolation", None)
+    monkeypatch.setattr(pyweight.core.bodymodel, "LinearSpline", None)
+    assert tracker.adjustment == 0
+
+
+def test_delta_e_vectorized():
+    previous = np.array([70.0, 65.0, 80.0])
+    current = np.array([65.0, 60.0, 81.0])
+    expected = [delta_e(80, p, c, 25) for p, c in zip(previous, current)]
+    assert np.allclose(delta_e(80, previous, current, 25), expected)
+    lean = [delta_lean(d, 30) for d in (-10.0, 0.0, 5.0)]
+    assert np.allclose(delta_lean(np.array([-10.0, 0.0, 5.0]), 30), lean)
+
+
+def test_energy_balance(fd):
+    for _ in range(2 * fd.profile.cycle):
+        fd.add_day(weight_change=-0.1)
+    tracker = fd.tracker
+    balance = tracker.energy_balance
+    assert len(balance) == 2
+    assert all(balance < 0)
+    points = [1, fd.profile.cycle, 2 * fd.profile.cycle]
+    weights = tracker.interpolation(points)
+    body_fat_i = initial_body_fat_est(
+        weights[0], fd.profile.age, fd.profile.height, fd.profile.gender_prop
+    )
+    total = delta_e(weights[0], weights[0], weights[-1], body_fat_i)
+    assert round(balance.sum()) == round(total)
+
+
+def test_lambertw_exp():
+    log_z = np.linspace(-30, 300, 5000)
+    expected = lambertw(np.exp(log_z)).real
+    assert np.allclose(lambertw_exp(log_z), expected, rtol=1e-13, atol=0)
+    assert lambertw_exp(1.0) == pytest.approx(lambertw(np.e).real, rel=1e-14)
+    assert lambertw_exp(-np.inf) == 0
+    # would overflow if the argument was computed directly
+    assert np.isfinite(lambertw_exp(1e4))
+
+
+def test_delta_lean_matches_scipy():
+    # physiologically plausible range: 2-150 kg fat, +/- 60 kg change
+    fat_i = np.linspace(2, 150, 75)[:, None]
+    delta_bw = np.linspace(-60, 60, 121)[None, :]
+    arg = fat_i / 10.4 * np.exp(delta_bw / 10.4) * np.exp(fat_i / 10.4)
+    expected = delta_bw + fat_i - 10.4 * lambertw(arg).real
+    assert np.allclose(delta_lean(delta_bw, fat_i), expected, rtol=0, atol=1e-10)
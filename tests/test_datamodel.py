@@ -1,15 +1,17 @@
 import datetime
-from copy import deepcopy
+import os
 
+import numpy as np
 import pytest
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QModelIndex
 from PyQt5.QtWidgets import QAbstractItemView
 from freezegun import freeze_time
 
+import pyweight.core.data
+from pyweight.core.data import collapse_readings, read_cache, read_csv
 from pyweight.wmdatamodel import WeightTable
 from pyweight.wmutils import kg_to_lbs
 
-
 START_DATE = datetime.date(2000, 1, 1)
 
 
@@ -62,6 +64,10 @@ class SimpleView(QAbstractItemView):
         self.events.append(("rowsInserted", start, end))
 
 
+def rows(wt):
+    return [wt._row(i) for i in range(wt.rowCount(QModelIndex()))]
+
+
 @pytest.fixture
 def wtb(qtbot, tmp_path):
     return WeightTableBuilder(tmp_path)
@@ -75,7 +81,7 @@ def view(qtbot):
 def test_init(wtb):
     wt = wtb.empty_build()
     data = [[START_DATE, "2000/01/01", ""]]
-    assert wt._data == data
+    assert rows(wt) == data
     assert wt.has_new_plottable_data is False
     assert wt.start_date == START_DATE
 
@@ -100,7 +106,7 @@ def test_set_data(wtb, view, qtmodeltester):
         [datetime.date(2000, 1, 1), "2000/01/01", 101.11],
         [datetime.date(2000, 1, 2), "2000/01/02", 101.12],
     ]
-    assert wt._data == data
+    assert rows(wt) == data
     events = [("dataChanged", 1, 1)]
     assert view.events == events
 
@@ -116,10 +122,10 @@ def test_add_dates_no_change(wtb, view, qtmodeltester):
     wt = wtb.empty_build()
     qtmodeltester.check(wt)
     view.setModel(wt)
-    before = deepcopy(wt._data)
+    before = rows(wt)
     with freeze_time(START_DATE):
         wt.add_dates()
-    assert before == wt._data
+    assert before == rows(wt)
     assert view.events == []
 
 
@@ -134,7 +140,7 @@ def test_add_dates_final_blank(wtb, view, qtmodeltester):
         [datetime.date(2000, 1, 1), "2000/01/01", 100],
         [datetime.date(2000, 1, 2), "2000/01/02", ""],
     ]
-    assert wt._data == data
+    assert rows(wt) == data
     events = [
         ("rowsAboutToBeInserted", 1, 1),
         ("rowsInserted", 1, 1),
@@ -153,7 +159,7 @@ def test_add_dates_missing(wtb, view, qtmodeltester):
         [datetime.date(2000, 1, 2), "2000/01/02", ""],
         [datetime.date(2000, 1, 3), "2000/01/03", ""],
     ]
-    assert wt._data == data
+    assert rows(wt) == data
     events = [
         ("rowsAboutToBeInserted", 1, 2),
         ("rowsInserted", 1, 2),
@@ -182,7 +188,7 @@ def test_dates(wtb):
         datetime.date(2000, 1, 1),
         datetime.date(2000, 1, 3),
     ]
-    assert wt.dates == dates
+    assert wt.dates.tolist() == dates
 
 
 def test_weights(wtb):
@@ -191,7 +197,7 @@ def test_weights(wtb):
     wtb.add_auto_day()
     wt = wtb.build()
     weights = [100, 100]
-    assert wt.weights == weights
+    assert wt.weights.tolist() == weights
 
 
 def test_weights_imperial(wtb):
@@ -201,7 +207,7 @@ def test_weights_imperial(wtb):
     wtb.add_auto_day()
     wt = wtb.build()
     weights = [kg_to_lbs(100), kg_to_lbs(100)]
-    assert wt.weights == weights
+    assert wt.weights.tolist() == weights
 
 
 def test_csvdata_empty(wtb):
@@ -245,4 +251,373 @@ def test_daynumbers(wtb):
     wtb.add_day()
     wtb.add_auto_day()
     wt = wtb.build()
-    assert wt.daynumbers == [1, 3]
+    assert wt.daynumbers.tolist() == [1, 3]
+
+
+def test_set_data_blank(wtb):
+    wtb.add_auto_day()
+    wtb.add_auto_day()
+    wt = wtb.build()
+    wt.setData(wt.index(1, 0), "", Qt.EditRole)
+    assert wt.data(wt.index(1, 0), Qt.DisplayRole) == ""
+    assert wt.dates.tolist() == [START_DATE]
+    assert wt.has_new_plottable_data
+
+
+def test_views_cached(wtb):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wtb.add_auto_day()
+    wt = wtb.build()
+    assert wt.weights is wt.weights
+    assert not wt.daynumbers.flags.writeable
+    wt.setData(wt.index(1, 0), "90", Qt.EditRole)
+    assert wt.weights.tolist() == [100, 90, 100]
+    assert wt.daynumbers.tolist() == [1, 2, 3]
+
+
+def test_end_date_tracks_edits(wtb):
+    wtb.add_auto_day()
+    wtb.add_auto_day()
+    wtb.add_day()
+    wt = wtb.build()
+    assert wt.end_date == datetime.date(2000, 1, 2)
+    wt.setData(wt.index(2, 0), "100", Qt.EditRole)
+    assert wt.end_date == datetime.date(2000, 1, 3)
+    wt.setData(wt.index(2, 0), "", Qt.EditRole)
+    wt.setData(wt.index(1, 0), "", Qt.EditRole)
+    assert wt.end_date == START_DATE
+    assert len(wt.csvdata) == 1
+    wt.setData(wt.index(0, 0), "", Qt.EditRole)
+    assert wt.end_date == START_DATE
+
+
+def test_read_csv_blank_rows(wtb):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wtb.add_day("97.5")
+    wtb.add_day()
+    wt = wtb.build()
+    assert [row[2] for row in rows(wt)] == [100, "", 97.5, ""]
+    assert wt.weights.tolist() == [100, 97.5]
+    assert wt.end_date == datetime.date(2000, 1, 3)
+
+
+def test_blank_days_not_stored(wtb):
+    wtb.add_day()
+    wtb.add_auto_day()
+    wt = wtb.build()
+    with freeze_time("2010-01-01"):
+        wt.add_dates()
+    assert wt.rowCount(QModelIndex()) == 3654
+    assert len(wt._days) == 1
+    assert wt.headerData(3653, Qt.Vertical, Qt.DisplayRole) == "2010/01/01"
+    wt.setData(wt.index(3000, 0), "90", Qt.EditRole)
+    assert wt.data(wt.index(3000, 0), Qt.DisplayRole) == "90.0"
+    assert wt.data(wt.index(2999, 0), Qt.DisplayRole) == ""
+    wt.save_csv()
+    # only the first day and the entries are saved
+    with open(wt.csvpath) as f:
+        assert f.read().splitlines() == [
+            "Date,Weight (kg)",
+            "2000/01/01,",
+            "2000/01/02,100.0",
+            "2008/03/19,90.0",
+        ]
+    wt = WeightTable(wt.csvpath, "metric")
+    assert wt.rowCount(QModelIndex()) == 3001
+    assert wt.daynumbers.tolist() == [2, 3001]
+
+
+def test_gaps_are_blank_rows(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("Date,Weight (kg)\n2000/01/01,100\n2000/01/04,99\n")
+    wt = WeightTable(str(path), "metric")
+    assert [row[2] for row in rows(wt)] == [100, "", "", 99]
+
+
+@pytest.mark.parametrize(
+    "row, message",
+    [
+        ("2000/01/03", "expected 2 columns"),
+        ("2000-01-03,100", "not a YYYY/MM/DD date"),
+        ("2000/02/30,100", "day is out of range"),
+        ("2000/01/03,heavy", "could not convert"),
+        ("2000/01/03,nan", "not a valid weight"),
+        ("2000/01/03,-1", "not a valid weight"),
+        ("2000/01/02,100", "not in order"),
+    ],
+)
+def test_read_csv_bad_row(tmp_path, row, message):
+    path = tmp_path / "data.csv"
+    path.write_text(f"Date,Weight (kg)\n2000/01/01,100\n2000/01/02,\n{row}\n")
+    with pytest.raises(ValueError, match=f"line 4: .*{message}"):
+        read_csv(path)
+
+
+def test_read_csv_empty(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("Date,Weight (kg)\n")
+    with pytest.raises(ValueError, match="no data"):
+        read_csv(path)
+
+
+def test_journal_changes(wtb):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wt = wtb.build()
+    with open(wt.csvpath) as f:
+        saved = f.read()
+    wt.setData(wt.index(1, 0), "90", Qt.EditRole)
+    wt.setData(wt.index(0, 0), "", Qt.EditRole)
+    wt.journal_changes()
+    with open(wt.journal_path) as f:
+        assert f.read().splitlines() == ["2000/01/01,", "2000/01/02,90.0"]
+    with open(wt.csvpath) as f:
+        assert f.read() == saved
+    # nothing new to journal
+    wt.journal_changes()
+    assert [row[2] for row in rows(WeightTable(wt.csvpath, "metric"))] == ["", 90]
+
+
+def test_journal_replay(wtb):
+    wtb.add_auto_day()
+    wt = wtb.build()
+    with open(wt.journal_path, "w") as f:
+        # past the end of the data, then a torn write
+        f.write("2000/01/04,95\n2000/01/01,99\n2000/01/0")
+    wt = WeightTable(wt.csvpath, "metric")
+    assert [row[2] for row in rows(wt)] == [99, "", "", 95]
+    assert wt.end_date == datetime.date(2000, 1, 4)
+    wt.save_csv()
+    assert not os.path.exists(wt.journal_path)
+    assert [row[2] for row in rows(WeightTable(wt.csvpath, "metric"))] == [
+        99,
+        "",
+        "",
+        95,
+    ]
+
+
+def test_journal_compacts(wtb, monkeypatch):
+    monkeypatch.setattr(pyweight.core.data, "JOURNAL_COMPACT_ENTRIES", 2)
+    wtb.add_auto_day()
+    wtb.add_day()
+    wt = wtb.build()
+    for value in ("90", "91"):
+        wt.setData(wt.index(1, 0), value, Qt.EditRole)
+        wt.journal_changes()
+    assert os.path.exists(wt.journal_path)
+    wt.setData(wt.index(1, 0), "92", Qt.EditRole)
+    wt.journal_changes()
+    assert not os.path.exists(wt.journal_path)
+    assert read_csv(wt.csvpath)[1].tolist() == [100, 92]
+
+
+def test_cache_used(wtb, monkeypatch):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wtb.add_day("97.5")
+    wt = wtb.build()
+    assert os.path.exists(f"{wt.csvpath}.cache")
+
+    def fail(csvpath):
+        raise AssertionError("parsed the CSV")
+
+    monkeypatch.setattr(pyweight.core.data, "read_csv", fail)
+    cached = WeightTable(wt.csvpath, "metric")
+    assert rows(cached) == rows(wt)
+    assert cached.weights.tolist() == [100, 97.5]
+
+
+def test_cache_stale(wtb):
+    wtb.add_auto_day()
+    wt = wtb.build()
+    stat = os.stat(wt.csvpath)
+    # same size and modification time, different contents
+    with open(wt.csvpath, "w") as f:
+        f.write("Date,Weight (kg)\n2000/01/01,200")
+    os.utime(wt.csvpath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert read_cache(wt.csvpath) is None
+    assert WeightTable(wt.csvpath, "metric").weights.tolist() == [200]
+    # regenerated
+    assert read_cache(wt.csvpath)[1].tolist() == [200]
+
+
+def test_cache_corrupt(wtb):
+    wtb.add_auto_day()
+    wt = wtb.build()
+    with open(f"{wt.csvpath}.cache", "r+b") as f:
+        f.truncate(100)
+    assert read_cache(wt.csvpath) is None
+    assert WeightTable(wt.csvpath, "metric").weights.tolist() == [100]
+
+
+def test_cache_follows_save(wtb):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wt = wtb.build()
+    wt.setData(wt.index(1, 0), "90", Qt.EditRole)
+    wt.save_csv()
+    dates, values = read_cache(wt.csvpath)
+    assert values.tolist() == [100, 90]
+    np.testing.assert_array_equal(dates, read_csv(wt.csvpath)[0])
+
+
+def test_reload_appended(wtb, view, qtbot, monkeypatch):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wt = wtb.build()
+    view.setModel(wt)
+    with open(wt.csvpath, "a") as f:
+        f.write("\n2000/01/03,95\n")
+    with qtbot.waitSignal(wt.reloaded) as blocker:
+        wt.reload()
+    assert blocker.args == [[]]
+    assert [row[2] for row in rows(wt)] == [100, "", 95]
+    assert view.events == [
+        ("rowsAboutToBeInserted", 2, 2),
+        ("rowsInserted", 2, 2),
+        ("dataChanged", 2, 2),
+    ]
+
+    # now only the appended rows are read, up to the last complete one
+    def fail():
+        raise AssertionError("read the whole file")
+
+    monkeypatch.setattr(wt, "_read_disk", fail)
+    with open(wt.csvpath, "a") as f:
+        f.write("2000/01/05,94\n2000/01/06,9")
+    wt.reload()
+    assert [row[2] for row in rows(wt)] == [100, "", 95, "", 94]
+    with open(wt.csvpath, "a") as f:
+        f.write("3\n")
+    wt.reload()
+    assert [row[2] for row in rows(wt)] == [100, "", 95, "", 94, 93]
+    assert not wt.has_new_plottable_data
+
+
+def test_reload_rewritten_and_appended(wtb, qtbot):
+    wtb.add_day("81.0")
+    for _ in range(9):
+        wtb.add_auto_day()
+    wt = wtb.build()
+    with open(wt.csvpath, "a") as f:
+        f.write("\n")
+    wt.reload()
+    # the same file, with its first row changed as well as one appended
+    with open(wt.csvpath, "r+") as f:
+        data = f.read().replace("81.0", "70.0")
+        f.seek(0)
+        f.write(f"{data}2000/01/11,95\n")
+    with qtbot.waitSignal(wt.reloaded):
+        wt.reload()
+    assert [row[2] for row in rows(wt)] == [70] + [100] * 9 + [95]
+
+
+def test_reload_rewritten(wtb, view, qtbot):
+    wtb.add_auto_day()
+    wtb.add_day("99")
+    wtb.add_day()
+    wtb.add_day("98")
+    wt = wtb.build()
+    view.setModel(wt)
+    wt.setData(wt.index(1, 0), "90", Qt.EditRole)
+    wt.setData(wt.index(2, 0), "91", Qt.EditRole)
+    wt.journal_changes()
+    view.events.clear()
+    with open(wt.csvpath, "w") as f:
+        f.write("Date,Weight (kg)\n1999/12/31,80\n2000/01/01,\n2000/01/02,85")
+        f.write("\n2000/01/03,91\n2000/01/04,98")
+    with qtbot.waitSignal(wt.reloaded) as blocker:
+        wt.reload()
+    # the day before the first row can't be shown, and day 2 was edited
+    assert blocker.args == [[datetime.date(1999, 12, 31), datetime.date(2000, 1, 2)]]
+    assert [row[2] for row in rows(wt)] == ["", 90, 91, 98]
+    assert view.events == [("dataChanged", 0, 0)]
+    # the journal still holds the local edits
+    reopened = WeightTable(wt.csvpath, "metric")
+    assert [row[2] for row in rows(reopened)] == [80, "", 90, 91, 98]
+
+
+def test_reload_own_save(wtb, qtbot):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wt = wtb.build()
+    wt.setData(wt.index(1, 0), "90", Qt.EditRole)
+    wt.save_csv()
+    with qtbot.assertNotEmitted(wt.reloaded):
+        wt.reload()
+    assert [row[2] for row in rows(wt)] == [100, 90]
+
+
+def test_reload_watched(wtb, qtbot):
+    wtb.add_auto_day()
+    wt = wtb.build()
+    # replaced the way sync clients (and our own saves) do it
+    tmppath = f"{wt.csvpath}.tmp"
+    for weight in ("95", "94"):
+        with open(tmppath, "w") as f:
+            f.write(f"Date,Weight (kg)\n2000/01/01,{weight}\n")
+        with qtbot.waitSignal(wt.reloaded, timeout=5000):
+            os.replace(tmppath, wt.csvpath)
+        assert wt.weights.tolist() == [float(weight)]
+
+
+@pytest.mark.parametrize(
+    "policy, expected", [("first", [73, 70]), ("min", [71, 70]), ("mean", [72, 70])]
+)
+def test_collapse_readings(policy, expected):
+    times = np.array(
+        ["2000-01-02T07:00", "2000-01-01T19:00", "2000-01-01T07:00"],
+        dtype="datetime64[s]",
+    )
+    dates, values = collapse_readings(times, np.array([70.0, 71, 73]), policy)
+    assert dates.tolist() == [datetime.date(2000, 1, 1), datetime.date(2000, 1, 2)]
+    assert values.tolist() == expected
+
+
+def test_collapse_readings_bad_policy():
+    with pytest.raises(ValueError):
+        collapse_readings(np.array([], dtype="datetime64[s]"), np.array([]), "last")
+
+
+def test_merge_entries(wtb, view, qtbot):
+    wtb.add_auto_day()
+    wtb.add_day()
+    wtb.add_day()
+    wt = wtb.build()
+    view.setModel(wt)
+    readings = [
+        (datetime.datetime(2000, 1, 3, 19), 91),
+        (datetime.datetime(2000, 1, 3, 7), 92),
+        (datetime.datetime(2000, 1, 1, 7), 99),
+        (datetime.datetime(1999, 12, 31, 7), 98),
+        (datetime.date(2000, 1, 5), 90),
+    ]
+    with qtbot.waitSignal(wt.dataChanged):
+        merged, skipped = wt.merge_entries(readings, policy="min")
+    assert (merged, skipped) == (2, [datetime.date(1999, 12, 31)])
+    assert [row[2] for row in rows(wt)] == [100, "", 91, "", 90]
+    assert view.events == [
+        ("rowsAboutToBeInserted", 3, 4),
+        ("rowsInserted", 3, 4),
+        ("dataChanged", 2, 4),
+    ]
+    assert wt.has_new_plottable_data
+    wt.journal_changes()
+    assert [row[2] for row in rows(WeightTable(wt.csvpath, "metric"))] == [
+        100,
+        "",
+        91,
+        "",
+        90,
+    ]
+
+    view.events.clear()
+    merged, _ = wt.merge_entries(readings, overwrite=True)
+    assert merged == 2
+    assert [row[2] for row in rows(wt)] == [99, "", 92, "", 90]
+    assert view.events == [("dataChanged", 0, 2)]
+    with pytest.raises(ValueError):
+        wt.merge_entries([(datetime.date(2000, 1, 2), 0)])
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from pyweight.core.importer import read_export
+from pyweight.wmutils import lbs_to_kg
+
+MORNING = datetime(2023, 1, 5, 7, 32, 11)
+
+
+@pytest.mark.parametrize(
+    "name, text, units",
+    [
+        # PyWeight's own data files
+        (
+            "pyweight.csv",
+            "Date,Weight (kg)\n2023/01/05,72.5\n2023/01/06,\n",
+            "imperial",
+        ),
+        (
+            "withings.csv",
+            '"Date","Weight (kg)","Fat mass (kg)"\n"2023-01-05 07:32:11","72.5",""\n',
+            "metric",
+        ),
+        # a title line before the header, European numbers
+        ("fitbit.csv", "Body\nDate;Time;Weight\n05.01.2023;07:32:11;72,5\n", "metric"),
+        ("units.csv", "Time,Weight\n2023-01-05T07:32:11,72.5 kg\n", "imperial"),
+        (
+            "fitbit.json",
+            {"weight": [{"logId": 1, "weight": 160, "date": "01/05/23"}]},
+            "imperial",
+        ),
+        ("list.json", [{"timestamp": "2023-01-05", "value": "72.5"}], "metric"),
+    ],
+)
+def test_read_export(tmp_path, name, text, units):
+    path = tmp_path / name
+    path.write_text(text if isinstance(text, str) else json.dumps(text))
+    # weights without units are taken to be in the plan's units
+    expected = lbs_to_kg(160) if name == "fitbit.json" else 72.5
+    [(when, kg)] = read_export(str(path), units)
+    assert (when.date(), kg) == (MORNING.date(), expected)
+
+
+def test_read_export_times(tmp_path):
+    path = tmp_path / "export.json"
+    records = [
+        {"date": "2023/01/05", "time": "07:32:11", "weight": 72.5},
+        {"date": MORNING.timestamp() * 1000, "weight": "160 lb"},
+    ]
+    path.write_text(json.dumps({"data": {"measurements": records}}))
+    assert read_export(str(path)) == [(MORNING, 72.5), (MORNING, lbs_to_kg(160))]
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("Date,Weight\n2023/01/05,70\n2023/13/01,70\n", "line 3: '2023/13/01'"),
+        ("Date,Weight\n2023/01/05,-70\n", "line 2: -70 is not a valid weight"),
+        ("Day,Mass\n2023/01/05,70\n", "no date and weight columns"),
+        ('[{"id": 1}]', "no date and weight fields"),
+        ("{}", "holds no weight readings"),
+    ],
+)
+def test_read_export_bad(tmp_path, text, message):
+    path = tmp_path / "export.csv"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        read_export(str(path))
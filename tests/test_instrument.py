@@ -0,0 +1,76 @@
+import json
+import pstats
+import threading
+from collections import defaultdict, deque
+
+import pytest
+
+from pyweight.core import instrument
+
+
+@pytest.fixture
+def timings(monkeypatch):
+    monkeypatch.setattr(instrument, "enabled", True)
+    timings = defaultdict(lambda: deque(maxlen=instrument.TIMINGS_WINDOW))
+    monkeypatch.setattr(instrument, "_timings", timings)
+    return timings
+
+
+@instrument.timed("square")
+def square(x):
+    return x * x
+
+
+def test_timed(timings):
+    assert square(3) == 9
+    with instrument.timer("block"):
+        pass
+    assert len(timings["square"]) == 1
+    assert len(timings["block"]) == 1
+
+
+def test_disabled(timings, monkeypatch):
+    monkeypatch.setattr(instrument, "enabled", False)
+    assert square(3) == 9
+    with instrument.timer("block"):
+        pass
+    assert not timings
+
+
+def test_percentiles(timings):
+    assert instrument.percentiles("fit") is None
+    for i in range(1, 101):
+        instrument.record("fit", 0, i / 1000)
+    assert instrument.percentiles("fit", (50, 90)) == pytest.approx(
+        {50: 0.0505, 90: 0.0901}
+    )
+    assert instrument.readout() == "fit 100.0 ms (p90 90.1)"
+    # only the most recent timings count
+    for _ in range(instrument.TIMINGS_WINDOW):
+        instrument.record("fit", 0, 0.001)
+    assert instrument.percentiles("fit")[99] == pytest.approx(0.001)
+
+
+def test_edit_cycle_trace(timings, tmp_path):
+    path = str(tmp_path / "edit.json")
+    cycle = instrument.EditCycle(path)
+    square(2)
+    worker = threading.Thread(target=square, args=(3,))
+    worker.start()
+    worker.join()
+    cycle.finish()
+    square(4)  # after the cycle
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert [event["name"] for event in events] == ["square", "square", "edit"]
+    assert len({event["tid"] for event in events}) == 2
+    assert len(timings["edit"]) == 1
+
+
+def test_edit_cycle_profile(timings, tmp_path):
+    path = str(tmp_path / "edit.prof")
+    cycle = instrument.EditCycle(path)
+    square(2)
+    cycle.finish()
+    stats = pstats.Stats(path)
+    assert any(func[2] == "square" for func in stats.stats)
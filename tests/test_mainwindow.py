@@ -1,13 +1,18 @@
 import csv
-from datetime import datetime
+import gc
+import json
+import os
+import weakref
+from datetime import datetime, timedelta
 
 import pytest
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QCoreApplication, QEvent, Qt
 from PyQt5.QtWidgets import QDialog, QMessageBox
 
 import pyweight.wmmainwindow
 from pyweight.wmdatamodel import WeightTable
 from pyweight.wmmainwindow import MainWindow
+from pyweight.wmpipeline import PlotPipeline
 from pyweight.wmplot import Canvas
 from pyweight.wmprofile import Profile
 from pyweight.wmsettings import WMSettings
@@ -20,6 +25,7 @@ class FakePrefs(WMSettings):
         "auto_save_data": False,
         "prev_plan": "",
         "language": "English",
+        "import_policy": "first",
     }
     conversions = {"open_prev": bool, "auto_save_data": bool}
 
@@ -96,6 +102,32 @@ def test_edit_with_autosave(qtbot, mw, monkeypatch):
     assert mw.windowTitle() == "data.csv - PyWeight"
 
 
+def test_autosave_journals_edits(qtbot, mw, datafile):
+    mw.prefs.auto_save_data = True
+    with open(datafile) as f:
+        saved = f.read()
+    mw.wt.setData(mw.wt.index(0), "100.0", Qt.EditRole)
+    assert not mw.file_modified
+    qtbot.waitUntil(lambda: os.path.exists(mw.wt.journal_path))
+    with open(datafile) as f:
+        assert f.read() == saved
+    assert WeightTable(datafile, "metric")._values[0] == lbs_to_kg(100)
+    mw.close()
+    assert not os.path.exists(mw.wt.journal_path)
+    assert WeightTable(datafile, "metric")._values[0] == lbs_to_kg(100)
+
+
+def test_autosave_failure(qtbot, mw, monkeypatch):
+    mw.prefs.auto_save_data = True
+    monkeypatch.setattr(
+        pyweight.wmmainwindow.QMessageBox, "exec", lambda *args: QMessageBox.Discard
+    )
+    os.mkdir(mw.wt.journal_path)
+    mw.wt.setData(mw.wt.index(0), "100.0", Qt.EditRole)
+    qtbot.waitUntil(lambda: mw.file_modified)
+    assert mw.windowTitle() == "data.csv* - PyWeight"
+
+
 def test_closing_safely(qtbot, mw, monkeypatch):
     mw.show()
     qtbot.addWidget(mw)
@@ -165,7 +197,7 @@ def test_entering_data(qtbot, mw, monkeypatch):
     monkeypatch.setattr(
         pyweight.wmmainwindow.QMessageBox, "exec", lambda *args: QMessageBox.Discard
     )
-    assert mw.wt._data[0][2] == lbs_to_kg(100)
+    assert mw.wt._values[0] == lbs_to_kg(100)
 
 
 def test_saving_data(qtbot, mw, monkeypatch):
@@ -179,7 +211,7 @@ def test_saving_data(qtbot, mw, monkeypatch):
     mw.return_key_activated()
     mw.save_file()
     mw.open_data_file()
-    assert mw.wt._data[0][2] == lbs_to_kg(100)
+    assert mw.wt._values[0] == lbs_to_kg(100)
 
 
 def test_converting_units(qtbot, mw, monkeypatch):
@@ -215,4 +247,101 @@ def test_converting_units(qtbot, mw, monkeypatch):
     mw.save_file()
     mw.open_data_file()
     assert mw.wt.weights[0] == lbs_to_kg(100)
-    assert mw.wt._data[0][2] == lbs_to_kg(100)
+    assert mw.wt._values[0] == lbs_to_kg(100)
+
+
+def test_pipeline_persists(qtbot, mw):
+    pipeline = mw.pipeline
+    with qtbot.waitSignal(mw.pipeline.finished):
+        mw.wt.setData(mw.wt.index(0), "100.0", Qt.EditRole)
+    assert mw.pipeline is pipeline
+    assert mw.pipeline.data is mw.wt
+    assert mw.canvas.points.get_ydata().tolist() == [100]
+
+
+def test_edit_timings(qtbot, mw, monkeypatch, tmp_path):
+    monkeypatch.setattr(pyweight.wmmainwindow.instrument, "enabled", True)
+    monkeypatch.setattr(
+        pyweight.wmmainwindow.instrument, "dump_path", str(tmp_path / "edit.json")
+    )
+    with qtbot.waitSignal(mw.pipeline.finished):
+        mw.wt.setData(mw.wt.index(0), "100.0", Qt.EditRole)
+    assert mw.edit_cycle is None
+    assert "edit " in mw.statusBar().currentMessage()
+    assert os.path.exists(tmp_path / "edit.json")
+
+
+def test_switching_plans(qtbot, mw, tmp_path):
+    first_plan, first_wt = mw.plan_path, mw.wt
+    with qtbot.waitSignal(mw.pipeline.finished):
+        mw.wt.setData(mw.wt.index(0), "100.0", Qt.EditRole)
+    mw.save_file()
+    other = tmp_path / "other"
+    other.mkdir()
+    mw.open_plan_file(str(other / "plan.wmplan"))
+    mw.plan.path = str(other / "data.csv")
+    mw.open_data_file()
+    assert mw.wt is not first_wt
+
+    # switching back shows the cached table and plot right away
+    mw.open_plan_file(first_plan)
+    assert mw.wt is first_wt
+    assert mw.canvas.points.get_ydata().tolist() == [100]
+    assert mw.windowTitle() == "data.csv - PyWeight"
+
+    # changed on disk: loaded again
+    mw.open_plan_file(str(other / "plan.wmplan"))
+    stat = os.stat(first_wt.csvpath)
+    os.utime(first_wt.csvpath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    mw.open_plan_file(first_plan)
+    assert mw.wt is not first_wt
+    assert mw.wt.weights.tolist() == [100]
+
+
+def test_evicted_plans_released(qtbot, mw, tmp_path):
+    mw.plan_cache.max_entries = 1
+    first_wt = weakref.ref(mw.wt)
+    for name in ("b", "c"):
+        (tmp_path / name).mkdir()
+        mw.open_plan_file(str(tmp_path / name / "plan.wmplan"))
+        mw.plan.path = str(tmp_path / name / "data.csv")
+        mw.open_data_file()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+    assert first_wt() is None
+    # the open file's pipeline and the cached one
+    assert len(mw.findChildren(PlotPipeline)) == 2
+
+
+def test_importing_weights(qtbot, mw, monkeypatch, tmp_path):
+    mw.prefs.auto_save_data = True
+    export = tmp_path / "scale.json"
+    today = datetime.now().replace(hour=12)
+    readings = [
+        {"date": (today - timedelta(days=1)).isoformat(), "weight": 70},
+        {"date": today.replace(hour=7).isoformat(), "weight": 71},
+        {"date": today.replace(hour=19).isoformat(), "weight": 69},
+    ]
+    export.write_text(json.dumps(readings))
+    mw.prefs.import_policy = "min"
+    monkeypatch.setattr(
+        pyweight.wmmainwindow.QFileDialog,
+        "getOpenFileName",
+        lambda *args, **kwargs: (str(export), ""),
+    )
+    messages = []
+    monkeypatch.setattr(
+        pyweight.wmmainwindow.QMessageBox,
+        "exec",
+        lambda mbox: messages.append(mbox.text()),
+    )
+    updates = []
+    monkeypatch.setattr(mw, "update_plot", lambda: updates.append(True))
+    saves = []
+    monkeypatch.setattr(mw.autosaver, "schedule", saves.append)
+    mw.import_file()
+    assert mw.wt.weights.tolist() == [69]
+    assert messages == ["Weights imported: 1."]
+    # replotted and saved once for the whole import
+    assert len(updates) == 1
+    assert saves == [mw.wt]
@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from PyQt5 import sip
+from PyQt5.QtCore import QCoreApplication, QEvent, Qt
+
+from pyweight.core.bodymodel import WeightTracker
+from pyweight.wmdatamodel import WeightTable
+from pyweight.wmpipeline import PlotPipeline
+from pyweight.wmplot import PlotData
+from pyweight.wmprofile import Profile
+
+
+@pytest.fixture
+def table(tmp_path):
+    csvpath = str(tmp_path / "data.csv")
+    with open(csvpath, "w") as f:
+        f.write("Date,Weight (kg)")
+        for i in range(60):
+            f.write(f"\n{date(2000, 1, 1) + timedelta(days=i):%Y/%m/%d},")
+            f.write(f"{100 - 0.1 * i:.1f}" if i < 59 else "")
+    return WeightTable(csvpath, "metric")
+
+
+@pytest.fixture
+def plan(tmp_path):
+    plan = Profile(str(tmp_path / "plan.wmplan"))
+    plan.units = "metric"
+    return plan
+
+
+@pytest.fixture
+def pipeline(qtbot, table, plan):
+    pipeline = PlotPipeline(table, plan)
+    yield pipeline
+    pipeline.close()
+
+
+def assert_same_plot(actual, expected):
+    np.testing.assert_array_equal(actual.weights, expected.weights)
+    np.testing.assert_allclose(actual.fit, expected.fit)
+    assert actual.advice == expected.advice
+
+
+def test_matches_tracker(qtbot, table, plan, pipeline):
+    with qtbot.waitSignal(pipeline.finished) as blocker:
+        pipeline.request()
+    assert_same_plot(blocker.args[0], PlotData(WeightTracker(table, plan)))
+
+
+def test_follows_changes(qtbot, table, plan, pipeline):
+    with qtbot.waitSignal(pipeline.finished):
+        pipeline.request()
+    table.setData(table.index(59), "90", Qt.EditRole)
+    table.setData(table.index(10), "", Qt.EditRole)
+    plan.cycle = 7
+    with qtbot.waitSignal(pipeline.finished) as blocker:
+        pipeline.request()
+    assert_same_plot(blocker.args[0], PlotData(WeightTracker(table, plan)))
+
+
+def test_stale_results_dropped(qtbot, table, pipeline):
+    results = []
+    pipeline.finished.connect(results.append)
+    for i in range(5):
+        table.setData(table.index(59), str(90 + i), Qt.EditRole)
+        pipeline.request()
+    qtbot.waitUntil(lambda: len(results) > 0)
+    qtbot.wait(100)
+    assert len(results) == 1
+    assert results[0].weights[-1] == 94
+
+
+def test_failure_reported(qtbot, pipeline, monkeypatch):
+    def broken(self, wtracker):
+        raise RuntimeError("no plot")
+
+    monkeypatch.setattr(PlotData, "__init__", broken)
+    with qtbot.waitSignal(pipeline.failed) as blocker:
+        pipeline.request()
+    assert "no plot" in blocker.args[0]
+
+
+def test_close(qtbot, table, pipeline):
+    pipeline.close()
+    table.setData(table.index(59), "90", Qt.EditRole)
+    assert not pipeline._dirty_days
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert sip.isdeleted(pipeline)
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from pyweight.wmplancache import CachedPlan, PlanCache
+
+
+class FakeTable:
+    def __init__(self, tmp_path, nbytes=0):
+        self.csvpath = str(tmp_path / "data.csv")
+        self.journal_path = f"{self.csvpath}.journal"
+        self.nbytes = nbytes
+        self.closed = False
+        with open(self.csvpath, "w") as f:
+            f.write("Date,Weight (kg)\n2000/01/01,100\n")
+
+    def close(self):
+        self.closed = True
+
+
+class FakePipeline:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def entry(tmp_path, name, nbytes=0):
+    plan_path = tmp_path / f"{name}.wmplan"
+    plan_path.write_text("[General]\n")
+    table = FakeTable(tmp_path, nbytes)
+    return CachedPlan(str(plan_path), name, table, FakePipeline(), None)
+
+
+@pytest.fixture
+def cache():
+    return PlanCache(max_bytes=10 * 1024 * 1024, max_entries=2)
+
+
+def test_take(cache, tmp_path):
+    a = entry(tmp_path, "a")
+    cache.put(a)
+    assert cache.take(str(tmp_path / "b.wmplan")) is None
+    assert cache.take(str(tmp_path / ".." / tmp_path.name / "a.wmplan")) is a
+    assert cache.take(a.plan_path) is None
+    assert not a.pipeline.closed
+
+
+def test_stale(cache, tmp_path):
+    a = entry(tmp_path, "a")
+    cache.put(a)
+    stat = os.stat(a.table.csvpath)
+    os.utime(a.table.csvpath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.take(a.plan_path) is None
+    assert a.pipeline.closed
+
+
+def test_evicts_least_recent(cache, tmp_path):
+    a, b, c = (entry(tmp_path, name) for name in "abc")
+    cache.put(a)
+    cache.put(b)
+    cache.put(a)
+    cache.put(c)
+    assert len(cache) == 2
+    assert b.pipeline.closed and b.table.closed
+    assert not a.pipeline.closed and not c.pipeline.closed
+
+
+def test_evicts_by_memory(cache, tmp_path):
+    a = entry(tmp_path, "a", nbytes=6 * 1024 * 1024)
+    b = entry(tmp_path, "b", nbytes=6 * 1024 * 1024)
+    cache.put(a)
+    cache.put(b)
+    assert len(cache) == 1
+    assert a.pipeline.closed
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_clear(cache, tmp_path):
+    a = entry(tmp_path, "a")
+    cache.put(a)
+    cache.clear()
+    assert len(cache) == 0
+    assert a.pipeline.closed
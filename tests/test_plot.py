@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+
+import pytest
+from PyQt5.QtCore import Qt
+
+from pyweight.core.bodymodel import WeightTracker
+from pyweight.wmdatamodel import WeightTable
+from pyweight.wmplot import Canvas
+from pyweight.wmprofile import Profile
+
+
+def write_log(path, weights):
+    with open(path, "w") as f:
+        f.write("Date,Weight (kg)")
+        for i, weight in enumerate(weights):
+            f.write(f"\n{date(2000, 1, 1) + timedelta(days=i):%Y/%m/%d},{weight}")
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    csvpath = str(tmp_path / "data.csv")
+    write_log(csvpath, [100 - 0.1 * i for i in range(30)] + [""])
+    profile = Profile(str(tmp_path / "plan.wmplan"))
+    profile.units = "metric"
+    return WeightTracker(WeightTable(csvpath, profile.units), profile)
+
+
+@pytest.fixture
+def canvas(qtbot):
+    canvas = Canvas()
+    qtbot.addWidget(canvas)
+    canvas.resize(600, 400)
+    return canvas
+
+
+def count_calls(monkeypatch, canvas, name):
+    calls = []
+    original = getattr(canvas, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(canvas, name, wrapper)
+    return calls
+
+
+def test_plot_reuses_artists(canvas, tracker):
+    points, fit = canvas.points, canvas.fit
+    canvas.plot(tracker)
+    assert canvas.points is points and canvas.fit is fit
+    assert len(points.get_xdata()) == 30
+    assert len(canvas.axes.lines) == 2
+    canvas.plot(tracker)
+    assert len(canvas.axes.lines) == 2
+
+
+def test_plot_blits_when_layout_unchanged(canvas, tracker, monkeypatch):
+    canvas.plot(tracker)
+    draws = count_calls(monkeypatch, canvas, "draw")
+    blits = count_calls(monkeypatch, canvas, "blit")
+    # a value inside the current limits only needs a blit
+    table = tracker.data
+    table.setData(table.index(30), "97.1", Qt.EditRole)
+    canvas.plot(tracker)
+    assert len(draws) == 0 and len(blits) == 1
+    assert len(canvas.points.get_xdata()) == 31
+    # an outlier changes the y limits, which needs a full redraw
+    table.setData(table.index(30), "150", Qt.EditRole)
+    canvas.plot(tracker)
+    assert len(draws) == 1
+
+
+def test_export_includes_artists(canvas, tracker, tmp_path):
+    canvas.plot(tracker)
+    path = str(tmp_path / "plot.svg")
+    canvas.export(path, "svg")
+    with open(path) as f:
+        svg = f.read()
+    assert "Adjustment value is" in svg
+    assert canvas.points.get_animated()
+
+
+def test_long_history_decimated(canvas, tmp_path):
+    csvpath = str(tmp_path / "long.csv")
+    write_log(csvpath, [100 + (i % 7) * 0.1 for i in range(50 * 365)])
+    profile = Profile(str(tmp_path / "plan.wmplan"))
+    profile.units = "metric"
+    tracker = WeightTracker(WeightTable(csvpath, profile.units), profile)
+    canvas.plot(tracker)
+    width = canvas.axes.bbox.width
+    assert len(canvas.points.get_xdata()) <= 3 * width
+    # the fit is only drawn at the knots
+    assert len(canvas.fit.get_xdata()) == len(tracker.interpolation.get_knots())
+    # the envelope keeps the extremes of the data
+    assert max(canvas.points.get_ydata()) == pytest.approx(100.6)
+    assert min(canvas.points.get_ydata()) == pytest.approx(100)
+    # zooming in brings back every point
+    first_day = canvas.fit.get_xdata()[0]
+    canvas.axes.set_xlim(first_day - 0.5, first_day + 99.5)
+    assert len(canvas.points.get_xdata()) == 100
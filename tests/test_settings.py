@@ -1,5 +1,7 @@
 import pytest
+from PyQt5.QtCore import QSettings
 
+from pyweight.core.settings import IniStorage
 from pyweight.wmsettings import WMSettings
 
 
@@ -55,3 +57,86 @@ def test_flush_inflight(settings):
     settings.flush()
     settings.save()
     assert settings.setting_bool
+
+
+def test_settings_cached(settings, tmp_path):
+    assert settings.setting_int is settings.setting_int
+    other = WMSettings(s, c, str(tmp_path / "other.ini"))
+    assert type(other.setting_int) is type(settings.setting_int)
+    settings.setting_int = 3
+    assert settings.setting_int == 3
+    assert WMSettings(s, c, str(tmp_path / "settings.ini")).setting_int == 3
+
+
+class Subscriber:
+    def __init__(self, settings):
+        self.calls = []
+        settings.subscribe(self.changed)
+
+    def changed(self, keys):
+        self.calls.append(keys)
+
+
+def test_apply(settings, tmp_path):
+    subscriber = Subscriber(settings)
+    assert settings.apply(
+        {"setting_int": 3, "setting_str": "newstring", "setting_bool": True}
+    )
+    assert subscriber.calls == [{"setting_int", "setting_str"}]
+    reloaded = WMSettings(s, c, str(tmp_path / "settings.ini"))
+    assert reloaded.setting_int == 3
+    assert reloaded.setting_str == "newstring"
+
+
+def test_apply_validates(settings):
+    subscriber = Subscriber(settings)
+    with pytest.raises(ValueError):
+        settings.apply({"setting_str": "newstring", "setting_int": "many"})
+    with pytest.raises(AttributeError):
+        settings.apply({"setting_str": "newstring", "setting_other": "other"})
+    assert settings.setting_str == "string"
+    assert not subscriber.calls
+
+
+def test_save_notifies_once(settings):
+    subscriber = Subscriber(settings)
+    settings.setting_int.inflight(3)
+    settings.setting_bool.inflight(False)
+    assert settings.save()
+    assert subscriber.calls == [{"setting_int", "setting_bool"}]
+
+
+ini_values = {
+    "bool": True,
+    "int": 3,
+    "float": -0.751,
+    "empty": "",
+    "path": "/tmp/a b/c,d;e.csv",
+    "quote": 'say "hi"',
+    "windows": "C:\\Users\\x",
+    "at": "@foo",
+    "space": " x ",
+    "unicode": "héllo wörld",
+    "control": "a\tb\n",
+}
+
+
+@pytest.mark.parametrize("writer", ["qt", "ini"])
+def test_ini_storage_compatible(tmp_path, writer):
+    path = str(tmp_path / "settings.ini")
+    if writer == "qt":
+        qs = QSettings(path, QSettings.IniFormat)
+        for key, value in ini_values.items():
+            qs.setValue(key, value)
+        qs.sync()
+    else:
+        storage = IniStorage(path)
+        for key, value in ini_values.items():
+            storage.set_value(key, value)
+        assert storage.sync()
+    qs = QSettings(path, QSettings.IniFormat)
+    storage = IniStorage(path)
+    for key, value in ini_values.items():
+        assert qs.value(key, type=type(value)) == value
+        assert storage.value(key, None, type(value)) == value
+    assert storage.value("missing", "default", str) == "default"
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# cumulative import time allowed for the GUI modules, in milliseconds
+STARTUP_TARGET_MS = float(os.environ.get("PYWEIGHT_STARTUP_TARGET_MS", 1000))
+
+
+def import_times(module):
+    """Imports a module in a fresh interpreter, returns {module: cumulative us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_startup_skips_heavy_modules():
+    times = import_times("pyweight.wmmainwindow")
+    for heavy in ("matplotlib", "scipy", "pyweight.wmplot", "pyweight.core.bodymodel"):
+        assert heavy not in times
+
+
+# wall-clock timing, so only run with the other benchmarks
+@pytest.mark.benchmark
+def test_startup_time():
+    # best of a few runs, to reduce noise from the rest of the system
+    module = "pyweight.wmmainwindow"
+    best = min(import_times(module)[module] for _ in range(3))
+    assert best / 1000 < STARTUP_TARGET_MS
+
+
+def test_core_without_qt():
+    core = ("data", "settings", "bodymodel", "instrument", "importer")
+    headless = ["pyweight.wmbatch", "pyweight.__main__"]
+    for module in [f"pyweight.core.{name}" for name in core] + headless:
+        times = import_times(module)
+        assert not any(name.startswith("PyQt5") for name in times)
@@ -0,0 +1,31 @@
+import importlib
+
+import pytest
+
+from pyweight.ui import RuntimeUi, ui_class
+
+
+def test_compiled_ui():
+    cls = ui_class("main")
+    assert cls.__name__ == "Ui_MainWindow"
+    assert not issubclass(cls, RuntimeUi)
+
+
+def test_runtime_ui_fallback(monkeypatch):
+    monkeypatch.setenv("PYWEIGHT_LOAD_UI", "1")
+    cls = ui_class("prefs")
+    assert issubclass(cls, RuntimeUi)
+    assert cls.uifile.endswith("prefs.ui")
+
+
+def test_missing_compiled_ui():
+    assert issubclass(ui_class("nonexistent"), RuntimeUi)
+
+
+def test_broken_compiled_ui(monkeypatch):
+    def broken_import(name):
+        raise ModuleNotFoundError("No module named 'resources'", name="resources")
+
+    monkeypatch.setattr(importlib, "import_module", broken_import)
+    with pytest.raises(ModuleNotFoundError):
+        ui_class("main")